@@ -0,0 +1,229 @@
+"""Compile benchmarks: wall time per phase, peak memory and emitted actions.
+
+    python benchmarks/main.py                 compare against baseline.json
+    python benchmarks/main.py --update        store the results as the baseline
+    python benchmarks/main.py cheap_tables    run only the named workloads
+
+`cold_import` times `import pyhtsl` in a fresh interpreter instead.
+
+Exits with 1 when a workload got slower or used more memory than the
+baseline by more than `--threshold`, or emits more actions than it did, or
+when `cold_import` loads a module it did not.
+"""
+
+import argparse
+import io
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any
+
+from workloads import WORKLOADS, Workload
+
+from pyhtsl import Container, disable_global_export
+from pyhtsl.limits import Counter
+from pyhtsl.profiler import disable_profiler, enable_profiler
+
+disable_global_export()
+
+BASELINE_PATH: Path = Path(__file__).parent / 'baseline.json'
+IMPORT_WORKLOAD = 'cold_import'
+# Timer and scheduling noise, which is most of the difference between runs of
+# a workload that takes a few milliseconds
+WALL_SLACK_S: float = 0.005
+
+# Run in a fresh interpreter, anything imported before would make it cheaper.
+# Modules from the standard library differ per Python version, so only the
+# others it loads are kept.
+COLD_IMPORT = """
+import json, sys, time, tracemalloc
+if sys.argv[1:] == ['trace']:
+    tracemalloc.start()
+before = set(sys.modules)
+start = time.perf_counter()
+import pyhtsl
+wall = time.perf_counter() - start
+_, peak = tracemalloc.get_traced_memory()
+modules = sorted(
+    module
+    for module in set(sys.modules) - before
+    if module.partition('.')[0] not in sys.stdlib_module_names
+)
+print('RESULT', json.dumps({'wall_s': wall, 'peak': peak, 'modules': modules}))
+"""
+
+type Result = dict[str, Any]
+
+
+def _fmt(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f'{seconds * 1e6:.0f}us'
+    if seconds < 1:
+        return f'{seconds * 1e3:.0f}ms'
+    return f'{seconds:.2f}s'
+
+
+def action_counts(container: Container) -> dict[str, int]:
+    """Rendered actions by class, nested ones included, over every block."""
+    counter = Counter()
+    counts: dict[str, int] = {}
+    expressions = [expr for block in container.blocks for expr in block.expressions]
+    while expressions:
+        expr = expressions.pop()
+        for cls, amount in counter.action_counts(expr).items():
+            counts[cls.__name__] = counts.get(cls.__name__, 0) + amount
+        for nested_ref in expr.nested_expressions_refs():
+            expressions.extend(nested_ref)
+    return dict(sorted(counts.items()))
+
+
+def run_workload(workload: Workload, scale: float, repeat: int) -> Result:
+    best: Result | None = None
+    for _ in range(repeat):
+        profiler = enable_profiler()
+        try:
+            # Overflow functions are logged every time, which is just noise here
+            with redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                container = workload(scale)
+                container.into_htsl()
+                wall = time.perf_counter() - start
+        finally:
+            disable_profiler()
+        if best is None or wall < best['wall_s']:
+            best = {
+                'wall_s': wall,
+                'phases_ms': {
+                    name: round(timing.own * 1000, 3)
+                    for name, timing in sorted(
+                        profiler.by_phase().items(),
+                        key=lambda item: item[1].own,
+                        reverse=True,
+                    )
+                },
+                'actions': action_counts(container),
+            }
+    assert best is not None
+
+    # Separately, since tracing allocations slows everything down
+    tracemalloc.start()
+    try:
+        with redirect_stdout(io.StringIO()):
+            workload(scale).into_htsl()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    best['peak_kib'] = peak // 1024
+    return best
+
+
+def _cold_import(*args: str) -> Result:
+    output = subprocess.run(
+        [sys.executable, '-c', COLD_IMPORT, *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    # Exiting may log after the result, so look for it by its prefix
+    for line in output.splitlines():
+        if line.startswith('RESULT '):
+            return json.loads(line.removeprefix('RESULT '))
+    raise RuntimeError(f'No result in {output!r}')
+
+
+def run_import(repeat: int) -> Result:
+    wall = min(_cold_import()['wall_s'] for _ in range(repeat))
+    traced = _cold_import('trace')
+    return {
+        'wall_s': wall,
+        'phases_ms': {},
+        'actions': {},
+        'modules': traced['modules'],
+        'peak_kib': traced['peak'] // 1024,
+    }
+
+
+def regressions(
+    name: str,
+    result: Result,
+    baseline: Result,
+    threshold: float,
+) -> list[str]:
+    found: list[str] = []
+    old, new = baseline['wall_s'], result['wall_s']
+    if new > old * (1 + threshold) + WALL_SLACK_S:
+        found.append(f'{name}: wall time went from {_fmt(old)} to {_fmt(new)}')
+    old, new = baseline['peak_kib'], result['peak_kib']
+    if new > old * (1 + threshold):
+        found.append(f'{name}: peak memory went from {old} KiB to {new} KiB')
+    for cls, new in result['actions'].items():
+        old = baseline['actions'].get(cls, 0)
+        if new > old:
+            found.append(f'{name}: {cls} actions went from {old} to {new}')
+    for module in result.get('modules', []):
+        if module not in baseline.get('modules', []):
+            found.append(f'{name}: now loads {module}')
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('workloads', nargs='*', metavar='workload')
+    parser.add_argument('--scale', type=float, default=1.0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--threshold', type=float, default=0.25)
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--update', action='store_true')
+    args = parser.parse_args()
+
+    choices = [IMPORT_WORKLOAD, *WORKLOADS]
+    names = args.workloads or choices
+    for name in names:
+        if name not in choices:
+            parser.error(f'unknown workload {name!r}, pick from {", ".join(choices)}')
+    stored: dict[str, Any] = (
+        json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    )
+    # Sizes differ per scale, so each scale has a baseline of its own
+    scale_key = f'scale={args.scale:g}'
+    baselines: dict[str, Result] = stored.get(scale_key, {})
+
+    results: dict[str, Result] = {}
+    found: list[str] = []
+    for name in names:
+        if name == IMPORT_WORKLOAD:
+            result = run_import(args.repeat)
+            details = f'{len(result["modules"]):>8} modules'
+        else:
+            result = run_workload(WORKLOADS[name], args.scale, args.repeat)
+            phases = list(result['phases_ms'].items())[:3]
+            top_phases = ', '.join(f'{phase} {ms:.0f}ms' for phase, ms in phases)
+            details = f'{sum(result["actions"].values()):>8} actions  ({top_phases})'
+        results[name] = result
+        print(
+            f'{name:<22} {_fmt(result["wall_s"]):>8} {result["peak_kib"]:>8} KiB '
+            + details
+        )
+        if name in baselines:
+            found.extend(regressions(name, result, baselines[name], args.threshold))
+
+    if args.update:
+        stored[scale_key] = {**baselines, **results}
+        args.baseline.write_text(json.dumps(stored, indent=2) + '\n')
+        print(f'\nStored the baseline in {args.baseline}')
+        return 0
+
+    if found:
+        print('\nRegressions:')
+        for line in found:
+            print(f'  {line}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
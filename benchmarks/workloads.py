@@ -0,0 +1,178 @@
+"""Synthetic workloads for `benchmarks/main.py`.
+
+Every workload builds one container at the given size and returns it
+finalized. Sizes are the defaults of each workload times `--scale`.
+"""
+
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+
+import mido
+
+from pyhtsl import Container, Else, IfAll, PlayerStat, chat, create_function
+from pyhtsl.ext.cheap_read_write import cheap_read, cheap_write
+from pyhtsl.ext.music import midi_into_expressions
+from pyhtsl.ext.stack_queue import IntStack, Queue
+
+__all__ = ('WORKLOADS', 'Workload')
+
+
+type Workload = Callable[[float], Container]
+
+
+def sized(default: int, scale: float) -> int:
+    return max(1, round(default * scale))
+
+
+def letter_name(i: int) -> str:
+    """Spreadsheet-column names, so `cheap_read` can not take its fast path."""
+    parts = []
+    while True:
+        parts.append(chr(ord('a') + i % 26))
+        i = i // 26 - 1
+        if i < 0:
+            break
+    return ''.join(reversed(parts))
+
+
+def arithmetic_chains(scale: float) -> Container:
+    stats = [PlayerStat(f's{i}').as_long() for i in range(sized(50, scale))]
+    with Container() as container:
+        for i, stat in enumerate(stats):
+            total = stat
+            for k in range(20):
+                other = stats[(i + k + 1) % len(stats)]
+                total = (total * (k + 2) + other) - (k % 7)
+            stat.value = total
+    return container
+
+
+def nested_conditionals(scale: float) -> Container:
+    x = PlayerStat('x').as_long()
+    y = PlayerStat('y').as_long()
+
+    def branch(depth: int) -> None:
+        y.value += depth
+        if depth == 0:
+            return
+        with IfAll(x > depth):
+            branch(depth - 1)
+        with Else:
+            branch(depth - 1)
+
+    with Container(allow_nested_expressions=True) as container:
+        for _ in range(sized(4, scale)):
+            branch(7)
+    return container
+
+
+def cheap_tables(scale: float) -> Container:
+    length = sized(1000, scale)
+    items = [PlayerStat(letter_name(i)).as_long() for i in range(length)]
+    index = PlayerStat('index').as_long()
+    value = PlayerStat('value').as_long()
+    with Container() as container:
+
+        @create_function('read table')
+        def read_table() -> None:
+            cheap_read(items=items, index=index, output=value)
+
+        @create_function('write table')
+        def write_table() -> None:
+            cheap_write(items=items, index=index, input=value)
+
+    return container
+
+
+def stacks_and_queues(scale: float) -> Container:
+    operations = sized(60, scale)
+    with Container() as container:
+
+        @create_function('int stack')
+        def int_stack() -> None:
+            stack = IntStack(
+                holder=lambda i: PlayerStat(f'sh{i}').as_long(),
+                counter=PlayerStat('sc').as_long(),
+                most=255,
+                capacity=32,
+            )
+            output = PlayerStat('so').as_long()
+            for i in range(operations):
+                stack.add(i % 200)
+                if i % 3 == 2:
+                    stack.remove(output=output)
+
+        @create_function('queue')
+        def queue() -> None:
+            holders = [PlayerStat(f'qh{i}').as_long() for i in range(16)]
+            fifo = Queue(holders=holders, counter=PlayerStat('qc').as_long())
+            output = PlayerStat('qo').as_long()
+            for i in range(operations):
+                fifo.add(i)
+                if i % 3 == 2:
+                    fifo.remove(output=output)
+
+    return container
+
+
+def generated_midi(path: Path, notes: int) -> None:
+    midi = mido.MidiFile()
+    for channel, program in ((0, 0), (1, 32), (9, 0)):
+        track = mido.MidiTrack()
+        midi.tracks.append(track)
+        track.append(mido.Message('program_change', channel=channel, program=program))
+        for i in range(notes):
+            note = 36 + (i * 7 + channel * 5) % 48
+            for kind, velocity, time in (('note_on', 90, 0), ('note_off', 0, 120)):
+                track.append(
+                    mido.Message(
+                        kind,
+                        channel=channel,
+                        note=note,
+                        velocity=velocity,
+                        time=time,
+                    )
+                )
+    midi.save(path)
+
+
+def music_import(scale: float) -> Container:
+    with tempfile.TemporaryDirectory() as folder:
+        path = Path(folder) / 'song.mid'
+        generated_midi(path, sized(400, scale))
+        expressions = midi_into_expressions(path)
+
+    with Container() as container:
+
+        @create_function('song')
+        def song() -> None:
+            for expression in expressions:
+                expression.write()
+
+    return container
+
+
+def many_functions(scale: float) -> Container:
+    x = PlayerStat('x').as_long()
+    with Container() as container:
+        for i in range(sized(300, scale)):
+
+            @create_function(f'function {i}')
+            def function(i: int = i) -> None:
+                stat = PlayerStat(f'f{i}').as_long()
+                stat.value = x * i + 1
+                with IfAll(stat > 10):
+                    chat(f'{stat} is big')
+
+    return container
+
+
+WORKLOADS: dict[str, Workload] = {
+    'arithmetic_chains': arithmetic_chains,
+    'nested_conditionals': nested_conditionals,
+    'cheap_tables': cheap_tables,
+    'stacks_and_queues': stacks_and_queues,
+    'music_import': music_import,
+    'many_functions': many_functions,
+}
@@ -1,402 +1,728 @@
-from .actions.apply_inventory_layout import (
-    ApplyInventoryLayoutExpression as ApplyInventoryLayoutExpression,
-)
-from .actions.apply_inventory_layout import (
-    apply_inventory_layout as apply_inventory_layout,
-)
-from .actions.apply_potion_effect import (
-    ApplyPotionEffectExpression as ApplyPotionEffectExpression,
-)
-from .actions.apply_potion_effect import (
-    apply_potion_effect as apply_potion_effect,
-)
-from .actions.block_type import BlockType as BlockType
-from .actions.can_pvp import CanPVP as CanPVP
-from .actions.can_pvp import CanPVPCondition as CanPVPCondition
-from .actions.cancel_event import (
-    CancelEventExpression as CancelEventExpression,
-)
-from .actions.cancel_event import (
-    cancel_event as cancel_event,
-)
-from .actions.change_player_group import (
-    ChangePlayerGroupExpression as ChangePlayerGroupExpression,
-)
-from .actions.change_player_group import (
-    change_player_group as change_player_group,
-)
-from .actions.change_velocity import (
-    ChangeVelocityExpression as ChangeVelocityExpression,
-)
-from .actions.change_velocity import (
-    change_velocity as change_velocity,
-)
-from .actions.chat import (
-    ChatExpression as ChatExpression,
-)
-from .actions.chat import (
-    chat as chat,
-)
-from .actions.clear_potion_effects import (
-    ClearPotionEffectsExpression as ClearPotionEffectsExpression,
-)
-from .actions.clear_potion_effects import (
-    clear_potion_effects as clear_potion_effects,
-)
-from .actions.close_menu import (
-    CloseMenuExpression as CloseMenuExpression,
-)
-from .actions.close_menu import (
-    close_menu as close_menu,
-)
-from .actions.conditional.statements import Else as Else
-from .actions.conditional.statements import IfAll as IfAll
-from .actions.conditional.statements import IfAny as IfAny
-from .actions.consume_item import (
-    ConsumeItemExpression as ConsumeItemExpression,
-)
-from .actions.consume_item import (
-    consume_item as consume_item,
-)
-from .actions.create_function import create_function as create_function
-from .actions.damage_cause import DamageCause as DamageCause
-from .actions.date_unix import DateUnix as DateUnix
-from .actions.date_unix import DateUnixMS as DateUnixMS
-from .actions.date_unix import DateUnixMSPlaceholder as DateUnixMSPlaceholder
-from .actions.date_unix import DateUnixPlaceholder as DateUnixPlaceholder
-from .actions.delete_items import (
-    delete_all_items_from_imports_folder as delete_all_items_from_imports_folder,
-)
-from .actions.display_action_bar import (
-    DisplayActionBarExpression as DisplayActionBarExpression,
-)
-from .actions.display_action_bar import (
-    display_action_bar as display_action_bar,
-)
-from .actions.display_menu import (
-    DisplayMenuExpression as DisplayMenuExpression,
-)
-from .actions.display_menu import (
-    display_menu as display_menu,
-)
-from .actions.display_title import (
-    DisplayTitleExpression as DisplayTitleExpression,
-)
-from .actions.display_title import (
-    display_title as display_title,
-)
-from .actions.doing_parkour import DoingParkour as DoingParkour
-from .actions.doing_parkour import DoingParkourCondition as DoingParkourCondition
-from .actions.drop_item import (
-    DropItemExpression as DropItemExpression,
-)
-from .actions.drop_item import (
-    drop_item as drop_item,
-)
-from .actions.enchant_held_item import (
-    EnchantHeldItemExpression as EnchantHeldItemExpression,
-)
-from .actions.enchant_held_item import (
-    enchant_held_item as enchant_held_item,
-)
-from .actions.enchantment import Enchantment as Enchantment
-from .actions.exit_function import (
-    ExitFunctionExpression as ExitFunctionExpression,
-)
-from .actions.exit_function import (
-    exit_function as exit_function,
-)
-from .actions.fail_parkour import (
-    FailParkourExpression as FailParkourExpression,
-)
-from .actions.fail_parkour import (
-    fail_parkour as fail_parkour,
-)
-from .actions.fishing_environment import FishingEnvironment as FishingEnvironment
-from .actions.full_heal import (
-    FullHealExpression as FullHealExpression,
-)
-from .actions.full_heal import (
-    full_heal as full_heal,
-)
-from .actions.function import Function as Function
-from .actions.give_experience_levels import (
-    GiveExperienceLevelsExpression as GiveExperienceLevelsExpression,
-)
-from .actions.give_experience_levels import (
-    give_experience_levels as give_experience_levels,
-)
-from .actions.give_item import (
-    GiveItemExpression as GiveItemExpression,
-)
-from .actions.give_item import (
-    give_item as give_item,
-)
-from .actions.go_to_house_spawn import (
-    GoToHouseSpawnExpression as GoToHouseSpawnExpression,
-)
-from .actions.go_to_house_spawn import (
-    go_to_house_spawn as go_to_house_spawn,
-)
-from .actions.group import Group as Group
-from .actions.group_color import GroupColor as GroupColor
-from .actions.group_color import GroupColorPlaceholder as GroupColorPlaceholder
-from .actions.group_name import GroupName as GroupName
-from .actions.group_name import GroupNamePlaceholder as GroupNamePlaceholder
-from .actions.group_priority import GroupPriority as GroupPriority
-from .actions.group_priority import GroupPriorityPlaceholder as GroupPriorityPlaceholder
-from .actions.group_tag import GroupTag as GroupTag
-from .actions.group_tag import GroupTagPlaceholder as GroupTagPlaceholder
-from .actions.has_item import HasItem as HasItem
-from .actions.has_potion_effect import HasPotionEffect as HasPotionEffect
-from .actions.house_cookies import HouseCookies as HouseCookies
-from .actions.house_cookies import HouseCookiesPlaceholder as HouseCookiesPlaceholder
-from .actions.house_guests import HouseGuests as HouseGuests
-from .actions.house_guests import HouseGuestsPlaceholder as HouseGuestsPlaceholder
-from .actions.house_players import HousePlayers as HousePlayers
-from .actions.house_players import HousePlayersPlaceholder as HousePlayersPlaceholder
-from .actions.house_visiting_rules import HouseVisitingRules as HouseVisitingRules
-from .actions.house_visiting_rules import (
-    HouseVisitingRulesPlaceholder as HouseVisitingRulesPlaceholder,
-)
-from .actions.is_doing_parkour import IsDoingParkour as IsDoingParkour
-from .actions.is_doing_parkour import (
-    IsDoingParkourCondition as IsDoingParkourCondition,
-)
-from .actions.is_flying import IsFlying as IsFlying
-from .actions.is_flying import IsFlyingCondition as IsFlyingCondition
-from .actions.is_item import IsItem as IsItem
-from .actions.is_sneaking import IsSneaking as IsSneaking
-from .actions.is_sneaking import IsSneakingCondition as IsSneakingCondition
-from .actions.item import Item as Item
-from .actions.item import normalize_item_key as normalize_item_key
-from .actions.kill_player import (
-    KillPlayerExpression as KillPlayerExpression,
-)
-from .actions.kill_player import (
-    kill_player as kill_player,
-)
-from .actions.launch_to_target import (
-    LaunchToTargetExpression as LaunchToTargetExpression,
-)
-from .actions.launch_to_target import (
-    launch_to_target as launch_to_target,
-)
-from .actions.layout import Layout as Layout
-from .actions.menu import Menu as Menu
-from .actions.no_fallback_values import NoFallbackValues as NoFallbackValues
-from .actions.no_optimization import NoOptimization as NoOptimization
-from .actions.no_type_casting import NoTypeCasting as NoTypeCasting
-from .actions.parkour_checkpoint import (
-    ParkourCheckpointExpression as ParkourCheckpointExpression,
-)
-from .actions.parkour_checkpoint import (
-    parkour_checkpoint as parkour_checkpoint,
-)
-from .actions.pause_execution import (
-    PauseExecutionExpression as PauseExecutionExpression,
-)
-from .actions.pause_execution import (
-    pause_execution as pause_execution,
-)
-from .actions.play_sound import (
-    PlaySoundExpression as PlaySoundExpression,
-)
-from .actions.play_sound import (
-    play_sound as play_sound,
-)
-from .actions.player_block_x import PlayerBlockX as PlayerBlockX
-from .actions.player_block_x import PlayerBlockXPlaceholder as PlayerBlockXPlaceholder
-from .actions.player_block_y import PlayerBlockY as PlayerBlockY
-from .actions.player_block_y import PlayerBlockYPlaceholder as PlayerBlockYPlaceholder
-from .actions.player_block_z import PlayerBlockZ as PlayerBlockZ
-from .actions.player_block_z import PlayerBlockZPlaceholder as PlayerBlockZPlaceholder
-from .actions.player_experience import PlayerExperience as PlayerExperience
-from .actions.player_experience import (
-    PlayerExperiencePlaceholder as PlayerExperiencePlaceholder,
-)
-from .actions.player_flying import PlayerFlying as PlayerFlying
-from .actions.player_flying import PlayerFlyingCondition as PlayerFlyingCondition
-from .actions.player_gamemode import PlayerGamemode as PlayerGamemode
-from .actions.player_gamemode import (
-    PlayerGamemodePlaceholder as PlayerGamemodePlaceholder,
-)
-from .actions.player_health import PlayerHealth as PlayerHealth
-from .actions.player_health import PlayerHealthPlaceholder as PlayerHealthPlaceholder
-from .actions.player_hunger import PlayerHunger as PlayerHunger
-from .actions.player_hunger import PlayerHungerPlaceholder as PlayerHungerPlaceholder
-from .actions.player_level import PlayerLevel as PlayerLevel
-from .actions.player_level import PlayerLevelPlaceholder as PlayerLevelPlaceholder
-from .actions.player_max_health import PlayerMaxHealth as PlayerMaxHealth
-from .actions.player_max_health import (
-    PlayerMaxHealthPlaceholder as PlayerMaxHealthPlaceholder,
-)
-from .actions.player_name import PlayerName as PlayerName
-from .actions.player_name import PlayerNamePlaceholder as PlayerNamePlaceholder
-from .actions.player_ping import PlayerPing as PlayerPing
-from .actions.player_ping import PlayerPingPlaceholder as PlayerPingPlaceholder
-from .actions.player_position_pitch import (
-    PlayerPositionPitch as PlayerPositionPitch,
-)
-from .actions.player_position_pitch import (
-    PlayerPositionPitchPlaceholder as PlayerPositionPitchPlaceholder,
-)
-from .actions.player_position_x import PlayerPositionX as PlayerPositionX
-from .actions.player_position_x import (
-    PlayerPositionXPlaceholder as PlayerPositionXPlaceholder,
-)
-from .actions.player_position_y import PlayerPositionY as PlayerPositionY
-from .actions.player_position_y import (
-    PlayerPositionYPlaceholder as PlayerPositionYPlaceholder,
-)
-from .actions.player_position_yaw import PlayerPositionYaw as PlayerPositionYaw
-from .actions.player_position_yaw import (
-    PlayerPositionYawPlaceholder as PlayerPositionYawPlaceholder,
-)
-from .actions.player_position_z import PlayerPositionZ as PlayerPositionZ
-from .actions.player_position_z import (
-    PlayerPositionZPlaceholder as PlayerPositionZPlaceholder,
-)
-from .actions.player_protocol import PlayerProtocol as PlayerProtocol
-from .actions.player_protocol import (
-    PlayerProtocolPlaceholder as PlayerProtocolPlaceholder,
-)
-from .actions.player_sneaking import PlayerSneaking as PlayerSneaking
-from .actions.player_sneaking import (
-    PlayerSneakingCondition as PlayerSneakingCondition,
-)
-from .actions.player_version import PlayerVersion as PlayerVersion
-from .actions.player_version import (
-    PlayerVersionPlaceholder as PlayerVersionPlaceholder,
-)
-from .actions.random import Random as Random
-from .actions.random import RandomContextManager as RandomContextManager
-from .actions.random import RandomExpression as RandomExpression
-from .actions.random_decimal import RandomDecimal as RandomDecimal
-from .actions.random_decimal import (
-    RandomDecimalPlaceholder as RandomDecimalPlaceholder,
-)
-from .actions.random_whole import RandomWhole as RandomWhole
-from .actions.random_whole import RandomWholePlaceholder as RandomWholePlaceholder
-from .actions.region import Region as Region
-from .actions.remove_item import (
-    RemoveItemExpression as RemoveItemExpression,
-)
-from .actions.remove_item import (
-    remove_item as remove_item,
-)
-from .actions.required_gamemode import RequiredGamemode as RequiredGamemode
-from .actions.required_group import RequiredGroup as RequiredGroup
-from .actions.required_team import RequiredTeam as RequiredTeam
-from .actions.reset_inventory import (
-    ResetInventoryExpression as ResetInventoryExpression,
-)
-from .actions.reset_inventory import (
-    reset_inventory as reset_inventory,
-)
-from .actions.send_to_lobby import (
-    SendToLobbyExpression as SendToLobbyExpression,
-)
-from .actions.send_to_lobby import (
-    send_to_lobby as send_to_lobby,
-)
-from .actions.server_name import ServerName as ServerName
-from .actions.server_name import ServerNamePlaceholder as ServerNamePlaceholder
-from .actions.server_short_name import ServerShortName as ServerShortName
-from .actions.server_short_name import (
-    ServerShortNamePlaceholder as ServerShortNamePlaceholder,
-)
-from .actions.set_compass_target import (
-    SetCompassTargetExpression as SetCompassTargetExpression,
-)
-from .actions.set_compass_target import (
-    set_compass_target as set_compass_target,
-)
-from .actions.set_gamemode import (
-    SetGamemodeExpression as SetGamemodeExpression,
-)
-from .actions.set_gamemode import (
-    set_gamemode as set_gamemode,
-)
-from .actions.set_player_team import (
-    SetPlayerTeamExpression as SetPlayerTeamExpression,
-)
-from .actions.set_player_team import (
-    set_player_team as set_player_team,
-)
-from .actions.team import Team as Team
-from .actions.team_color import TeamColor as TeamColor
-from .actions.team_color import TeamColorPlaceholder as TeamColorPlaceholder
-from .actions.team_name import TeamName as TeamName
-from .actions.team_name import TeamNamePlaceholder as TeamNamePlaceholder
-from .actions.team_players import TeamPlayers as TeamPlayers
-from .actions.team_players import TeamPlayersPlaceholder as TeamPlayersPlaceholder
-from .actions.team_tag import TeamTag as TeamTag
-from .actions.team_tag import TeamTagPlaceholder as TeamTagPlaceholder
-from .actions.teleport_player import (
-    TeleportPlayerExpression as TeleportPlayerExpression,
-)
-from .actions.teleport_player import (
-    teleport_player as teleport_player,
-)
-from .actions.trigger_function import (
-    TriggerFunctionExpression as TriggerFunctionExpression,
-)
-from .actions.trigger_function import (
-    trigger_function as trigger_function,
-)
-from .actions.within_region import WithinRegion as WithinRegion
-from .checkable import Checkable as Checkable
-from .config import disable_global_export as disable_global_export
-from .config import display_htsl as display_htsl
-from .config import get_htsl_import_folder as get_htsl_import_folder
-from .config import set_htsl_imports_folder as set_htsl_imports_folder
-from .container import CONTAINERS as CONTAINERS
-from .container import Container as Container
-from .container import get_current_container as get_current_container
-from .editable import Editable as Editable
-from .execute.backend_type import BackendType as BackendType
-from .execute.context import ExecutionContext as ExecutionContext
-from .execute.decorator import execute as execute
-from .execute.player import ExecutionPlayer as ExecutionPlayer
-from .export import export as export
-from .expression.binary_expression import BinaryExpression as BinaryExpression
-from .expression.condition.condition import Condition as Condition
-from .expression.condition.conditional_expression import (
-    ConditionalExpression as ConditionalExpression,
-)
-from .expression.expression import Expression as Expression
-from .expression.housing_type import HousingType as HousingType
-from .helpers import chunk_expressions as chunk_expressions
-from .helpers import chunked as chunked
-from .internal_type import InternalType as InternalType
-from .misc.skull_data import SKULL_DATA as SKULL_DATA
-from .misc.skull_data import SkullData as SkullData
-from .stats.global_stat import GlobalStat as GlobalStat
-from .stats.player_stat import PlayerStat as PlayerStat
-from .stats.stat import Stat as Stat
-from .stats.team_stat import TeamStat as TeamStat
-from .stats.temporary_stat import TemporaryStat as TemporaryStat
-from .types import ALL_DAMAGE_CAUSES as ALL_DAMAGE_CAUSES
-from .types import ALL_ENCHANTMENTS as ALL_ENCHANTMENTS
-from .types import ALL_GAMEMODES as ALL_GAMEMODES
-from .types import ALL_ITEM_KEY_STRINGS as ALL_ITEM_KEY_STRINGS
-from .types import ALL_ITEM_KEYS as ALL_ITEM_KEYS
-from .types import ALL_LOCATIONS as ALL_LOCATIONS
-from .types import ALL_POTION_EFFECTS as ALL_POTION_EFFECTS
-from .types import ALL_SOUNDS as ALL_SOUNDS
-from .types import ALL_SOUNDS_PRETTY as ALL_SOUNDS_PRETTY
-from .types import ALL_SOUNDS_PRETTY_TO_RAW as ALL_SOUNDS_PRETTY_TO_RAW
-from .types import ALL_SOUNDS_RAW as ALL_SOUNDS_RAW
-from .types import COOKIE_ITEM_KEY as COOKIE_ITEM_KEY
-from .types import DAMAGEABLE_ITEM_KEYS as DAMAGEABLE_ITEM_KEYS
-from .types import ENCHANTMENT_TO_ID as ENCHANTMENT_TO_ID
-from .types import FISHING_ENVIRONMENTS as FISHING_ENVIRONMENTS
-from .types import GOTO_CONTAINER as GOTO_CONTAINER
-from .types import INVENTORY_SLOTS as INVENTORY_SLOTS
-from .types import ITEM_CHECK_WHAT as ITEM_CHECK_WHAT
-from .types import ITEM_CHECK_WHERE as ITEM_CHECK_WHERE
-from .types import ITEM_REQUIRED_AMOUNT as ITEM_REQUIRED_AMOUNT
-from .types import LEATHER_ARMOR_KEYS as LEATHER_ARMOR_KEYS
-from .types import NON_SPECIAL_ITEM_KEYS as NON_SPECIAL_ITEM_KEYS
-from .types import PLAYER_SKULL_ITEM_KEY as PLAYER_SKULL_ITEM_KEY
+import sys
+from importlib import import_module
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .actions.apply_inventory_layout import (
+        ApplyInventoryLayoutExpression as ApplyInventoryLayoutExpression,
+    )
+    from .actions.apply_inventory_layout import (
+        apply_inventory_layout as apply_inventory_layout,
+    )
+    from .actions.apply_potion_effect import (
+        ApplyPotionEffectExpression as ApplyPotionEffectExpression,
+    )
+    from .actions.apply_potion_effect import (
+        apply_potion_effect as apply_potion_effect,
+    )
+    from .actions.block_type import BlockType as BlockType
+    from .actions.can_pvp import CanPVP as CanPVP
+    from .actions.can_pvp import CanPVPCondition as CanPVPCondition
+    from .actions.cancel_event import (
+        CancelEventExpression as CancelEventExpression,
+    )
+    from .actions.cancel_event import (
+        cancel_event as cancel_event,
+    )
+    from .actions.change_player_group import (
+        ChangePlayerGroupExpression as ChangePlayerGroupExpression,
+    )
+    from .actions.change_player_group import (
+        change_player_group as change_player_group,
+    )
+    from .actions.change_velocity import (
+        ChangeVelocityExpression as ChangeVelocityExpression,
+    )
+    from .actions.change_velocity import (
+        change_velocity as change_velocity,
+    )
+    from .actions.chat import (
+        ChatExpression as ChatExpression,
+    )
+    from .actions.chat import (
+        chat as chat,
+    )
+    from .actions.clear_potion_effects import (
+        ClearPotionEffectsExpression as ClearPotionEffectsExpression,
+    )
+    from .actions.clear_potion_effects import (
+        clear_potion_effects as clear_potion_effects,
+    )
+    from .actions.close_menu import (
+        CloseMenuExpression as CloseMenuExpression,
+    )
+    from .actions.close_menu import (
+        close_menu as close_menu,
+    )
+    from .actions.conditional.statements import Else as Else
+    from .actions.conditional.statements import IfAll as IfAll
+    from .actions.conditional.statements import IfAny as IfAny
+    from .actions.consume_item import (
+        ConsumeItemExpression as ConsumeItemExpression,
+    )
+    from .actions.consume_item import (
+        consume_item as consume_item,
+    )
+    from .actions.create_function import create_function as create_function
+    from .actions.damage_cause import DamageCause as DamageCause
+    from .actions.date_unix import DateUnix as DateUnix
+    from .actions.date_unix import DateUnixMS as DateUnixMS
+    from .actions.date_unix import DateUnixMSPlaceholder as DateUnixMSPlaceholder
+    from .actions.date_unix import DateUnixPlaceholder as DateUnixPlaceholder
+    from .actions.delete_items import (
+        delete_all_items_from_imports_folder as delete_all_items_from_imports_folder,
+    )
+    from .actions.display_action_bar import (
+        DisplayActionBarExpression as DisplayActionBarExpression,
+    )
+    from .actions.display_action_bar import (
+        display_action_bar as display_action_bar,
+    )
+    from .actions.display_menu import (
+        DisplayMenuExpression as DisplayMenuExpression,
+    )
+    from .actions.display_menu import (
+        display_menu as display_menu,
+    )
+    from .actions.display_title import (
+        DisplayTitleExpression as DisplayTitleExpression,
+    )
+    from .actions.display_title import (
+        display_title as display_title,
+    )
+    from .actions.doing_parkour import DoingParkour as DoingParkour
+    from .actions.doing_parkour import DoingParkourCondition as DoingParkourCondition
+    from .actions.drop_item import (
+        DropItemExpression as DropItemExpression,
+    )
+    from .actions.drop_item import (
+        drop_item as drop_item,
+    )
+    from .actions.enchant_held_item import (
+        EnchantHeldItemExpression as EnchantHeldItemExpression,
+    )
+    from .actions.enchant_held_item import (
+        enchant_held_item as enchant_held_item,
+    )
+    from .actions.enchantment import Enchantment as Enchantment
+    from .actions.exit_function import (
+        ExitFunctionExpression as ExitFunctionExpression,
+    )
+    from .actions.exit_function import (
+        exit_function as exit_function,
+    )
+    from .actions.fail_parkour import (
+        FailParkourExpression as FailParkourExpression,
+    )
+    from .actions.fail_parkour import (
+        fail_parkour as fail_parkour,
+    )
+    from .actions.fishing_environment import FishingEnvironment as FishingEnvironment
+    from .actions.full_heal import (
+        FullHealExpression as FullHealExpression,
+    )
+    from .actions.full_heal import (
+        full_heal as full_heal,
+    )
+    from .actions.function import Function as Function
+    from .actions.give_experience_levels import (
+        GiveExperienceLevelsExpression as GiveExperienceLevelsExpression,
+    )
+    from .actions.give_experience_levels import (
+        give_experience_levels as give_experience_levels,
+    )
+    from .actions.give_item import (
+        GiveItemExpression as GiveItemExpression,
+    )
+    from .actions.give_item import (
+        give_item as give_item,
+    )
+    from .actions.go_to_house_spawn import (
+        GoToHouseSpawnExpression as GoToHouseSpawnExpression,
+    )
+    from .actions.go_to_house_spawn import (
+        go_to_house_spawn as go_to_house_spawn,
+    )
+    from .actions.group import Group as Group
+    from .actions.group_color import GroupColor as GroupColor
+    from .actions.group_color import GroupColorPlaceholder as GroupColorPlaceholder
+    from .actions.group_name import GroupName as GroupName
+    from .actions.group_name import GroupNamePlaceholder as GroupNamePlaceholder
+    from .actions.group_priority import GroupPriority as GroupPriority
+    from .actions.group_priority import (
+        GroupPriorityPlaceholder as GroupPriorityPlaceholder,
+    )
+    from .actions.group_tag import GroupTag as GroupTag
+    from .actions.group_tag import GroupTagPlaceholder as GroupTagPlaceholder
+    from .actions.has_item import HasItem as HasItem
+    from .actions.has_potion_effect import HasPotionEffect as HasPotionEffect
+    from .actions.house_cookies import HouseCookies as HouseCookies
+    from .actions.house_cookies import (
+        HouseCookiesPlaceholder as HouseCookiesPlaceholder,
+    )
+    from .actions.house_guests import HouseGuests as HouseGuests
+    from .actions.house_guests import HouseGuestsPlaceholder as HouseGuestsPlaceholder
+    from .actions.house_players import HousePlayers as HousePlayers
+    from .actions.house_players import (
+        HousePlayersPlaceholder as HousePlayersPlaceholder,
+    )
+    from .actions.house_visiting_rules import HouseVisitingRules as HouseVisitingRules
+    from .actions.house_visiting_rules import (
+        HouseVisitingRulesPlaceholder as HouseVisitingRulesPlaceholder,
+    )
+    from .actions.is_doing_parkour import IsDoingParkour as IsDoingParkour
+    from .actions.is_doing_parkour import (
+        IsDoingParkourCondition as IsDoingParkourCondition,
+    )
+    from .actions.is_flying import IsFlying as IsFlying
+    from .actions.is_flying import IsFlyingCondition as IsFlyingCondition
+    from .actions.is_item import IsItem as IsItem
+    from .actions.is_sneaking import IsSneaking as IsSneaking
+    from .actions.is_sneaking import IsSneakingCondition as IsSneakingCondition
+    from .actions.item import Item as Item
+    from .actions.item import normalize_item_key as normalize_item_key
+    from .actions.kill_player import (
+        KillPlayerExpression as KillPlayerExpression,
+    )
+    from .actions.kill_player import (
+        kill_player as kill_player,
+    )
+    from .actions.launch_to_target import (
+        LaunchToTargetExpression as LaunchToTargetExpression,
+    )
+    from .actions.launch_to_target import (
+        launch_to_target as launch_to_target,
+    )
+    from .actions.layout import Layout as Layout
+    from .actions.menu import Menu as Menu
+    from .actions.no_fallback_values import NoFallbackValues as NoFallbackValues
+    from .actions.no_optimization import NoOptimization as NoOptimization
+    from .actions.no_type_casting import NoTypeCasting as NoTypeCasting
+    from .actions.parkour_checkpoint import (
+        ParkourCheckpointExpression as ParkourCheckpointExpression,
+    )
+    from .actions.parkour_checkpoint import (
+        parkour_checkpoint as parkour_checkpoint,
+    )
+    from .actions.pause_execution import (
+        PauseExecutionExpression as PauseExecutionExpression,
+    )
+    from .actions.pause_execution import (
+        pause_execution as pause_execution,
+    )
+    from .actions.play_sound import (
+        PlaySoundExpression as PlaySoundExpression,
+    )
+    from .actions.play_sound import (
+        play_sound as play_sound,
+    )
+    from .actions.player_block_x import PlayerBlockX as PlayerBlockX
+    from .actions.player_block_x import (
+        PlayerBlockXPlaceholder as PlayerBlockXPlaceholder,
+    )
+    from .actions.player_block_y import PlayerBlockY as PlayerBlockY
+    from .actions.player_block_y import (
+        PlayerBlockYPlaceholder as PlayerBlockYPlaceholder,
+    )
+    from .actions.player_block_z import PlayerBlockZ as PlayerBlockZ
+    from .actions.player_block_z import (
+        PlayerBlockZPlaceholder as PlayerBlockZPlaceholder,
+    )
+    from .actions.player_experience import PlayerExperience as PlayerExperience
+    from .actions.player_experience import (
+        PlayerExperiencePlaceholder as PlayerExperiencePlaceholder,
+    )
+    from .actions.player_flying import PlayerFlying as PlayerFlying
+    from .actions.player_flying import PlayerFlyingCondition as PlayerFlyingCondition
+    from .actions.player_gamemode import PlayerGamemode as PlayerGamemode
+    from .actions.player_gamemode import (
+        PlayerGamemodePlaceholder as PlayerGamemodePlaceholder,
+    )
+    from .actions.player_health import PlayerHealth as PlayerHealth
+    from .actions.player_health import (
+        PlayerHealthPlaceholder as PlayerHealthPlaceholder,
+    )
+    from .actions.player_hunger import PlayerHunger as PlayerHunger
+    from .actions.player_hunger import (
+        PlayerHungerPlaceholder as PlayerHungerPlaceholder,
+    )
+    from .actions.player_level import PlayerLevel as PlayerLevel
+    from .actions.player_level import PlayerLevelPlaceholder as PlayerLevelPlaceholder
+    from .actions.player_max_health import PlayerMaxHealth as PlayerMaxHealth
+    from .actions.player_max_health import (
+        PlayerMaxHealthPlaceholder as PlayerMaxHealthPlaceholder,
+    )
+    from .actions.player_name import PlayerName as PlayerName
+    from .actions.player_name import PlayerNamePlaceholder as PlayerNamePlaceholder
+    from .actions.player_ping import PlayerPing as PlayerPing
+    from .actions.player_ping import PlayerPingPlaceholder as PlayerPingPlaceholder
+    from .actions.player_position_pitch import (
+        PlayerPositionPitch as PlayerPositionPitch,
+    )
+    from .actions.player_position_pitch import (
+        PlayerPositionPitchPlaceholder as PlayerPositionPitchPlaceholder,
+    )
+    from .actions.player_position_x import PlayerPositionX as PlayerPositionX
+    from .actions.player_position_x import (
+        PlayerPositionXPlaceholder as PlayerPositionXPlaceholder,
+    )
+    from .actions.player_position_y import PlayerPositionY as PlayerPositionY
+    from .actions.player_position_y import (
+        PlayerPositionYPlaceholder as PlayerPositionYPlaceholder,
+    )
+    from .actions.player_position_yaw import PlayerPositionYaw as PlayerPositionYaw
+    from .actions.player_position_yaw import (
+        PlayerPositionYawPlaceholder as PlayerPositionYawPlaceholder,
+    )
+    from .actions.player_position_z import PlayerPositionZ as PlayerPositionZ
+    from .actions.player_position_z import (
+        PlayerPositionZPlaceholder as PlayerPositionZPlaceholder,
+    )
+    from .actions.player_protocol import PlayerProtocol as PlayerProtocol
+    from .actions.player_protocol import (
+        PlayerProtocolPlaceholder as PlayerProtocolPlaceholder,
+    )
+    from .actions.player_sneaking import PlayerSneaking as PlayerSneaking
+    from .actions.player_sneaking import (
+        PlayerSneakingCondition as PlayerSneakingCondition,
+    )
+    from .actions.player_version import PlayerVersion as PlayerVersion
+    from .actions.player_version import (
+        PlayerVersionPlaceholder as PlayerVersionPlaceholder,
+    )
+    from .actions.random import Random as Random
+    from .actions.random import RandomContextManager as RandomContextManager
+    from .actions.random import RandomExpression as RandomExpression
+    from .actions.random_decimal import RandomDecimal as RandomDecimal
+    from .actions.random_decimal import (
+        RandomDecimalPlaceholder as RandomDecimalPlaceholder,
+    )
+    from .actions.random_whole import RandomWhole as RandomWhole
+    from .actions.random_whole import RandomWholePlaceholder as RandomWholePlaceholder
+    from .actions.region import Region as Region
+    from .actions.remove_item import (
+        RemoveItemExpression as RemoveItemExpression,
+    )
+    from .actions.remove_item import (
+        remove_item as remove_item,
+    )
+    from .actions.required_gamemode import RequiredGamemode as RequiredGamemode
+    from .actions.required_group import RequiredGroup as RequiredGroup
+    from .actions.required_team import RequiredTeam as RequiredTeam
+    from .actions.reset_inventory import (
+        ResetInventoryExpression as ResetInventoryExpression,
+    )
+    from .actions.reset_inventory import (
+        reset_inventory as reset_inventory,
+    )
+    from .actions.send_to_lobby import (
+        SendToLobbyExpression as SendToLobbyExpression,
+    )
+    from .actions.send_to_lobby import (
+        send_to_lobby as send_to_lobby,
+    )
+    from .actions.server_name import ServerName as ServerName
+    from .actions.server_name import ServerNamePlaceholder as ServerNamePlaceholder
+    from .actions.server_short_name import ServerShortName as ServerShortName
+    from .actions.server_short_name import (
+        ServerShortNamePlaceholder as ServerShortNamePlaceholder,
+    )
+    from .actions.set_compass_target import (
+        SetCompassTargetExpression as SetCompassTargetExpression,
+    )
+    from .actions.set_compass_target import (
+        set_compass_target as set_compass_target,
+    )
+    from .actions.set_gamemode import (
+        SetGamemodeExpression as SetGamemodeExpression,
+    )
+    from .actions.set_gamemode import (
+        set_gamemode as set_gamemode,
+    )
+    from .actions.set_player_team import (
+        SetPlayerTeamExpression as SetPlayerTeamExpression,
+    )
+    from .actions.set_player_team import (
+        set_player_team as set_player_team,
+    )
+    from .actions.team import Team as Team
+    from .actions.team_color import TeamColor as TeamColor
+    from .actions.team_color import TeamColorPlaceholder as TeamColorPlaceholder
+    from .actions.team_name import TeamName as TeamName
+    from .actions.team_name import TeamNamePlaceholder as TeamNamePlaceholder
+    from .actions.team_players import TeamPlayers as TeamPlayers
+    from .actions.team_players import TeamPlayersPlaceholder as TeamPlayersPlaceholder
+    from .actions.team_tag import TeamTag as TeamTag
+    from .actions.team_tag import TeamTagPlaceholder as TeamTagPlaceholder
+    from .actions.teleport_player import (
+        TeleportPlayerExpression as TeleportPlayerExpression,
+    )
+    from .actions.teleport_player import (
+        teleport_player as teleport_player,
+    )
+    from .actions.trigger_function import (
+        TriggerFunctionExpression as TriggerFunctionExpression,
+    )
+    from .actions.trigger_function import (
+        trigger_function as trigger_function,
+    )
+    from .actions.within_region import WithinRegion as WithinRegion
+    from .build import BuildJob as BuildJob
+    from .build import build as build
+    from .checkable import Checkable as Checkable
+    from .compile_cache import CompileCache as CompileCache
+    from .compile_cache import disable_compile_cache as disable_compile_cache
+    from .compile_cache import enable_compile_cache as enable_compile_cache
+    from .compile_cache import get_compile_cache as get_compile_cache
+    from .config import diff_export as diff_export
+    from .config import disable_global_export as disable_global_export
+    from .config import display_htsl as display_htsl
+    from .config import get_htsl_import_folder as get_htsl_import_folder
+    from .config import override_htsl_imports_folder as override_htsl_imports_folder
+    from .config import set_htsl_imports_folder as set_htsl_imports_folder
+    from .config import split_export as split_export
+    from .container import CONTAINERS as CONTAINERS
+    from .container import Container as Container
+    from .container import get_current_container as get_current_container
+    from .editable import Editable as Editable
+    from .execute.backend_type import BackendType as BackendType
+    from .execute.context import ExecutionContext as ExecutionContext
+    from .execute.decorator import execute as execute
+    from .execute.player import ExecutionPlayer as ExecutionPlayer
+    from .export import export as export
+    from .expression.binary_expression import BinaryExpression as BinaryExpression
+    from .expression.condition.condition import Condition as Condition
+    from .expression.condition.conditional_expression import (
+        ConditionalExpression as ConditionalExpression,
+    )
+    from .expression.expression import Expression as Expression
+    from .expression.housing_type import HousingType as HousingType
+    from .helpers import chunk_expressions as chunk_expressions
+    from .helpers import chunked as chunked
+    from .internal_type import InternalType as InternalType
+    from .limits import PackingMode as PackingMode
+    from .misc.skull_data import SKULL_DATA as SKULL_DATA
+    from .misc.skull_data import SkullData as SkullData
+    from .profiler import CompileProfiler as CompileProfiler
+    from .profiler import disable_profiler as disable_profiler
+    from .profiler import enable_profiler as enable_profiler
+    from .profiler import get_profiler as get_profiler
+    from .stats.global_stat import GlobalStat as GlobalStat
+    from .stats.player_stat import PlayerStat as PlayerStat
+    from .stats.stat import Stat as Stat
+    from .stats.team_stat import TeamStat as TeamStat
+    from .stats.temporary_stat import TemporaryStat as TemporaryStat
+    from .types import ALL_DAMAGE_CAUSES as ALL_DAMAGE_CAUSES
+    from .types import ALL_ENCHANTMENTS as ALL_ENCHANTMENTS
+    from .types import ALL_GAMEMODES as ALL_GAMEMODES
+    from .types import ALL_ITEM_KEY_STRINGS as ALL_ITEM_KEY_STRINGS
+    from .types import ALL_ITEM_KEYS as ALL_ITEM_KEYS
+    from .types import ALL_LOCATIONS as ALL_LOCATIONS
+    from .types import ALL_POTION_EFFECTS as ALL_POTION_EFFECTS
+    from .types import ALL_SOUNDS as ALL_SOUNDS
+    from .types import ALL_SOUNDS_PRETTY as ALL_SOUNDS_PRETTY
+    from .types import ALL_SOUNDS_PRETTY_TO_RAW as ALL_SOUNDS_PRETTY_TO_RAW
+    from .types import ALL_SOUNDS_RAW as ALL_SOUNDS_RAW
+    from .types import COOKIE_ITEM_KEY as COOKIE_ITEM_KEY
+    from .types import DAMAGEABLE_ITEM_KEYS as DAMAGEABLE_ITEM_KEYS
+    from .types import ENCHANTMENT_TO_ID as ENCHANTMENT_TO_ID
+    from .types import FISHING_ENVIRONMENTS as FISHING_ENVIRONMENTS
+    from .types import GOTO_CONTAINER as GOTO_CONTAINER
+    from .types import INVENTORY_SLOTS as INVENTORY_SLOTS
+    from .types import ITEM_CHECK_WHAT as ITEM_CHECK_WHAT
+    from .types import ITEM_CHECK_WHERE as ITEM_CHECK_WHERE
+    from .types import ITEM_REQUIRED_AMOUNT as ITEM_REQUIRED_AMOUNT
+    from .types import LEATHER_ARMOR_KEYS as LEATHER_ARMOR_KEYS
+    from .types import NON_SPECIAL_ITEM_KEYS as NON_SPECIAL_ITEM_KEYS
+    from .types import PLAYER_SKULL_ITEM_KEY as PLAYER_SKULL_ITEM_KEY
+    from .watch import Watcher as Watcher
+    from .watch import watch as watch
+
+
+# Every public name, and the submodule it is imported from on first access.
+# Importing everything up front would load every action, numpy, sounddevice
+# and the item and skull data before any user code runs.
+_LAZY_IMPORTS: dict[str, str] = {
+    'ApplyInventoryLayoutExpression': '.actions.apply_inventory_layout',
+    'apply_inventory_layout': '.actions.apply_inventory_layout',
+    'ApplyPotionEffectExpression': '.actions.apply_potion_effect',
+    'apply_potion_effect': '.actions.apply_potion_effect',
+    'BlockType': '.actions.block_type',
+    'CanPVP': '.actions.can_pvp',
+    'CanPVPCondition': '.actions.can_pvp',
+    'CancelEventExpression': '.actions.cancel_event',
+    'cancel_event': '.actions.cancel_event',
+    'ChangePlayerGroupExpression': '.actions.change_player_group',
+    'change_player_group': '.actions.change_player_group',
+    'ChangeVelocityExpression': '.actions.change_velocity',
+    'change_velocity': '.actions.change_velocity',
+    'ChatExpression': '.actions.chat',
+    'chat': '.actions.chat',
+    'ClearPotionEffectsExpression': '.actions.clear_potion_effects',
+    'clear_potion_effects': '.actions.clear_potion_effects',
+    'CloseMenuExpression': '.actions.close_menu',
+    'close_menu': '.actions.close_menu',
+    'Else': '.actions.conditional.statements',
+    'IfAll': '.actions.conditional.statements',
+    'IfAny': '.actions.conditional.statements',
+    'ConsumeItemExpression': '.actions.consume_item',
+    'consume_item': '.actions.consume_item',
+    'create_function': '.actions.create_function',
+    'DamageCause': '.actions.damage_cause',
+    'DateUnix': '.actions.date_unix',
+    'DateUnixMS': '.actions.date_unix',
+    'DateUnixMSPlaceholder': '.actions.date_unix',
+    'DateUnixPlaceholder': '.actions.date_unix',
+    'delete_all_items_from_imports_folder': '.actions.delete_items',
+    'DisplayActionBarExpression': '.actions.display_action_bar',
+    'display_action_bar': '.actions.display_action_bar',
+    'DisplayMenuExpression': '.actions.display_menu',
+    'display_menu': '.actions.display_menu',
+    'DisplayTitleExpression': '.actions.display_title',
+    'display_title': '.actions.display_title',
+    'DoingParkour': '.actions.doing_parkour',
+    'DoingParkourCondition': '.actions.doing_parkour',
+    'DropItemExpression': '.actions.drop_item',
+    'drop_item': '.actions.drop_item',
+    'EnchantHeldItemExpression': '.actions.enchant_held_item',
+    'enchant_held_item': '.actions.enchant_held_item',
+    'Enchantment': '.actions.enchantment',
+    'ExitFunctionExpression': '.actions.exit_function',
+    'exit_function': '.actions.exit_function',
+    'FailParkourExpression': '.actions.fail_parkour',
+    'fail_parkour': '.actions.fail_parkour',
+    'FishingEnvironment': '.actions.fishing_environment',
+    'FullHealExpression': '.actions.full_heal',
+    'full_heal': '.actions.full_heal',
+    'Function': '.actions.function',
+    'GiveExperienceLevelsExpression': '.actions.give_experience_levels',
+    'give_experience_levels': '.actions.give_experience_levels',
+    'GiveItemExpression': '.actions.give_item',
+    'give_item': '.actions.give_item',
+    'GoToHouseSpawnExpression': '.actions.go_to_house_spawn',
+    'go_to_house_spawn': '.actions.go_to_house_spawn',
+    'Group': '.actions.group',
+    'GroupColor': '.actions.group_color',
+    'GroupColorPlaceholder': '.actions.group_color',
+    'GroupName': '.actions.group_name',
+    'GroupNamePlaceholder': '.actions.group_name',
+    'GroupPriority': '.actions.group_priority',
+    'GroupPriorityPlaceholder': '.actions.group_priority',
+    'GroupTag': '.actions.group_tag',
+    'GroupTagPlaceholder': '.actions.group_tag',
+    'HasItem': '.actions.has_item',
+    'HasPotionEffect': '.actions.has_potion_effect',
+    'HouseCookies': '.actions.house_cookies',
+    'HouseCookiesPlaceholder': '.actions.house_cookies',
+    'HouseGuests': '.actions.house_guests',
+    'HouseGuestsPlaceholder': '.actions.house_guests',
+    'HousePlayers': '.actions.house_players',
+    'HousePlayersPlaceholder': '.actions.house_players',
+    'HouseVisitingRules': '.actions.house_visiting_rules',
+    'HouseVisitingRulesPlaceholder': '.actions.house_visiting_rules',
+    'IsDoingParkour': '.actions.is_doing_parkour',
+    'IsDoingParkourCondition': '.actions.is_doing_parkour',
+    'IsFlying': '.actions.is_flying',
+    'IsFlyingCondition': '.actions.is_flying',
+    'IsItem': '.actions.is_item',
+    'IsSneaking': '.actions.is_sneaking',
+    'IsSneakingCondition': '.actions.is_sneaking',
+    'Item': '.actions.item',
+    'normalize_item_key': '.actions.item',
+    'KillPlayerExpression': '.actions.kill_player',
+    'kill_player': '.actions.kill_player',
+    'LaunchToTargetExpression': '.actions.launch_to_target',
+    'launch_to_target': '.actions.launch_to_target',
+    'Layout': '.actions.layout',
+    'Menu': '.actions.menu',
+    'NoFallbackValues': '.actions.no_fallback_values',
+    'NoOptimization': '.actions.no_optimization',
+    'NoTypeCasting': '.actions.no_type_casting',
+    'ParkourCheckpointExpression': '.actions.parkour_checkpoint',
+    'parkour_checkpoint': '.actions.parkour_checkpoint',
+    'PauseExecutionExpression': '.actions.pause_execution',
+    'pause_execution': '.actions.pause_execution',
+    'PlaySoundExpression': '.actions.play_sound',
+    'play_sound': '.actions.play_sound',
+    'PlayerBlockX': '.actions.player_block_x',
+    'PlayerBlockXPlaceholder': '.actions.player_block_x',
+    'PlayerBlockY': '.actions.player_block_y',
+    'PlayerBlockYPlaceholder': '.actions.player_block_y',
+    'PlayerBlockZ': '.actions.player_block_z',
+    'PlayerBlockZPlaceholder': '.actions.player_block_z',
+    'PlayerExperience': '.actions.player_experience',
+    'PlayerExperiencePlaceholder': '.actions.player_experience',
+    'PlayerFlying': '.actions.player_flying',
+    'PlayerFlyingCondition': '.actions.player_flying',
+    'PlayerGamemode': '.actions.player_gamemode',
+    'PlayerGamemodePlaceholder': '.actions.player_gamemode',
+    'PlayerHealth': '.actions.player_health',
+    'PlayerHealthPlaceholder': '.actions.player_health',
+    'PlayerHunger': '.actions.player_hunger',
+    'PlayerHungerPlaceholder': '.actions.player_hunger',
+    'PlayerLevel': '.actions.player_level',
+    'PlayerLevelPlaceholder': '.actions.player_level',
+    'PlayerMaxHealth': '.actions.player_max_health',
+    'PlayerMaxHealthPlaceholder': '.actions.player_max_health',
+    'PlayerName': '.actions.player_name',
+    'PlayerNamePlaceholder': '.actions.player_name',
+    'PlayerPing': '.actions.player_ping',
+    'PlayerPingPlaceholder': '.actions.player_ping',
+    'PlayerPositionPitch': '.actions.player_position_pitch',
+    'PlayerPositionPitchPlaceholder': '.actions.player_position_pitch',
+    'PlayerPositionX': '.actions.player_position_x',
+    'PlayerPositionXPlaceholder': '.actions.player_position_x',
+    'PlayerPositionY': '.actions.player_position_y',
+    'PlayerPositionYPlaceholder': '.actions.player_position_y',
+    'PlayerPositionYaw': '.actions.player_position_yaw',
+    'PlayerPositionYawPlaceholder': '.actions.player_position_yaw',
+    'PlayerPositionZ': '.actions.player_position_z',
+    'PlayerPositionZPlaceholder': '.actions.player_position_z',
+    'PlayerProtocol': '.actions.player_protocol',
+    'PlayerProtocolPlaceholder': '.actions.player_protocol',
+    'PlayerSneaking': '.actions.player_sneaking',
+    'PlayerSneakingCondition': '.actions.player_sneaking',
+    'PlayerVersion': '.actions.player_version',
+    'PlayerVersionPlaceholder': '.actions.player_version',
+    'Random': '.actions.random',
+    'RandomContextManager': '.actions.random',
+    'RandomExpression': '.actions.random',
+    'RandomDecimal': '.actions.random_decimal',
+    'RandomDecimalPlaceholder': '.actions.random_decimal',
+    'RandomWhole': '.actions.random_whole',
+    'RandomWholePlaceholder': '.actions.random_whole',
+    'Region': '.actions.region',
+    'RemoveItemExpression': '.actions.remove_item',
+    'remove_item': '.actions.remove_item',
+    'RequiredGamemode': '.actions.required_gamemode',
+    'RequiredGroup': '.actions.required_group',
+    'RequiredTeam': '.actions.required_team',
+    'ResetInventoryExpression': '.actions.reset_inventory',
+    'reset_inventory': '.actions.reset_inventory',
+    'SendToLobbyExpression': '.actions.send_to_lobby',
+    'send_to_lobby': '.actions.send_to_lobby',
+    'ServerName': '.actions.server_name',
+    'ServerNamePlaceholder': '.actions.server_name',
+    'ServerShortName': '.actions.server_short_name',
+    'ServerShortNamePlaceholder': '.actions.server_short_name',
+    'SetCompassTargetExpression': '.actions.set_compass_target',
+    'set_compass_target': '.actions.set_compass_target',
+    'SetGamemodeExpression': '.actions.set_gamemode',
+    'set_gamemode': '.actions.set_gamemode',
+    'SetPlayerTeamExpression': '.actions.set_player_team',
+    'set_player_team': '.actions.set_player_team',
+    'Team': '.actions.team',
+    'TeamColor': '.actions.team_color',
+    'TeamColorPlaceholder': '.actions.team_color',
+    'TeamName': '.actions.team_name',
+    'TeamNamePlaceholder': '.actions.team_name',
+    'TeamPlayers': '.actions.team_players',
+    'TeamPlayersPlaceholder': '.actions.team_players',
+    'TeamTag': '.actions.team_tag',
+    'TeamTagPlaceholder': '.actions.team_tag',
+    'TeleportPlayerExpression': '.actions.teleport_player',
+    'teleport_player': '.actions.teleport_player',
+    'TriggerFunctionExpression': '.actions.trigger_function',
+    'trigger_function': '.actions.trigger_function',
+    'WithinRegion': '.actions.within_region',
+    'BuildJob': '.build',
+    'build': '.build',
+    'Checkable': '.checkable',
+    'CompileCache': '.compile_cache',
+    'disable_compile_cache': '.compile_cache',
+    'enable_compile_cache': '.compile_cache',
+    'get_compile_cache': '.compile_cache',
+    'diff_export': '.config',
+    'disable_global_export': '.config',
+    'display_htsl': '.config',
+    'get_htsl_import_folder': '.config',
+    'override_htsl_imports_folder': '.config',
+    'set_htsl_imports_folder': '.config',
+    'split_export': '.config',
+    'CONTAINERS': '.container',
+    'Container': '.container',
+    'get_current_container': '.container',
+    'Editable': '.editable',
+    'BackendType': '.execute.backend_type',
+    'ExecutionContext': '.execute.context',
+    'execute': '.execute.decorator',
+    'ExecutionPlayer': '.execute.player',
+    'export': '.export',
+    'BinaryExpression': '.expression.binary_expression',
+    'Condition': '.expression.condition.condition',
+    'ConditionalExpression': '.expression.condition.conditional_expression',
+    'Expression': '.expression.expression',
+    'HousingType': '.expression.housing_type',
+    'chunk_expressions': '.helpers',
+    'chunked': '.helpers',
+    'InternalType': '.internal_type',
+    'PackingMode': '.limits',
+    'SKULL_DATA': '.misc.skull_data',
+    'SkullData': '.misc.skull_data',
+    'CompileProfiler': '.profiler',
+    'disable_profiler': '.profiler',
+    'enable_profiler': '.profiler',
+    'get_profiler': '.profiler',
+    'GlobalStat': '.stats.global_stat',
+    'PlayerStat': '.stats.player_stat',
+    'Stat': '.stats.stat',
+    'TeamStat': '.stats.team_stat',
+    'TemporaryStat': '.stats.temporary_stat',
+    'ALL_DAMAGE_CAUSES': '.types',
+    'ALL_ENCHANTMENTS': '.types',
+    'ALL_GAMEMODES': '.types',
+    'ALL_ITEM_KEY_STRINGS': '.types',
+    'ALL_ITEM_KEYS': '.types',
+    'ALL_LOCATIONS': '.types',
+    'ALL_POTION_EFFECTS': '.types',
+    'ALL_SOUNDS': '.types',
+    'ALL_SOUNDS_PRETTY': '.types',
+    'ALL_SOUNDS_PRETTY_TO_RAW': '.types',
+    'ALL_SOUNDS_RAW': '.types',
+    'COOKIE_ITEM_KEY': '.types',
+    'DAMAGEABLE_ITEM_KEYS': '.types',
+    'ENCHANTMENT_TO_ID': '.types',
+    'FISHING_ENVIRONMENTS': '.types',
+    'GOTO_CONTAINER': '.types',
+    'INVENTORY_SLOTS': '.types',
+    'ITEM_CHECK_WHAT': '.types',
+    'ITEM_CHECK_WHERE': '.types',
+    'ITEM_REQUIRED_AMOUNT': '.types',
+    'LEATHER_ARMOR_KEYS': '.types',
+    'NON_SPECIAL_ITEM_KEYS': '.types',
+    'PLAYER_SKULL_ITEM_KEY': '.types',
+    'Watcher': '.watch',
+    'watch': '.watch',
+}
+
+__all__ = tuple(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_IMPORTS})
+
+
+class _LazyModule(ModuleType):
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Importing a submodule binds it on this package, which would hide the
+        # public name it shares (like `execute` and `export`)
+        if (
+            name in _LAZY_IMPORTS
+            and isinstance(value, ModuleType)
+            and value.__name__ == f'{__name__}.{name}'
+        ):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LazyModule
@@ -0,0 +1,144 @@
+import argparse
+import atexit
+import sys
+from pathlib import Path
+
+from .build import BuildResult, build, parse_build_target
+from .compile_cache import DEFAULT_CACHE_FOLDER
+from .container import on_program_exit
+from .utils.log import log
+
+
+def _log_result(result: BuildResult, verbose: bool) -> None:
+    status = (
+        '\x1b[38;2;255;0;0mfailed\x1b[0m'
+        if not result.ok
+        else 'changed'
+        if any(result.exports.values())
+        else 'unchanged'
+    )
+    log(
+        f'\x1b[38;2;0;255;0m{result.job.name}\x1b[0m ({result.job.target}) '
+        f'{status} in {result.seconds:.2f}s'
+    )
+    if verbose and result.output:
+        log(result.output.rstrip('\n'))
+    if result.error is not None:
+        log(result.error.rstrip('\n'))
+
+
+def _build(args: argparse.Namespace) -> int:
+    jobs = [parse_build_target(target) for target in args.targets]
+    failed = 0
+    changed = 0
+    for result in build(
+        jobs,
+        workers=args.jobs,
+        imports_folder=args.output,
+        cache_folder=args.cache,
+    ):
+        _log_result(result, args.verbose)
+        failed += not result.ok
+        changed += any(result.exports.values())
+    log(
+        f'\nBuilt {len(jobs) - failed} of {len(jobs)} targets, '
+        f'{changed} with changed exports'
+    )
+    return 1 if failed else 0
+
+
+def _watch(args: argparse.Namespace) -> int:
+    from .watch import watch
+
+    def on_results(results: list[BuildResult]) -> None:
+        for result in results:
+            _log_result(result, args.verbose)
+        log(f'\nWatching {len(args.targets)} target(s) for changes...')
+
+    try:
+        watch(
+            [parse_build_target(target) for target in args.targets],
+            on_results,
+            interval=args.interval,
+            imports_folder=args.output,
+            cache_folder=None if args.no_cache else args.cache,
+        )
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    # Only builds, nothing is written to the global container of this process
+    atexit.unregister(on_program_exit)
+
+    parser = argparse.ArgumentParser(prog='pyhtsl')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build_parser = commands.add_parser(
+        'build',
+        help='compile and export many houses in parallel worker processes',
+    )
+    watch_parser = commands.add_parser(
+        'watch',
+        help='rebuild houses whenever one of their files changes',
+    )
+    for command_parser in (build_parser, watch_parser):
+        command_parser.add_argument(
+            'targets',
+            nargs='+',
+            metavar='target',
+            help='a script path, a dotted module or module:exportable, optionally prefixed with name=',
+        )
+        command_parser.add_argument(
+            '-o',
+            '--output',
+            type=Path,
+            default=None,
+            help='folder to export to instead of the HTSL imports folder',
+        )
+        command_parser.add_argument(
+            '-v',
+            '--verbose',
+            action='store_true',
+            help='print what every target logged',
+        )
+    build_parser.add_argument(
+        '-j',
+        '--jobs',
+        type=int,
+        default=None,
+        help='worker processes, defaults to the number of CPUs',
+    )
+    build_parser.add_argument(
+        '--cache',
+        type=Path,
+        nargs='?',
+        const=DEFAULT_CACHE_FOLDER,
+        default=None,
+        help=f'enable the compile cache, stored in {DEFAULT_CACHE_FOLDER} by default',
+    )
+    watch_parser.add_argument(
+        '--interval',
+        type=float,
+        default=0.5,
+        help='seconds between checking files for changes',
+    )
+    watch_parser.add_argument(
+        '--cache',
+        type=Path,
+        default=DEFAULT_CACHE_FOLDER,
+        help=f'folder of the compile cache, {DEFAULT_CACHE_FOLDER} by default',
+    )
+    watch_parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='compile every function again on every rebuild',
+    )
+    args = parser.parse_args(argv)
+    if args.command == 'watch':
+        return _watch(args)
+    return _build(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
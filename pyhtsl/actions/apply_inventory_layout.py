@@ -11,6 +11,8 @@ __all__ = (
 
 @final
 class ApplyInventoryLayoutExpression(Expression):
+    __slots__ = ('layout',)
+
     layout: Layout
 
     def __init__(self, layout: Layout) -> None:
@@ -11,6 +11,14 @@ __all__ = (
 
 @final
 class ApplyPotionEffectExpression(Expression):
+    __slots__ = (
+        'potion',
+        'duration',
+        'level',
+        'override_existing_effects',
+        'show_potion_icon',
+    )
+
     potion: ALL_POTION_EFFECTS
     duration: int
     level: int
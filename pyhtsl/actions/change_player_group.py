@@ -11,6 +11,8 @@ __all__ = (
 
 @final
 class ChangePlayerGroupExpression(Expression):
+    __slots__ = ('group', 'demotion_protection')
+
     group: Group
     demotion_protection: bool
 
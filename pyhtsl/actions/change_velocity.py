@@ -12,6 +12,9 @@ __all__ = (
 
 @final
 class ChangeVelocityExpression(Expression):
+    __slots__ = ('x', 'y', 'z')
+    stat_fields = ('x', 'y', 'z')
+
     x: Checkable | NumericHousingType
     y: Checkable | NumericHousingType
     z: Checkable | NumericHousingType
@@ -17,6 +17,9 @@ __all__ = (
 
 @final
 class ChatExpression(Expression):
+    __slots__ = ('line',)
+    string_fields = ('line',)
+
     line: str
 
     def __init__(self, line: str) -> None:
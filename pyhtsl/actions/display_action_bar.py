@@ -18,6 +18,10 @@ __all__ = (
 
 @final
 class DisplayActionBarExpression(Expression):
+    __slots__ = ('text',)
+    stat_fields = ('text',)
+    string_fields = ('text',)
+
     text: Checkable | str
 
     def __init__(self, text: Checkable | str) -> None:
@@ -11,6 +11,8 @@ __all__ = (
 
 @final
 class DisplayMenuExpression(Expression):
+    __slots__ = ('menu',)
+
     menu: Menu
 
     def __init__(self, menu: Menu) -> None:
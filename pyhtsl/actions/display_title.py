@@ -18,6 +18,10 @@ __all__ = (
 
 @final
 class DisplayTitleExpression(Expression):
+    __slots__ = ('title', 'subtitle', 'fadein', 'stay', 'fadeout')
+    stat_fields = ('title', 'subtitle')
+    string_fields = ('title', 'subtitle')
+
     title: Checkable | str
     subtitle: Checkable | str
     fadein: int
@@ -14,6 +14,16 @@ __all__ = (
 
 @final
 class DropItemExpression(Expression):
+    __slots__ = (
+        'item',
+        'coordinates',
+        'drop_naturally',
+        'disable_item_merging',
+        'prioritize_player',
+        'fallback_to_inventory',
+    )
+    string_fields = ('item', 'coordinates')
+
     item: Item | str
     coordinates: str
     drop_naturally: bool
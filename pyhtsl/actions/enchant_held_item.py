@@ -12,6 +12,9 @@ __all__ = (
 
 @final
 class EnchantHeldItemExpression(Expression):
+    __slots__ = ('enchantment_name', 'level')
+    string_fields = ('enchantment_name',)
+
     enchantment_name: str
     level: int
 
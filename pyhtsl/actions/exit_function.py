@@ -14,6 +14,8 @@ __all__ = (
 
 @final
 class ExitFunctionExpression(Expression):
+    __slots__ = ()
+
     def into_htsl(self) -> str:
         return 'exit'
 
@@ -10,6 +10,9 @@ __all__ = (
 
 @final
 class FailParkourExpression(Expression):
+    __slots__ = ('reason',)
+    string_fields = ('reason',)
+
     reason: str
 
     def __init__(self, reason: str = 'Failed!') -> None:
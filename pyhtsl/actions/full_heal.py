@@ -10,6 +10,8 @@ __all__ = (
 
 @final
 class FullHealExpression(Expression):
+    __slots__ = ()
+
     def into_htsl(self) -> str:
         return 'fullHeal'
 
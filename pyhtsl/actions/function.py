@@ -26,9 +26,14 @@ class Function:
     def full_rerun(self) -> None:
         from .create_function import create_function
 
+        block = self.block
+        assert block is not None
+        if block.callback is not None:
+            create_function(name=self.name)(block.callback)
+            return
+
         def run() -> None:
-            assert self.block is not None
-            for expr in self.block.expressions:
+            for expr in block.expressions:
                 expr.write()
 
-        create_function(name=self.name, force_create=True)(run)
+        create_function(name=self.name)(run)
@@ -10,6 +10,8 @@ __all__ = (
 
 @final
 class GiveExperienceLevelsExpression(Expression):
+    __slots__ = ('levels',)
+
     levels: int
 
     def __init__(self, levels: int) -> None:
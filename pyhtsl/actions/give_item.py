@@ -12,6 +12,9 @@ __all__ = (
 
 @final
 class GiveItemExpression(Expression):
+    __slots__ = ('item', 'allow_multiple', 'inventory_slot', 'replace_existing_item')
+    string_fields = ('item', 'inventory_slot')
+
     item: Item | str
     allow_multiple: bool
     inventory_slot: str
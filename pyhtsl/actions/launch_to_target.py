@@ -13,6 +13,10 @@ __all__ = (
 
 @final
 class LaunchToTargetExpression(Expression):
+    __slots__ = ('coordinates', 'location', 'strength')
+    stat_fields = ('strength',)
+    string_fields = ('coordinates',)
+
     coordinates: str | None
     location: ALL_LOCATIONS
     strength: Checkable | int
@@ -14,6 +14,8 @@ __all__ = (
 
 @final
 class PauseExecutionExpression(Expression):
+    __slots__ = ('ticks',)
+
     ticks: int
 
     def __init__(self, ticks: int = 20) -> None:
@@ -15,6 +15,9 @@ __all__ = (
 
 @final
 class PlaySoundExpression(Expression):
+    __slots__ = ('sound', 'volume', 'pitch', 'coordinates', 'location', 'check_valid')
+    string_fields = ('coordinates',)
+
     sound: ALL_SOUNDS
     volume: float
     pitch: float
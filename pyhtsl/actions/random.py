@@ -1,9 +1,9 @@
 from collections.abc import Generator
 from typing import Self, final
 
-from ..config import INDENT
 from ..container import ContainerContextManager, ExpressionContext
 from ..expression.expression import Expression
+from ..writer import HtslWriter
 
 __all__ = (
     'RandomContextManager',
@@ -14,6 +14,9 @@ __all__ = (
 
 @final
 class RandomExpression(Expression):
+    __slots__ = ('expressions',)
+    expression_list_fields = ('expressions',)
+
     expressions: list[Expression]
 
     def __init__(
@@ -24,11 +27,13 @@ class RandomExpression(Expression):
         self.expressions = expressions or []
 
     def into_htsl(self) -> str:
-        result = 'random {'
+        return HtslWriter.render_to_string(lambda writer: self.render(writer, 0))
+
+    def render(self, writer: HtslWriter, indent: int) -> None:
+        writer.write_line('random {', indent)
         for expr in self.expressions:
-            result += ('\n' + expr.into_htsl()).replace('\n', '\n' + INDENT)
-        result += '\n}'
-        return result
+            expr.render(writer, indent + 1)
+        writer.write_line('}', indent)
 
     def cloned(self) -> Self:
         return self.__class__(
@@ -55,9 +60,6 @@ class RandomExpression(Expression):
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}<exprs={len(self.expressions)}>'
 
-    def nested_expressions_refs(self) -> list[list['Expression']]:
-        return [self.expressions]
-
     def describe_nestable_block(self) -> str:
         return 'Random'
 
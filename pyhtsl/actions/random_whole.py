@@ -3,6 +3,7 @@ import re
 from typing import Self, final
 
 from ..execute.backend_type import BackendType, JavaLong
+from ..expression.value_range import ValueRange
 from ..internal_type import InternalType
 from ..placeholders import PlaceholderCheckable
 
@@ -36,6 +37,9 @@ class RandomWholePlaceholder(
             constant_internal_type=InternalType.LONG,
         )
 
+    def declared_range(self) -> ValueRange:
+        return ValueRange(self.lower_bound, self.exclusive_upper_bound - 1)
+
     def get_backend_value(self) -> BackendType:
         return JavaLong(
             random.randint(self.lower_bound, self.exclusive_upper_bound - 1)
@@ -11,6 +11,9 @@ __all__ = (
 
 @final
 class RemoveItemExpression(Expression):
+    __slots__ = ('item',)
+    string_fields = ('item',)
+
     item: Item | str
 
     def __init__(self, item: Item | str) -> None:
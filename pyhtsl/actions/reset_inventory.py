@@ -10,6 +10,8 @@ __all__ = (
 
 @final
 class ResetInventoryExpression(Expression):
+    __slots__ = ()
+
     def into_htsl(self) -> str:
         return 'resetInventory'
 
@@ -10,6 +10,9 @@ __all__ = (
 
 @final
 class SendToLobbyExpression(Expression):
+    __slots__ = ('lobby',)
+    string_fields = ('lobby',)
+
     lobby: str
 
     def __init__(self, lobby: str) -> None:
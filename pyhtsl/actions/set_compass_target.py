@@ -13,6 +13,9 @@ __all__ = (
 
 @final
 class SetCompassTargetExpression(Expression):
+    __slots__ = ('coordinates', 'location')
+    string_fields = ('coordinates',)
+
     coordinates: str | None
     location: ALL_LOCATIONS
 
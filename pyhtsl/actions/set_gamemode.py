@@ -11,6 +11,8 @@ __all__ = (
 
 @final
 class SetGamemodeExpression(Expression):
+    __slots__ = ('gamemode',)
+
     gamemode: ALL_GAMEMODES
 
     def __init__(self, gamemode: ALL_GAMEMODES) -> None:
@@ -11,6 +11,8 @@ __all__ = (
 
 @final
 class SetPlayerTeamExpression(Expression):
+    __slots__ = ('team',)
+
     team: Team
 
     def __init__(self, team: Team) -> None:
@@ -13,6 +13,9 @@ __all__ = (
 
 @final
 class TeleportPlayerExpression(Expression):
+    __slots__ = ('coordinates', 'location', 'prevent_teleport_inside_block')
+    string_fields = ('coordinates',)
+
     coordinates: str | None
     location: ALL_LOCATIONS
     prevent_teleport_inside_block: bool
@@ -15,6 +15,8 @@ __all__ = (
 
 @final
 class TriggerFunctionExpression(Expression):
+    __slots__ = ('function', 'trigger_for_all_players')
+
     function: Function
     trigger_for_all_players: bool
 
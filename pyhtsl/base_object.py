@@ -9,13 +9,18 @@ if TYPE_CHECKING:
 
 
 class BaseObject(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def cloned(self) -> Self:
         raise NotImplementedError()
 
     @staticmethod
     def cloned_or_same[T: object](value: T) -> T:
-        if isinstance(value, BaseObject):
+        from .checkable import Checkable
+
+        # Checkables are shared: they are never changed in place, only replaced
+        if isinstance(value, BaseObject) and not isinstance(value, Checkable):
             return value.cloned()
         return value
 
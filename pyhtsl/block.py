@@ -4,10 +4,16 @@ from typing import TYPE_CHECKING, Self, final
 
 from .actions.function import Function
 from .base_object import BaseObject
-from .config import INDENT
 from .container import ContainerContextManager, ExpressionContext
-from .limits import fix_action_limits
+from .limits import (
+    PackingMode,
+    PackingReport,
+    fix_action_limits,
+    pack_action_limits,
+)
+from .profiler import profiled
 from .utils.log import log
+from .writer import HtslWriter
 
 if TYPE_CHECKING:
     from .container import Container
@@ -22,6 +28,7 @@ class Block(BaseObject):
     callback_ran: bool
     _overflow_root_ref: 'Block | None'
     _overflow_counter: int
+    _cached_htsl: str | None
 
     def __init__(
         self,
@@ -34,6 +41,7 @@ class Block(BaseObject):
         self.callback_ran = False
         self._overflow_root_ref = None
         self._overflow_counter = 1
+        self._cached_htsl = None
 
     def expression_counts(
         self,
@@ -92,18 +100,24 @@ class Block(BaseObject):
         raise NotImplementedError()
 
     def is_empty(self) -> bool:
-        return len(self.expressions) == 0
+        return self._cached_htsl is None and len(self.expressions) == 0
+
+    def is_compile_cacheable(self) -> bool:
+        return False
 
     def into_htsl(self) -> str:
-        lines: list[str] = []
+        return HtslWriter.render_to_string(lambda writer: self.render(writer, 0))
+
+    def render(self, writer: HtslWriter, indent: int) -> None:
+        if self._cached_htsl is not None:
+            writer.write_lines(self._cached_htsl, indent)
+            return
         line = self.goto_line()
         if line is not None:
-            lines.append(line)
-        lines.extend(expr.into_htsl() for expr in self.expressions)
-        if line is not None:
-            for i in range(1, len(lines)):
-                lines[i] = INDENT + lines[i].replace('\n', '\n' + INDENT)
-        return '\n'.join(lines)
+            writer.write_line(line, indent)
+            indent += 1
+        for expr in self.expressions:
+            expr.render(writer, indent)
 
     def maybe_run_callback(self) -> None:
         if self.callback is None or self.callback_ran:
@@ -119,12 +133,20 @@ class Block(BaseObject):
         function = Function(
             name=f'{base_name} {next_counter}',
         )
-        fixed, rest = fix_action_limits(
-            self.expressions,
-            nesting_possible=True,
-            function_if_exceeds=function,
-            always_in_conditional=False,
-        )
+        if container.packing is PackingMode.OPTIMAL:
+            if self._overflow_root_ref is None:
+                self.report_packing(container)
+            fixed, rest = pack_action_limits(
+                self.expressions,
+                function_if_exceeds=function,
+            )
+        else:
+            fixed, rest = fix_action_limits(
+                self.expressions,
+                nesting_possible=True,
+                function_if_exceeds=function,
+                always_in_conditional=False,
+            )
         self.expressions = fixed
         if not rest:
             return
@@ -139,17 +161,62 @@ class Block(BaseObject):
             f'Created a new function \x1b[38;2;255;0;0m"{function.name}"\x1b[0m to avoid hitting the action limit in block \x1b[38;2;0;255;0m"{self.get_name()}"\x1b[0m'
         )
 
+    def report_packing(self, container: 'Container') -> None:
+        report = PackingReport.compare(self.get_name(), self.expressions)
+        if report.greedy_functions <= 1 and report.optimal_functions <= 1:
+            return
+        container.packing_reports.append(report)
+        log(
+            f'Packed block \x1b[38;2;0;255;0m"{report.block_name}"\x1b[0m into {report.optimal_functions} functions and {report.optimal_actions} actions, saving \x1b[38;2;255;0;0m{report.saved_functions}\x1b[0m functions and {report.saved_actions} actions over greedy packing'
+        )
+
     def finalize(self, container: 'Container', index: int) -> None:
-        self.maybe_run_callback()
+        if self._cached_htsl is not None:
+            return
+        with profiled(self.get_name()):
+            self.finalize_raw(container, index)
+
+    def finalize_raw(self, container: 'Container', index: int) -> None:
+        from .compile_cache import get_compile_cache
+        from .expression.temporary_allocation import TemporaryStatAllocator
+
+        with profiled('callback'):
+            self.maybe_run_callback()
+
+        cache = get_compile_cache()
+        key: str | None = None
+        if cache is not None and self.is_compile_cacheable():
+            with profiled('compile cache'):
+                key = cache.key_for(self, container)
+                restored = key is not None and cache.restore(
+                    key, self, container, index
+                )
+            if restored:
+                return
+
+        container.analyze_value_ranges(self.expressions)
         container.finalize_expressions(self.expressions)
+        container.propagate_constants(self.expressions)
+        container.optimize_conditionals(self.expressions)
+        with profiled('allocate temporary stats'):
+            TemporaryStatAllocator(self.expressions).run()
         if not self.container.ignore_action_limits:
-            self.fix_action_limits(container, index)
+            with profiled('action limits'):
+                self.fix_action_limits(container, index)
+
+        if cache is not None and key is not None:
+            cache.remember(key, self, container)
 
     def execute_all_expressions(self, context: 'ExecutionContext') -> None:
         from .execute.signal import ExitSignal, PauseSignal
+        from .expression.temporary_allocation import TemporaryStatAllocator
 
         self.maybe_run_callback()
+        context.analyze_value_ranges(self.expressions)
         context.finalize_expressions(self.expressions)
+        context.propagate_constants(self.expressions)
+        context.optimize_conditionals(self.expressions)
+        TemporaryStatAllocator(self.expressions).run()
 
         flat: list[Expression] = []
         for expression in self.expressions:
@@ -219,6 +286,10 @@ class FunctionBlock(Block):
             f'goto {self.inline("function")} {self.inline_quoted(self.function.name)}'
         )
 
+    def is_compile_cacheable(self) -> bool:
+        # Overflow blocks are stored together with the block they split off from
+        return self._overflow_root_ref is None
+
 
 @final
 class BlockContextManager(ContainerContextManager):
@@ -0,0 +1,282 @@
+import atexit
+import importlib
+import importlib.util
+import io
+import os
+import runpy
+import sys
+import sysconfig
+import time
+import traceback
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from functools import partial
+from pathlib import Path
+from typing import NamedTuple
+
+from .utils.slug import into_slug
+
+__all__ = (
+    'BuildJob',
+    'BuildResult',
+    'parse_build_target',
+    'reset_global_state',
+    'resolve_imports_folder',
+    'run_build_job',
+    'build',
+)
+
+
+class BuildJob(NamedTuple):
+    """One export of a build.
+
+    `target` is a script path (`houses/lobby.py`) or a dotted module
+    (`houses.lobby`), which is run like `python houses/lobby.py` would and has
+    its global container exported as `name`, or `module:attribute`, whose
+    exportable is exported like `pyhtsl.export.export` does.
+    """
+
+    name: str
+    target: str
+
+
+class BuildResult(NamedTuple):
+    job: BuildJob
+    # Every export the job made, and whether its .htsl file changed
+    exports: dict[str, bool]
+    output: str
+    error: str | None
+    seconds: float
+    # Every file of the job outside pyhtsl and installed packages it ran
+    sources: frozenset[Path]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def parse_build_target(text: str) -> BuildJob:
+    """`target` or `name=target`, the name defaulting to the slug of the script,
+    module or attribute name."""
+    name, separator, target = text.partition('=')
+    if not separator:
+        target = text
+        stem = target.rpartition(':')[2] if ':' in target else target
+        if stem.endswith('.py'):
+            stem = Path(stem).stem
+        name = into_slug(stem.rpartition('.')[2])
+    if not name or not target:
+        raise ValueError(f'Invalid build target {text!r}')
+    return BuildJob(name, target)
+
+
+def reset_global_state() -> None:
+    """Puts everything a script can change globally back to how a fresh
+    interpreter has it, so every job compiles the same no matter which jobs
+    ran in the same worker before it."""
+    from . import compile_cache, config, container, deferred, profiler
+    from .actions.no_fallback_values import NoFallbackValues
+    from .actions.no_optimization import NoOptimization
+    from .actions.no_type_casting import NoTypeCasting
+    from .execute import decorator
+    from .stats.temporary_stat import Number
+
+    container.CONTAINERS.clear()
+    container.WRITE_EXPRESSION_OVERRIDE_STACK.clear()
+    container.Container.exported_names.clear()
+    container.Container.changed_exports.clear()
+    deferred._registry.clear()
+    deferred._counter = 0
+    Number.counter = 1_000_000
+    NoOptimization.counter = 0
+    NoTypeCasting.counter = 0
+    NoFallbackValues.counter = 0
+    decorator._saved_execution_contexts.clear()
+    config.DISABLE_GLOBAL_EXPORT = False
+    config.DISPLAY_HTSL = False
+    config.DIFF_EXPORT = False
+    config.SPLIT_EXPORT = False
+    compile_cache.COMPILE_CACHE = None
+    profiler.PROFILER = None
+
+
+def _is_library_module(path: Path) -> bool:
+    roots = [
+        Path(sysconfig.get_path(name)).resolve()
+        for name in ('stdlib', 'platstdlib', 'purelib', 'platlib')
+    ]
+    roots.append(Path(__file__).parent.resolve())
+    return any(path.is_relative_to(root) for root in roots)
+
+
+@contextmanager
+def _job_modules(script_folder: Path | None, sources: set[Path]) -> Iterator[None]:
+    """Makes the working directory, and the folder of a script, importable like
+    they are for `python script.py`, and forgets the modules of the job
+    afterwards so the next job imports and runs them again. Their files are
+    added to `sources`."""
+    before = set(sys.modules)
+    added = [str(folder) for folder in (script_folder, Path.cwd()) if folder]
+    sys.path[:0] = added
+    try:
+        yield
+    finally:
+        for folder in added:
+            sys.path.remove(folder)
+        for name in set(sys.modules) - before:
+            path = getattr(sys.modules[name], '__file__', None)
+            if path is None:
+                continue
+            path = Path(path).resolve()
+            if not _is_library_module(path):
+                sources.add(path)
+                del sys.modules[name]
+
+
+def _run_target(job: BuildJob, sources: set[Path]) -> None:
+    from .config import should_disable_global_export
+    from .container import get_current_container
+    from .export import export
+    from .utils.log import log
+
+    module_name, separator, attribute = job.target.partition(':')
+    if separator:
+        with _job_modules(None, sources):
+            exportable = getattr(importlib.import_module(module_name), attribute)
+            export(exportable, job.name)
+        return
+
+    path = Path(job.target).resolve()
+    if job.target.endswith('.py'):
+        sources.add(path)
+        with _job_modules(path.parent, sources):
+            runpy.run_path(str(path), run_name='__main__')
+    else:
+        with _job_modules(None, sources):
+            spec = importlib.util.find_spec(job.target)
+            if spec is not None and spec.origin is not None:
+                sources.add(Path(spec.origin).resolve())
+            runpy.run_module(job.target, run_name='__main__', alter_sys=True)
+
+    # What exiting the script would do, minus running saved execution contexts
+    container = get_current_container()
+    if not container.is_global:
+        raise RuntimeError(f'{job.target} left a non-global container open')
+    container.finalize()
+    if should_disable_global_export():
+        log('Global export is disabled. No .htsl file will be written.')
+    elif not container.is_empty():
+        container.export(job.name)
+
+
+def _traceback_sources(exception: BaseException) -> set[Path]:
+    """Files a failed job got to, including ones that never finished importing
+    and so are missing from `sys.modules`."""
+    paths = [frame.filename for frame in traceback.extract_tb(exception.__traceback__)]
+    if isinstance(exception, SyntaxError) and exception.filename is not None:
+        paths.append(exception.filename)
+    sources: set[Path] = set()
+    for raw_path in paths:
+        path = Path(raw_path).resolve()
+        if path.is_file() and not _is_library_module(path):
+            sources.add(path)
+    return sources
+
+
+def run_build_job(
+    job: BuildJob,
+    *,
+    imports_folder: Path | None = None,
+    cache_folder: Path | None = None,
+) -> BuildResult:
+    """Runs `job` in this process with fresh global state, collecting what it
+    logs instead of printing it. With a `cache_folder` the compile cache is
+    enabled for the job."""
+    from .compile_cache import enable_compile_cache
+    from .config import override_htsl_imports_folder
+    from .container import Container
+
+    reset_global_state()
+    override_htsl_imports_folder(imports_folder)
+    if cache_folder is not None:
+        enable_compile_cache(cache_folder)
+    output = io.StringIO()
+    error: str | None = None
+    sources: set[Path] = set()
+    start = time.perf_counter()
+    argv = sys.argv
+    sys.argv = [job.target]
+    try:
+        with redirect_stdout(output), redirect_stderr(output):
+            _run_target(job, sources)
+    except BaseException as exception:
+        if isinstance(exception, KeyboardInterrupt):
+            raise
+        error = traceback.format_exc()
+        sources.update(_traceback_sources(exception))
+    finally:
+        sys.argv = argv
+    exports = {
+        name: name in Container.changed_exports
+        for name in sorted(Container.exported_names)
+    }
+    reset_global_state()
+    return BuildResult(
+        job=job,
+        exports=exports,
+        output=output.getvalue(),
+        error=error,
+        seconds=time.perf_counter() - start,
+        sources=frozenset(sources),
+    )
+
+
+def _init_worker() -> None:
+    from .container import on_program_exit
+
+    # A worker only compiles jobs, its own global container is never exported
+    atexit.unregister(on_program_exit)
+
+
+def resolve_imports_folder(imports_folder: Path | str | None = None) -> Path:
+    """The folder jobs export to, asked for up front since a job can not ask
+    for it interactively."""
+    from .config import get_htsl_import_folder
+
+    folder = Path(imports_folder) if imports_folder is not None else None
+    if folder is None:
+        folder = get_htsl_import_folder()
+    folder.mkdir(parents=True, exist_ok=True)
+    return folder.resolve()
+
+
+def build(
+    jobs: Iterable[BuildJob],
+    *,
+    workers: int | None = None,
+    imports_folder: Path | str | None = None,
+    cache_folder: Path | str | None = None,
+) -> Iterator[BuildResult]:
+    """Compiles and exports every job in worker processes that each keep
+    pyhtsl imported between jobs. Results come back in the order of `jobs`,
+    whichever worker finished first.
+
+    With `workers=1` every job runs in this process instead, which leaves the
+    global state of this process reset afterwards."""
+    jobs = list(jobs)
+    run = partial(
+        run_build_job,
+        imports_folder=resolve_imports_folder(imports_folder),
+        cache_folder=None if cache_folder is None else Path(cache_folder).resolve(),
+    )
+
+    if workers == 1 or len(jobs) <= 1:
+        yield from map(run, jobs)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=min(workers or os.cpu_count() or 1, len(jobs)),
+        initializer=_init_worker,
+    ) as executor:
+        yield from executor.map(run, jobs)
@@ -16,6 +16,7 @@ from .expression.housing_type import (
     housing_type_as_rhs,
 )
 from .internal_type import InternalType
+from .utils.placeholders import PlaceholderRegistry
 from .utils.warn import warn
 
 if TYPE_CHECKING:
@@ -23,12 +24,15 @@ if TYPE_CHECKING:
     from .expression.binary_expression import BinaryExpression
     from .expression.compound_expression import CompoundExpression
     from .expression.expression import Expression
+    from .expression.value_range import ValueRange
 
 
 __all__ = ('Checkable',)
 
 
 class Checkable(BaseObject):
+    __slots__ = ()
+
     pattern: ClassVar[re.Pattern[str] | None] = None
     pattern_factory: ClassVar[Callable[[re.Match[str]], 'Checkable'] | None] = None
 
@@ -45,12 +49,8 @@ class Checkable(BaseObject):
             )
         cls.pattern = pattern
         cls.pattern_factory = pattern_factory
-
-    @classmethod
-    def _iter_subclasses(cls) -> Generator[type['Checkable'], None, None]:
-        yield cls
-        for sub in cls.__subclasses__():
-            yield from sub._iter_subclasses()
+        if pattern is not None and pattern_factory is not None:
+            PlaceholderRegistry.register(cls, pattern, pattern_factory)
 
     @classmethod
     def iter_pattern_factories(
@@ -58,15 +58,16 @@ class Checkable(BaseObject):
     ) -> Generator[
         tuple[re.Pattern[str], Callable[[re.Match[str]], 'Checkable']], None, None
     ]:
-        for sub in cls._iter_subclasses():
-            if sub.pattern is not None and sub.pattern_factory is not None:
-                yield sub.pattern, sub.pattern_factory
+        for owner, pattern, factory in PlaceholderRegistry.all_entries():
+            if issubclass(owner, cls):
+                yield pattern, factory
 
     @classmethod
     def iter_in_string(cls, text: str) -> Generator['Checkable', None, None]:
-        for pattern, factory in cls.iter_pattern_factories():
-            for match in pattern.finditer(text):
-                yield factory(match)
+        for match, factory in PlaceholderRegistry.scan(text):
+            checkable = factory(match)
+            if cls is Checkable or isinstance(checkable, cls):
+                yield checkable
 
     internal_type: InternalType = InternalType.ANY
     fallback_value: HousingType | None
@@ -166,10 +167,19 @@ class Checkable(BaseObject):
         clone.fallback_value = self.fallback_value
         return clone
 
+    def declared_range(self) -> 'ValueRange | None':
+        """
+        The values this can hold, when known, see `Stat.with_range`.
+        """
+        return None
+
     def as_type(self, internal_type: InternalType, /) -> Self:
         """
         Creates a copy of the current object, with the internal type set to the specified type.
+        Checkables are never changed in place, so the object itself is returned when nothing changes.
         """
+        if internal_type is self.internal_type and self.fallback_value is None:
+            return self
         clone = self.cloned()
         clone.internal_type = internal_type
         if clone.fallback_value is not None:
@@ -506,9 +516,27 @@ class Checkable(BaseObject):
             ConditionalMode,
         )
         from .expression.expression import Expression
+        from .expression.value_range import remainder_range, value_range_of
+        from .stats.temporary_stat import TemporaryStat
 
         remainder = self.remainder(other)
         result = remainder.result
+        assert isinstance(result, TemporaryStat)
+
+        dividend = value_range_of(self)
+        result.value_range = remainder_range(
+            dividend,
+            value_range_of(other),
+            integral=self.internal_type is InternalType.LONG
+            and (
+                isinstance(other, int)
+                or isinstance(other, Checkable)
+                and other.internal_type is InternalType.LONG
+            ),
+        )
+        if dividend is not None and dividend.is_non_negative:
+            # Already positive, without a conditional that can not be nested
+            return remainder
 
         expressions: list[Expression] = list(remainder.expressions)
         expressions.append(
@@ -531,7 +559,7 @@ class Checkable(BaseObject):
             ),
         )
 
-        return CompoundExpression(expressions, result)
+        return CompoundExpression(expressions, result, sign_fix_operand=self)
 
     def __and__[T: 'Checkable | NumericHousingType'](
         self,
@@ -676,11 +704,21 @@ class Checkable(BaseObject):
             ConditionalMode,
         )
         from .expression.expression import Expression
+        from .expression.value_range import absolute_range, value_range_of
         from .stats.temporary_stat import TemporaryStat
 
+        operand = value_range_of(self)
         tmp = TemporaryStat(self.internal_type)
+        tmp.value_range = absolute_range(operand, self.internal_type)
         expressions: list[Expression] = [
             BinaryExpression(tmp, self, BinaryOperator.Set),
+        ]
+        if operand is not None and operand.is_non_negative:
+            return CompoundExpression(expressions, tmp)
+        if tmp.value_range is not None and operand is not None and operand.upper <= 0:
+            expressions.append(BinaryExpression(tmp, -1, BinaryOperator.Multiply))
+            return CompoundExpression(expressions, tmp)
+        expressions.append(
             ConditionalExpression(
                 conditions=[
                     ComparisonCondition(
@@ -694,8 +732,8 @@ class Checkable(BaseObject):
                     BinaryExpression(tmp, -1, BinaryOperator.Multiply),
                 ],
             ),
-        ]
-        return CompoundExpression(expressions, tmp)
+        )
+        return CompoundExpression(expressions, tmp, sign_fix_operand=self)
 
     def __abs__(self) -> 'CompoundExpression':
         return self.abs()
@@ -0,0 +1,294 @@
+import enum
+import hashlib
+import json
+import os
+from functools import partial
+from importlib import metadata
+from pathlib import Path
+from types import BuiltinFunctionType, FunctionType, MethodType
+from typing import TYPE_CHECKING, final
+
+import numpy as np
+
+from .actions.function import Function
+from .actions.no_fallback_values import no_fallback_values
+from .actions.no_optimization import no_optimization
+from .actions.no_type_casting import no_type_casting
+from .base_object import BaseObject
+from .expression.expression import Expression
+from .stats.temporary_stat import Number
+from .utils.fields import field_values
+from .utils.log import log
+from .writer import HtslWriter
+
+if TYPE_CHECKING:
+    from .block import Block
+    from .container import Container
+
+
+__all__ = (
+    'CompileCache',
+    'CompileCacheStats',
+    'enable_compile_cache',
+    'disable_compile_cache',
+    'get_compile_cache',
+)
+
+
+CACHE_FORMAT_VERSION: int = 1
+DEFAULT_CACHE_FOLDER: Path = Path('.pyhtsl_cache')
+
+
+def _pyhtsl_version() -> str:
+    try:
+        return metadata.version('pyhtsl')
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+class _Uncacheable(Exception):
+    pass
+
+
+class _Fingerprinter:
+    """Turns a block's expressions into nested tuples of plain values that are
+    the same between runs: temporary stats and deferred placeholders are
+    numbered in order of appearance instead of by their global counters."""
+
+    numbers: dict[Number, int]
+    deferred: dict[int, int]
+    active: set[int]
+
+    def __init__(self) -> None:
+        self.numbers = {}
+        self.deferred = {}
+        self.active = set()
+
+    def visit(self, value: object) -> object:
+        if value is None or isinstance(value, bool | int | float | bytes):
+            return (type(value).__qualname__, value)
+        if isinstance(value, str):
+            return self.visit_string(value)
+        if isinstance(value, enum.Enum):
+            return (type(value).__qualname__, value.name)
+        if isinstance(value, np.generic):
+            return (type(value).__qualname__, value.item())
+        if isinstance(value, list | tuple):
+            return (type(value).__qualname__, tuple(self.visit(v) for v in value))
+        if isinstance(value, dict):
+            items = ((repr(self.visit(k)), self.visit(v)) for k, v in value.items())
+            return ('dict', tuple(sorted(items)))
+        if isinstance(value, Number):
+            if value.finalized:
+                return ('Number', value.value)
+            return ('Number*', self.numbers.setdefault(value, len(self.numbers)))
+        if isinstance(value, Function):
+            # Only the name ends up in the output, the block is fingerprinted on its own
+            return ('Function', value.name)
+        if isinstance(value, FunctionType | MethodType | BuiltinFunctionType | partial):
+            raise _Uncacheable(f'{value!r} can not be fingerprinted')
+        return self.visit_object(value)
+
+    def visit_string(self, value: str) -> object:
+        from . import deferred
+
+        ids = deferred.find_deferred_ids(value)
+        if not ids:
+            return value
+        mapping: dict[int, str] = {}
+        entries: list[object] = []
+        for deferred_id in ids:
+            if deferred_id not in self.deferred:
+                self.deferred[deferred_id] = len(self.deferred)
+                entry = deferred.lookup_deferred(deferred_id)
+                entries.append(
+                    (self.visit(entry.checkable), entry.include_fallback_value)
+                )
+            mapping[deferred_id] = f'<deferred {self.deferred[deferred_id]}>'
+        return (deferred.substitute_deferred(value, mapping), tuple(entries))
+
+    def visit_object(self, value: object) -> object:
+        # Expressions, conditions and stats keep their fields in slots
+        if not hasattr(value, '__dict__') and not isinstance(value, BaseObject):
+            raise _Uncacheable(f'{value!r} can not be fingerprinted')
+        fields = field_values(value)
+        if id(value) in self.active:
+            raise _Uncacheable(f'{value!r} references itself')
+        self.active.add(id(value))
+        try:
+            return (
+                f'{type(value).__module__}.{type(value).__qualname__}',
+                tuple(
+                    (key, self.visit(field))
+                    for key, field in sorted(fields.items())
+                    if key not in Expression.__slots__
+                ),
+            )
+        finally:
+            self.active.discard(id(value))
+
+
+@final
+class CompileCacheStats:
+    hits: int
+    misses: int
+    uncacheable: int
+    stored: int
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+        self.stored = 0
+
+    def hit_rate(self) -> float:
+        looked_up = self.hits + self.misses
+        return self.hits / looked_up if looked_up else 0.0
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}<hits={self.hits}, misses={self.misses}, uncacheable={self.uncacheable}, stored={self.stored}>'
+
+
+@final
+class CompileCache:
+    """On-disk cache of finalized function blocks, keyed by a hash of the
+    block's expressions before finalization plus everything else that changes
+    the output. A hit skips optimization, action limit fixing and rendering,
+    and reuses the stored HTSL of the block and of its overflow blocks."""
+
+    folder: Path
+    stats: CompileCacheStats
+    pending: list[tuple['Container', str, 'Block']]
+
+    def __init__(self, folder: Path) -> None:
+        self.folder = folder
+        self.stats = CompileCacheStats()
+        self.pending = []
+
+    def key_for(self, block: 'Block', container: 'Container') -> str | None:
+        from .limits import get_limits
+
+        if not block.expressions:
+            return None
+        try:
+            fingerprint = _Fingerprinter().visit(block.expressions)
+        except _Uncacheable:
+            self.stats.uncacheable += 1
+            return None
+        environment = (
+            CACHE_FORMAT_VERSION,
+            _pyhtsl_version(),
+            type(block).__qualname__,
+            block.get_name(),
+            no_optimization(),
+            no_type_casting(),
+            no_fallback_values(),
+            container.ignore_action_limits,
+            container.packing.value,
+            tuple(
+                sorted((key.__qualname__, limit) for key, limit in get_limits().items())
+            ),
+        )
+        return hashlib.sha256(repr((environment, fingerprint)).encode()).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.folder / key[:2] / f'{key}.json'
+
+    def restore(
+        self,
+        key: str,
+        block: 'Block',
+        container: 'Container',
+        index: int,
+    ) -> bool:
+        from .block import FunctionBlock
+
+        try:
+            entry = json.loads(self.path_for(key).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self.stats.misses += 1
+            return False
+        self.stats.hits += 1
+
+        if entry['htsl'] is None:
+            block.expressions = []
+        else:
+            block._cached_htsl = entry['htsl']
+        for offset, overflow in enumerate(entry['overflow'], start=1):
+            new_block = FunctionBlock(function=Function(name=overflow['name']))
+            new_block._cached_htsl = overflow['htsl']
+            new_block._overflow_root_ref = block
+            container.add_block(new_block, index=index + offset)
+        return True
+
+    def remember(self, key: str, block: 'Block', container: 'Container') -> None:
+        """Stores `block` under `key` once `container` is done finalizing, which
+        is when its overflow blocks are final too."""
+        self.pending.append((container, key, block))
+
+    def store_pending(self, container: 'Container') -> None:
+        from .container import override_write_expression
+
+        def render(block: 'Block') -> str | None:
+            if block.is_empty():
+                return None
+            return HtslWriter.render_to_string(lambda writer: block.render(writer, 0))
+
+        remaining: list[tuple[Container, str, Block]] = []
+        with override_write_expression(lambda _: None):
+            for owner, key, root in self.pending:
+                if owner is not container:
+                    remaining.append((owner, key, root))
+                    continue
+                entry = {
+                    'htsl': render(root),
+                    'overflow': [
+                        {'name': block.get_name(), 'htsl': render(block)}
+                        for block in container.blocks
+                        if block._overflow_root_ref is root
+                    ],
+                }
+                self._write(self.path_for(key), json.dumps(entry))
+                self.stats.stored += 1
+        self.pending = remaining
+
+    @staticmethod
+    def _write(path: Path, content: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        try:
+            temporary_path.write_text(content, encoding='utf-8')
+            os.replace(temporary_path, path)
+        finally:
+            temporary_path.unlink(missing_ok=True)
+
+    def log_summary(self) -> None:
+        log(
+            f'Compile cache: \x1b[38;2;0;255;0m{self.stats.hits} hit(s)\x1b[0m, '
+            f'\x1b[38;2;255;0;0m{self.stats.misses} miss(es)\x1b[0m'
+            + (
+                f', {self.stats.uncacheable} uncacheable'
+                if self.stats.uncacheable
+                else ''
+            )
+        )
+
+
+COMPILE_CACHE: CompileCache | None = None
+
+
+def enable_compile_cache(folder: Path | str = DEFAULT_CACHE_FOLDER) -> CompileCache:
+    """Reuses the HTSL of function blocks that did not change since a previous
+    run, stored inside `folder`."""
+    global COMPILE_CACHE
+    COMPILE_CACHE = CompileCache(Path(folder).resolve())
+    return COMPILE_CACHE
+
+
+def disable_compile_cache() -> None:
+    global COMPILE_CACHE
+    COMPILE_CACHE = None
+
+
+def get_compile_cache() -> CompileCache | None:
+    return COMPILE_CACHE
@@ -6,10 +6,15 @@ from .utils.log import log
 __all__ = (
     'set_htsl_imports_folder',
     'get_htsl_import_folder',
+    'override_htsl_imports_folder',
     'disable_global_export',
     'should_disable_global_export',
     'display_htsl',
     'should_display_htsl',
+    'diff_export',
+    'should_diff_export',
+    'split_export',
+    'should_split_export',
 )
 
 
@@ -41,7 +46,20 @@ def set_htsl_imports_folder(htsl_folder: Path | str) -> None:
     )
 
 
+HTSL_IMPORTS_FOLDER_OVERRIDE: Path | None = None
+
+
+def override_htsl_imports_folder(htsl_folder: Path | str | None) -> None:
+    """Exports to `htsl_folder` for the rest of this process without saving
+    it for future runs, like `pyhtsl build --output` does. `None` goes back to
+    the saved folder."""
+    global HTSL_IMPORTS_FOLDER_OVERRIDE
+    HTSL_IMPORTS_FOLDER_OVERRIDE = None if htsl_folder is None else Path(htsl_folder)
+
+
 def get_htsl_import_folder() -> Path:
+    if HTSL_IMPORTS_FOLDER_OVERRIDE is not None:
+        return HTSL_IMPORTS_FOLDER_OVERRIDE
     maybe_path: Path | None = None
     if CACHED_HTSL_IMPORTS_FOLDER_PATH.exists():
         raw_path = CACHED_HTSL_IMPORTS_FOLDER_PATH.read_text().strip()
@@ -117,3 +135,32 @@ def display_htsl(value: bool = True) -> None:
 
 def should_display_htsl() -> bool:
     return DISPLAY_HTSL
+
+
+DIFF_EXPORT: bool = False
+
+
+def diff_export(value: bool = True) -> None:
+    """Also exports `<name>_changed.htsl`, holding only the functions whose HTSL
+    changed since the previous export of `<name>`, so HTSL does not have to
+    import every function again."""
+    global DIFF_EXPORT
+    DIFF_EXPORT = value
+
+
+def should_diff_export() -> bool:
+    return DIFF_EXPORT
+
+
+SPLIT_EXPORT: bool = False
+
+
+def split_export(value: bool = True) -> None:
+    """Exports every function into a file of its own inside `<imports>/<name>/`,
+    listed in its `index.json`, so they can be imported one at a time."""
+    global SPLIT_EXPORT
+    SPLIT_EXPORT = value
+
+
+def should_split_export() -> bool:
+    return SPLIT_EXPORT
@@ -1,8 +1,10 @@
 import atexit
+import hashlib
+import json
 import os
 import sys
 from abc import ABC, abstractmethod
-from collections.abc import Callable, Generator
+from collections.abc import Callable, Generator, Iterable
 from contextlib import contextmanager
 from pathlib import Path
 from types import TracebackType
@@ -10,17 +12,23 @@ from typing import TYPE_CHECKING, ClassVar, NamedTuple, NoReturn, Self
 
 from .config import (
     get_htsl_import_folder,
+    should_diff_export,
     should_disable_global_export,
     should_display_htsl,
+    should_split_export,
 )
+from .limits import PackingMode, PackingReport
 from .logger import AntiSpamLogger
+from .profiler import get_profiler, profiled
 from .utils.log import log
 from .utils.slug import into_slug
+from .writer import IGNORE_MARKER, HtslWriter
 
 if TYPE_CHECKING:
     from .block import Block
     from .editable import Editable
     from .expression.expression import Expression
+    from .manifest import FunctionDiff
 
 
 __all__ = (
@@ -41,7 +49,8 @@ def _format_nested_compound_error(
         'It is not allowed to write a nestable expression (if/random) inside of another nestable expression.',
         '',
         'The expression you are writing expands into a nestable block. This happens'
-        ' with operations like "%" (modulo) and abs(), which compile to an if-block:',
+        ' with operations like "%" (modulo) and abs(), which compile to an if-block'
+        ' unless their operand is known to not be negative:',
         f'    {child!r}',
         f'    expands into:  {offender.describe_nestable_block()}',
         *(f'        {detail}' for detail in offender.nestable_block_detail_lines()),
@@ -50,7 +59,8 @@ def _format_nested_compound_error(
         *(f'    {detail}' for detail in open_expr.nestable_block_detail_lines()),
         '',
         'Compute it into a stat before the block (e.g. "tmp.value = x % 100" outside'
-        ' the block, then use "tmp" inside), or restructure your conditionals.',
+        ' the block, then use "tmp" inside), declare the range of the stat it reads'
+        ' (e.g. "x.with_range(0, 1000)"), or restructure your conditionals.',
     ]
     return '\n'.join(lines)
 
@@ -74,20 +84,35 @@ class ExpressionContext(NamedTuple):
 
 class Container:
     exported_names: ClassVar[set[str]] = set()
+    # The exports whose .htsl file was rewritten, the rest were already up to date
+    changed_exports: ClassVar[set[str]] = set()
 
     logger: AntiSpamLogger
     blocks: list['Block']
     contexts: list[ExpressionContext]
+    deferred_ids: list[int]
 
     is_finalized: bool
     ignore_action_limits: bool
     allow_nested_expressions: bool
+    packing: PackingMode
+    packing_reports: list[PackingReport]
+    # Actions saved by reusing values computed by earlier statements
+    reused_actions: int
+    # Actions saved by replacing stats known to hold a constant with it
+    folded_actions: int
+    # Actions saved by merging, hoisting out of and pruning conditional blocks
+    pruned_actions: int
+    # Actions saved by leaving out the conditionals making the result of `%`
+    # and `abs()` positive
+    narrowed_actions: int
 
     def __init__(
         self,
         *,
         ignore_action_limits: bool = False,
         allow_nested_expressions: bool = False,
+        packing: PackingMode = PackingMode.GREEDY,
     ) -> None:
         from .block import GlobalBlock
 
@@ -95,10 +120,17 @@ class Container:
         self.blocks = []
         self.add_block(GlobalBlock())
         self.contexts = []
+        self.deferred_ids = []
 
         self.is_finalized = False
         self.allow_nested_expressions = allow_nested_expressions
         self.ignore_action_limits = ignore_action_limits
+        self.packing = packing
+        self.packing_reports = []
+        self.reused_actions = 0
+        self.folded_actions = 0
+        self.pruned_actions = 0
+        self.narrowed_actions = 0
 
     def expressions(self) -> list['Expression']:
         def throw() -> NoReturn:
@@ -140,7 +172,7 @@ class Container:
 
     @property
     def is_global(self) -> bool:
-        return self is CONTAINERS[0]
+        return self is get_container_stack()[0]
 
     def get_expressions_ref_in_context(self, *, go_back: int = 0) -> list['Expression']:
         if go_back >= len(self.contexts):
@@ -172,7 +204,7 @@ class Container:
         return self.contexts.pop()
 
     def __enter__(self) -> Self:
-        CONTAINERS.append(self)
+        get_container_stack().append(self)
         return self
 
     def __exit__(
@@ -203,7 +235,7 @@ class Container:
             results.append((deferred_id, result, entry.include_fallback_value))
 
         BinaryExpression.optimize_binary_expressions(setup)
-        BinaryExpression.rename_temporary_stats(setup, finalize=True)
+        BinaryExpression.finalize_temporary_stats(setup)
 
         placeholders = {
             deferred_id: result.into_inside_string(include_fallback_value)
@@ -237,7 +269,9 @@ class Container:
                 expression, BinaryExpression | CompoundExpression
             )
             direct_fields: list[tuple[str, int]] = []
-            for key, value in expression._get_all_values().items():
+            for key, value in expression.iter_field_values(
+                expression.stat_and_string_fields
+            ):
                 if not handles_own_operands and isinstance(
                     value, BinaryExpression | CompoundExpression
                 ):
@@ -254,7 +288,7 @@ class Container:
                 continue
 
             setup, placeholders, editables = self._materialize_deferred(list(ids))
-            for key, value in expression._get_all_values().items():
+            for key, value in expression.iter_field_values(expression.string_fields):
                 if isinstance(value, str) and deferred.text_has_deferred(value):
                     setattr(
                         expression,
@@ -292,12 +326,23 @@ class Container:
                             _format_nested_compound_error(child, offender, expression)
                         )
 
+    def analyze_value_ranges(self, expressions: list['Expression']) -> None:
+        """Runs once over the expressions of a whole block before they are
+        finalized, since it decides whether `%` and `abs()` expand into a
+        conditional, which they can only be nested without."""
+        from .expression.binary_expression import BinaryExpression
+
+        with profiled('analyze value ranges'):
+            self.narrowed_actions += BinaryExpression.analyze_value_ranges(expressions)
+
     def finalize_expressions(self, expressions: list['Expression']) -> None:
         from .actions.no_optimization import no_optimization
         from .expression.binary_expression import BinaryExpression
 
-        self._resolve_deferred_expressions(expressions)
-        self._verify_no_nested_blocks(expressions)
+        with profiled('resolve deferred'):
+            self._resolve_deferred_expressions(expressions)
+        with profiled('verify nesting'):
+            self._verify_no_nested_blocks(expressions)
 
         def on_new_expression(expression: 'Expression') -> None:
             nonlocal index
@@ -305,56 +350,320 @@ class Container:
             index += 1
 
         index = len(expressions) - 1
-        with override_write_expression(on_new_expression):
+        with (
+            profiled('finalize expressions'),
+            override_write_expression(on_new_expression),
+        ):
             while index >= 0:
                 expression = expressions[index]
                 expression.finalize(self)
                 index -= 1
 
         if not no_optimization():
-            BinaryExpression.optimize_binary_expressions(expressions)
+            with profiled('optimize'):
+                BinaryExpression.optimize_binary_expressions(expressions)
+            with profiled('common subexpressions'):
+                self.reused_actions += BinaryExpression.eliminate_common_subexpressions(
+                    expressions
+                )
+
+    def propagate_constants(self, expressions: list['Expression']) -> None:
+        """Runs once over the expressions of a whole block after they are
+        finalized, since what is known flows into nested blocks."""
+        from .actions.no_optimization import no_optimization
+        from .expression.binary_expression import BinaryExpression
+
+        if no_optimization():
+            return
+        with profiled('propagate constants'):
+            self.folded_actions += BinaryExpression.propagate_constants(expressions)
+
+    def optimize_conditionals(self, expressions: list['Expression']) -> None:
+        """Runs once over the expressions of a whole block after constants are
+        propagated, which leaves conditional blocks empty or alike."""
+        from .actions.no_optimization import no_optimization
+        from .expression.binary_expression import BinaryExpression
+
+        if no_optimization():
+            return
+        with profiled('optimize conditionals'):
+            self.pruned_actions += BinaryExpression.optimize_conditionals(expressions)
 
     def finalize(self) -> None:
+        from . import deferred
+        from .compile_cache import get_compile_cache
+
         if self.is_finalized:
             raise RuntimeError('Container is already finalized')
-        for index, block in enumerate(self.blocks):
-            block.finalize(self, index)
-        self.is_finalized = True
+        try:
+            for index, block in enumerate(self.blocks):
+                block.finalize(self, index)
+            self.is_finalized = True
+            if self.reused_actions:
+                self.logger.log(
+                    'Reused common subexpressions, saving '
+                    f'\x1b[38;2;0;255;0m{self.reused_actions}\x1b[0m actions'
+                )
+            if self.folded_actions:
+                self.logger.log(
+                    'Propagated constants, saving '
+                    f'\x1b[38;2;0;255;0m{self.folded_actions}\x1b[0m actions'
+                )
+            if self.pruned_actions:
+                self.logger.log(
+                    'Merged and pruned conditional blocks, saving '
+                    f'\x1b[38;2;0;255;0m{self.pruned_actions}\x1b[0m actions'
+                )
+            if self.narrowed_actions:
+                self.logger.log(
+                    'Left out the sign checks of "%" and abs(), saving '
+                    f'\x1b[38;2;0;255;0m{self.narrowed_actions}\x1b[0m actions'
+                )
+
+            if (cache := get_compile_cache()) is not None:
+                cache.store_pending(self)
+        finally:
+            # Every sentinel is substituted by now, the entries only pin the
+            # expressions they were created from
+            deferred.release_deferred(self.deferred_ids)
+            self.deferred_ids = []
 
     @staticmethod
     def prettify_htsl_lines(lines: list[str]) -> None:
         for i in range(len(lines) - 1, -1, -1):
-            if lines[i].lstrip().startswith('// @ignore'):
+            if lines[i].lstrip().startswith(IGNORE_MARKER):
                 lines.pop(i)
 
-    def into_htsl(self) -> str:
+    def _check_finalized(self) -> None:
         if not self.is_finalized:
             raise RuntimeError(
                 'Unable to transform Container into htsl: Container is not finalized. Either exit the container context or call "finalize()" manually'
             )
 
+    def render(
+        self,
+        writer: HtslWriter,
+        blocks: Iterable['Block'] | None = None,
+    ) -> None:
+        """Streams every non-empty block, or only those of `blocks`, to `writer`,
+        two blank lines apart."""
+        self._check_finalized()
         with override_write_expression(lambda _: None):
-            lines = (
-                '\n\n\n'.join(
-                    block.into_htsl() for block in self.blocks if not block.is_empty()
-                )
-            ).split('\n')
+            first = True
+            for block in self.blocks if blocks is None else blocks:
+                if block.is_empty():
+                    continue
+                if not first:
+                    writer.write_line('')
+                    writer.write_line('')
+                first = False
+                with profiled(block.get_name()), profiled('render'):
+                    block.render(writer, 0)
 
-        self.prettify_htsl_lines(lines)
-        return '\n'.join(lines)
+    def into_htsl(self) -> str:
+        self._check_finalized()
+        return HtslWriter.render_to_string(self.render, skip_ignored=True)
 
     def htsl_path(self, name: str) -> Path:
         return get_htsl_import_folder() / f'{name}.htsl'
 
+    def manifest_path(self, name: str) -> Path:
+        return self.htsl_path(name).with_suffix('.manifest.json')
+
+    def split_folder(self, name: str) -> Path:
+        return self.htsl_path(name).with_suffix('')
+
     def is_empty(self) -> bool:
         return all(block.is_empty() for block in self.blocks)
 
-    def export(self, name: str) -> None:
+    @staticmethod
+    def _file_digest(path: Path) -> bytes | None:
+        try:
+            with path.open('rb') as file:
+                return hashlib.file_digest(file, 'sha256').digest()
+        except FileNotFoundError:
+            return None
+
+    def _write_htsl(self, path: Path, blocks: Iterable['Block'] | None = None) -> bool:
+        """Renders into `path`, returning whether the file changed. A file that
+        already holds the same HTSL is left alone, so HTSL does not see it as
+        modified."""
+        # Streamed into a sibling file first, so a failing render never leaves
+        # a half written export behind
+        temporary_path = path.with_name(f'{path.name}.tmp')
+        try:
+            with temporary_path.open('w', encoding='utf-8') as file:
+                file.write(
+                    '// Generated with PyHTSL https://github.com/69Jesse/PyHTSL\n'
+                )
+                self.render(HtslWriter(file, skip_ignored=True), blocks)
+                file.write('\n')
+            changed = self._file_digest(temporary_path) != self._file_digest(path)
+            if changed:
+                os.replace(temporary_path, path)
+        finally:
+            temporary_path.unlink(missing_ok=True)
+        return changed
+
+    def split_files(self) -> dict[str, list['Block']]:
+        """The non-empty blocks by the file stem they are split into: one file
+        per function, holding its overflow functions as well, since the function
+        triggers them and does not work without."""
+        files: dict[str, list[Block]] = {}
+        stems: dict[int, str] = {}
+        for block in self.blocks:
+            if block.is_empty():
+                continue
+            root = block._overflow_root_ref or block
+            stem = stems.get(id(root))
+            if stem is None:
+                base = into_slug(root.get_name()) or 'function'
+                stem = base
+                counter = 1
+                while stem in files:
+                    counter += 1
+                    stem = f'{base}_{counter}'
+                stems[id(root)] = stem
+                files[stem] = []
+            files[stem].append(block)
+        return files
+
+    def _export_split(self, folder: Path) -> bool:
+        """Writes every function into a file of its own inside `folder`, plus
+        an `index.json` listing them, returning whether any file changed. Files
+        of functions the previous `index.json` listed that are gone are removed,
+        anything else in `folder` is left alone."""
+        folder.mkdir(exist_ok=True)
+        index_path = folder / 'index.json'
+        try:
+            previous_index = index_path.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            previous_index = None
+
+        files = self.split_files()
+        changed = False
+        for stem, blocks in files.items():
+            changed |= self._write_htsl(folder / f'{stem}.htsl', blocks)
+        for stem in self._indexed_stems(previous_index):
+            if stem not in files:
+                path = folder / f'{stem}.htsl'
+                if path.exists():
+                    path.unlink()
+                    changed = True
+
+        index = json.dumps(
+            {
+                'functions': [
+                    {
+                        'import': f'{folder.name}/{stem}',
+                        'file': f'{stem}.htsl',
+                        'blocks': [block.get_name() for block in blocks],
+                    }
+                    for stem, blocks in files.items()
+                ]
+            },
+            indent=2,
+        )
+        if index == previous_index:
+            return changed
+        temporary_path = index_path.with_name(f'{index_path.name}.tmp')
+        try:
+            temporary_path.write_text(index, encoding='utf-8')
+            os.replace(temporary_path, index_path)
+        finally:
+            temporary_path.unlink(missing_ok=True)
+        return True
+
+    @staticmethod
+    def _indexed_stems(index: str | None) -> list[str]:
+        """The file stems an `index.json` written by `_export_split` lists,
+        nothing if it is missing or not one."""
+        if index is None:
+            return []
+        try:
+            functions = json.loads(index)['functions']
+            files = [function['file'] for function in functions]
+        except (ValueError, KeyError, TypeError):
+            return []
+        return [
+            file.removesuffix('.htsl')
+            for file in files
+            # Never anything outside of the folder
+            if isinstance(file, str)
+            and file.endswith('.htsl')
+            and Path(file).name == file
+        ]
+
+    def rendered_blocks(self) -> dict[str, str]:
+        """The HTSL of every non-empty block on its own, by block name."""
+        self._check_finalized()
+        rendered: dict[str, str] = {}
+        with override_write_expression(lambda _: None):
+            for block in self.blocks:
+                if block.is_empty():
+                    continue
+                rendered[block.get_name()] = HtslWriter.render_to_string(
+                    lambda writer, block=block: block.render(writer, 0),
+                    skip_ignored=True,
+                )
+        return rendered
+
+    def export_diff(self, name: str) -> 'FunctionDiff':
+        """Writes the functions whose HTSL changed since the previous export of
+        `name` to `<imports>/<name>_changed.htsl`, and remembers the current ones
+        for the next export. Without changes the diff file is removed, so an
+        outdated one is never imported by accident."""
+        from .manifest import ExportManifest
+
+        manifest_path = self.manifest_path(name)
+        manifest = ExportManifest.from_rendered(self.rendered_blocks())
+        diff = manifest.diff(ExportManifest.load(manifest_path))
+        to_import = diff.to_import
+        diff_path = self.htsl_path(f'{name}_changed')
+        if to_import:
+            self._write_htsl(
+                diff_path,
+                [
+                    block
+                    for block in self.blocks
+                    if not block.is_empty() and block.get_name() in to_import
+                ],
+            )
+        else:
+            diff_path.unlink(missing_ok=True)
+        manifest.dump(manifest_path)
+
+        log(diff.summary())
+        if to_import:
+            log(
+                'Import only the changed functions with HTSL by using the following name: '
+                f'\x1b[38;2;255;0;0m{name}_changed\x1b[0m'
+            )
+        else:
+            log('No function changed, there is nothing to re-import.')
+        return diff
+
+    def export(
+        self,
+        name: str,
+        *,
+        diff: bool | None = None,
+        split: bool | None = None,
+    ) -> bool:
+        """Writes the container to `<imports>/<name>.htsl`, returning whether
+        the file changed. A file that already holds the same HTSL is left alone,
+        so HTSL does not see it as modified. With `diff`, which defaults to
+        `pyhtsl.diff_export()`, the changed functions are exported on their own
+        too, see `export_diff`. With `split`, which defaults to
+        `pyhtsl.split_export()`, every function is written to a file of its own
+        inside `<imports>/<name>/` instead, see `split_files`."""
+        from .compile_cache import get_compile_cache
+
         if self.is_empty():
             log(
                 'Nothing found to write to your .htsl file. \x1b[38;2;255;0;0mPyHTSL will not do anything.\x1b[0m'
             )
-            return
+            return False
 
         if name in self.exported_names:
             raise RuntimeError(
@@ -372,28 +681,64 @@ class Container:
         )
 
         args: list[str] = sys.argv[1:]
-        content = self.into_htsl()
+        self._check_finalized()
 
-        path = self.htsl_path(name)
-        path.write_text(
-            f'// Generated with PyHTSL https://github.com/69Jesse/PyHTSL\n{content}\n',
-            encoding='utf-8',
-        )
+        split = should_split_export() if split is None else split
+        path = self.split_folder(name) if split else self.htsl_path(name)
+        with profiled(f'export {name}'):
+            changed = self._export_split(path) if split else self._write_htsl(path)
+        if changed:
+            self.changed_exports.add(name)
 
         if 'code' in args:
             os.system(f'code "{path.absolute()}"')
 
         if should_display_htsl():
-            log(content)
+            log(self.into_htsl())
 
         self.logger.publish()
 
+        if (cache := get_compile_cache()) is not None:
+            cache.log_summary()
+
+        if should_diff_export() if diff is None else diff:
+            with profiled(f'export {name} diff'):
+                self.export_diff(name)
+
+        if split:
+            log(
+                (
+                    '\n\x1b[38;2;0;255;0mAll done! Your .htsl files are written to the following folder:\x1b[0m'
+                    if changed
+                    else '\n\x1b[38;2;0;255;0mAll done! Your .htsl files did not change, so they were left as is in the following folder:\x1b[0m'
+                )
+                + f'\n{path.absolute()}'
+                f'\nExecute them with HTSL by using the names listed in \x1b[38;2;255;0;0m{name}/index.json\x1b[0m, like \x1b[38;2;255;0;0m{name}/<function>\x1b[0m'
+                '\n'
+            )
+            return changed
+
         log(
-            '\n\x1b[38;2;0;255;0mAll done! Your .htsl file is written to the following location:\x1b[0m'
-            f'\n{path.absolute()}'
+            (
+                '\n\x1b[38;2;0;255;0mAll done! Your .htsl file is written to the following location:\x1b[0m'
+                if changed
+                else '\n\x1b[38;2;0;255;0mAll done! Your .htsl file did not change, so it was left as is at the following location:\x1b[0m'
+            )
+            + f'\n{path.absolute()}'
             f'\nExecute it with HTSL by using the following name: \x1b[38;2;255;0;0m{name}\x1b[0m'
             '\n'
         )
+        return changed
+
+    @classmethod
+    def log_export_summary(cls) -> None:
+        if len(cls.exported_names) < 2:
+            return
+        changed = sorted(cls.changed_exports)
+        log(
+            f'\x1b[38;2;0;255;0m{len(changed)} of {len(cls.exported_names)} exports changed\x1b[0m'
+            + (f': {", ".join(changed)}' if changed else ', nothing to re-import')
+        )
 
 
 def _format_nested_expression_error(
@@ -482,11 +827,19 @@ class ContainerContextManager(ABC):
 
 
 GLOBAL_NAME = into_slug(os.path.basename(sys.argv[0]).rsplit('.', 1)[0])
-CONTAINERS: list[Container] = [Container()]
+CONTAINERS: list[Container] = []
+
+
+def get_container_stack() -> list[Container]:
+    # The global container is created on first use rather than on import,
+    # since creating it imports `.block`, which in turn imports this module
+    if not CONTAINERS:
+        CONTAINERS.append(Container())
+    return CONTAINERS
 
 
 def get_current_container() -> Container:
-    return CONTAINERS[-1]
+    return get_container_stack()[-1]
 
 
 EXCEPTION_OCCURRED = False
@@ -518,14 +871,19 @@ def on_program_exit() -> None:
         )
     else:
         container.export(GLOBAL_NAME)
+    Container.log_export_summary()
+
+    if (profiler := get_profiler()) is not None:
+        profiler.report()
 
     from .execute.decorator import run_saved_execution_contexts
 
     run_saved_execution_contexts()
 
-    from .misc.sounds import SOUND_MIXER
-
-    SOUND_MIXER.shutdown()
+    # Only running a sound starts the mixer, and importing it loads numpy and
+    # sounddevice
+    if (sounds := sys.modules.get('pyhtsl.misc.sounds')) is not None:
+        sounds.SOUND_MIXER.shutdown()
 
 
 sys.excepthook = exception_hook
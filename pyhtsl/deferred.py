@@ -7,6 +7,8 @@ if TYPE_CHECKING:
 __all__ = (
     'register_deferred',
     'lookup_deferred',
+    'release_deferred',
+    'live_deferred_count',
     'find_deferred_ids',
     'text_has_deferred',
     'substitute_deferred',
@@ -23,19 +25,41 @@ class DeferredEntry(NamedTuple):
     include_fallback_value: bool
 
 
+# Ids are unique across containers, each container keeps the ids registered
+# while it was the current one and releases them once it is finalized
 _registry: dict[int, DeferredEntry] = {}
 _counter = 0
 
 
 def register_deferred(checkable: 'Checkable', include_fallback_value: bool) -> str:
+    from .container import get_current_container
+
     global _counter
     _counter += 1
     _registry[_counter] = DeferredEntry(checkable, include_fallback_value)
+    get_current_container().deferred_ids.append(_counter)
     return f'{_PREFIX}{_counter}{_SUFFIX}'
 
 
 def lookup_deferred(deferred_id: int) -> DeferredEntry:
-    return _registry[deferred_id]
+    entry = _registry.get(deferred_id)
+    if entry is None:
+        if 0 < deferred_id <= _counter:
+            raise RuntimeError(
+                f'Deferred expression {deferred_id} was released when the container it was created in was finalized. '
+                'Strings with computed values can not be reused in another container after that.'
+            )
+        raise KeyError(deferred_id)
+    return entry
+
+
+def release_deferred(deferred_ids: list[int]) -> None:
+    for deferred_id in deferred_ids:
+        _registry.pop(deferred_id, None)
+
+
+def live_deferred_count() -> int:
+    return len(_registry)
 
 
 def text_has_deferred(text: str) -> bool:
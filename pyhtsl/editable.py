@@ -12,6 +12,8 @@ __all__ = ('Editable',)
 
 
 class Editable(Checkable):
+    __slots__ = ()
+
     def __iadd__(
         self,
         other: Checkable | NumericHousingType,
@@ -1,4 +1,3 @@
-import re
 import time
 from collections.abc import Callable, Generator, Iterable
 from contextlib import contextmanager
@@ -12,6 +11,7 @@ from ..expression.condition.conditional_expression import ConditionalMode
 from ..expression.expression import Expression
 from ..expression.housing_type import HousingType
 from ..utils.log import log
+from ..utils.placeholders import PlaceholderRegistry
 from ..utils.warn import warn
 from .backend_type import (
     BackendType,
@@ -246,21 +246,20 @@ class ExecutionContext(Container):
         *,
         player: ExecutionPlayer | None = None,
     ) -> str:
-        for pattern, factory in Checkable.iter_pattern_factories():
-
-            def replace_placeholder(match: re.Match[str]) -> str:
-                value = self._get_raw(factory(match), default='', player=player)  # noqa: B023
-                return backend_into_string(value)
-
-            text = pattern.sub(replace_placeholder, text)
-
-        return text
+        parts: list[str] = []
+        last_index = 0
+        for match, factory in PlaceholderRegistry.scan(text):
+            value = self._get_raw(factory(match), default='', player=player)
+            parts.append(text[last_index : match.start()])
+            parts.append(backend_into_string(value))
+            last_index = match.end()
+        if not parts:
+            return text
+        parts.append(text[last_index:])
+        return ''.join(parts)
 
     def _has_any_placeholders(self, text: str) -> bool:
-        for pattern, _ in Checkable.iter_pattern_factories():
-            if pattern.search(text) is not None:
-                return True
-        return False
+        return PlaceholderRegistry.has_any(text)
 
     def _is_in_quotes(self, text: str) -> bool:
         return text.startswith('"') and text.endswith('"')
@@ -291,19 +290,14 @@ class ExecutionContext(Container):
         seen: set[str] = set()
         while key not in seen:
             seen.add(key)
-            matched = False
-            for pattern, factory in Checkable.iter_pattern_factories():
-                match = pattern.fullmatch(key)
-                if match is None:
-                    continue
-                value = self._get_raw(factory(match), default=default, player=player)
-                if not isinstance(value, str):
-                    return value
-                key = value
-                matched = True
-                break
-            if not matched:
+            found = PlaceholderRegistry.fullmatch(key)
+            if found is None:
                 return self._substitute_all_placeholders(key, player=player)
+            match, factory = found
+            value = self._get_raw(factory(match), default=default, player=player)
+            if not isinstance(value, str):
+                return value
+            key = value
         return key
 
     @overload
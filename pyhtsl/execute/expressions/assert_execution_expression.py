@@ -15,6 +15,9 @@ __all__ = ('AssertExecutionExpression',)
 
 
 class AssertExecutionExpression(ExecutionExpression):
+    __slots__ = ('conditions', 'mode', 'message')
+    string_fields = ('message',)
+
     conditions: tuple[
         Condition
         | Callable[[], Condition | None]
@@ -4,5 +4,7 @@ __all__ = ('ExecutionExpression',)
 
 
 class ExecutionExpression(Expression):
+    __slots__ = ()
+
     def into_htsl(self) -> str:
         return f'// @ignore {self!r}'
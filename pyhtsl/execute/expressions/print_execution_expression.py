@@ -13,6 +13,8 @@ __all__ = ('PrintExecutionExpression',)
 
 
 class PrintExecutionExpression(ExecutionExpression):
+    __slots__ = ('values', 'cast')
+
     values: tuple[
         object | Callable[[], object] | Callable[['ExecutionContext'], object],
         ...,
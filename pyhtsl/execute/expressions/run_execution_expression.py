@@ -18,6 +18,8 @@ type CallbackType = Callable[[], Any] | Callable[['ExecutionContext'], Any]
 
 
 class RunExecutionExpression(ExecutionExpression):
+    __slots__ = ('callback',)
+
     callback: CallbackType
 
     def __init__(self, callback: CallbackType) -> None:
@@ -25,6 +25,7 @@ from ..internal_type import InternalType
 from ..logger import log
 from ..stats.stat import Stat
 from ..stats.temporary_stat import Number, TemporaryStat
+from ..utils.placeholders import PlaceholderRegistry
 from .compound_expression import CompoundExpression
 from .condition.comparison_condition import ComparisonCondition
 from .expression import Expression
@@ -42,22 +43,7 @@ SET_STRING_MAX_LENGTH = 32
 
 
 def _is_single_placeholder(value: str) -> bool:
-    return any(
-        pattern.fullmatch(value) is not None
-        for pattern, _ in Checkable.iter_pattern_factories()
-    )
-
-
-def _rhs_references_stat(rhs: object, stat: 'Stat') -> bool:
-    if isinstance(rhs, Stat):
-        return rhs.is_same_stat(stat)
-    if isinstance(rhs, Expression):
-        return rhs.is_using_stat(stat)
-    if isinstance(rhs, str):
-        for ref in Checkable.iter_in_string(rhs):
-            if isinstance(ref, Stat) and ref.is_same_stat(stat):
-                return True
-    return False
+    return PlaceholderRegistry.fullmatch(value) is not None
 
 
 class BinaryOperator(Enum):
@@ -92,6 +78,17 @@ class BinaryExpression[
     LeftT: 'BinaryExpression | Checkable | HousingType',
     RightT: 'BinaryExpression | Checkable | HousingType',
 ](Expression, Editable):
+    __slots__ = (
+        'internal_type',
+        'fallback_value',
+        'left',
+        'right',
+        'operator',
+        'is_intentional_self_assignment',
+    )
+    stat_fields = ('left', 'right')
+    string_fields = ('left', 'right')
+
     left: LeftT
     right: RightT
     operator: BinaryOperator
@@ -142,6 +139,31 @@ class BinaryExpression[
             if isinstance(side, BinaryExpression | CompoundExpression):
                 yield from side.walk_expressions()
 
+    def change_all_occurrences_of_stat(
+        self,
+        old_stat: Stat,
+        new_stat: Stat,
+    ) -> bool:
+        has_changed = self.change_own_occurrences_of_stat(old_stat, new_stat)
+        for key in ('left', 'right'):
+            side = getattr(self, key)
+            if not isinstance(side, BinaryExpression | CompoundExpression):
+                continue
+            if old_stat.stat_key() not in side.stat_usage().stats:
+                continue
+            # Operands can be shared with other expressions, so change a copy
+            side = side.cloned()
+            side.change_all_occurrences_of_stat(old_stat, new_stat)
+            setattr(self, key, side)
+            has_changed = True
+        return has_changed
+
+    def get_stat_accesses(self) -> Generator[tuple[Stat, bool, bool], None, None]:
+        if isinstance(self.left, Stat):
+            yield (self.left, self.operator is not BinaryOperator.Set, True)
+        if isinstance(self.right, Stat):
+            yield (self.right, True, False)
+
     def into_assignment_expression(self) -> AssignmentExpression:
         if not isinstance(self.left, Editable):
             raise TypeError('Left side of a binary expression must be editable')
@@ -215,12 +237,11 @@ class BinaryExpression[
         ) -> Checkable | HousingType:
             if isinstance(expr, CompoundExpression):
                 for sub in expr.expressions:
-                    sub = sub.cloned()
                     if isinstance(sub, BinaryExpression):
                         expressions.extend(sub.flatten())
                     else:
-                        expressions.append(sub)
-                return expr.result.cloned()
+                        expressions.append(sub.cloned())
+                return expr.result
 
             if not isinstance(expr, BinaryExpression):
                 return expr
@@ -271,93 +292,84 @@ class BinaryExpression[
     @staticmethod
     def take_out_useless_expressions(expressions: list[Expression]) -> bool:
         """Run the peephole passes to a fixed point, returning whether anything changed."""
-        changed_any = False
-        has_changed = True
-        while has_changed:
-            has_changed = False
-            has_changed |= BinaryExpression._remove_no_op_expressions(expressions)
-            has_changed |= BinaryExpression._merge_identity_set_with_op(expressions)
-            has_changed |= BinaryExpression._fold_consecutive_constant_ops(expressions)
-            has_changed |= BinaryExpression._eliminate_dead_stores(expressions)
-            changed_any |= has_changed
-        return changed_any
+        from .optimizer import BlockOptimizer
+
+        optimizer = BlockOptimizer(expressions)
+        changed = optimizer.take_out_useless_expressions()
+        optimizer.write_back()
+        return changed
 
     @staticmethod
     def _is_execution_barrier(expression: Expression) -> bool:
         from ..actions.pause_execution import PauseExecutionExpression
         from ..actions.trigger_function import TriggerFunctionExpression
+        from ..execute.expressions.execution_expression import ExecutionExpression
 
+        # Callbacks of an execution context may read any stat
         return any(
-            isinstance(expr, PauseExecutionExpression | TriggerFunctionExpression)
+            isinstance(
+                expr,
+                PauseExecutionExpression
+                | TriggerFunctionExpression
+                | ExecutionExpression,
+            )
             for expr in expression.walk_expressions()
         )
 
     @staticmethod
-    def _remove_no_op_expressions(expressions: list[Expression]) -> bool:
-        has_changed = False
-        for i in range(len(expressions) - 1, -1, -1):
-            _expression = expressions[i]
+    def _is_no_op(expression: AssignmentExpression) -> bool:
+        if (
+            isinstance(expression.left, Stat)
+            and expression.left.is_same_stat(expression.right)
+            and expression.operator is BinaryOperator.Set
+            and not expression.is_intentional_self_assignment
+        ):
+            # stat = stat
+            return True
 
-            if not isinstance(_expression, BinaryExpression):
-                continue
-            expression = _expression.into_assignment_expression()
+        if (
+            (
+                expression.operator is BinaryOperator.Increment
+                or expression.operator is BinaryOperator.Decrement
+            )
+            and isinstance(expression.right, int | float)
+            and (expression.right == 0 or expression.right == 0.0)
+        ):
+            # editable += 0
+            # editable -= 0
+            return True
 
-            if (
-                isinstance(expression.left, Stat)
-                and expression.left.is_same_stat(expression.right)
-                and expression.operator is BinaryOperator.Set
-                and not expression.is_intentional_self_assignment
-            ):
-                # stat = stat
-                del expressions[i]
-                has_changed = True
-
-            elif (
-                (
-                    expression.operator is BinaryOperator.Increment
-                    or expression.operator is BinaryOperator.Decrement
-                )
-                and isinstance(expression.right, int | float)
-                and (expression.right == 0 or expression.right == 0.0)
-            ):
-                # editable += 0
-                # editable -= 0
-                del expressions[i]
-                has_changed = True
-
-            elif (
-                (
-                    expression.operator is BinaryOperator.Multiply
-                    or expression.operator is BinaryOperator.Divide
-                )
-                and isinstance(expression.right, int | float)
-                and (expression.right == 1 or expression.right == 1.0)
-            ):
-                # editable *= 1
-                # editable /= 1
-                del expressions[i]
-                has_changed = True
-
-            elif (
-                (
-                    expression.operator is BinaryOperator.BitwiseOr
-                    or expression.operator is BinaryOperator.BitwiseXor
-                    or expression.operator is BinaryOperator.LeftShift
-                    or expression.operator is BinaryOperator.RightShift
-                    or expression.operator is BinaryOperator.LogicalRightShift
-                )
-                and isinstance(expression.right, int)
-                and expression.right == 0
-            ):
-                # editable |= 0
-                # editable ^= 0
-                # editable <<= 0
-                # editable >>= 0
-                # editable >>>= 0
-                del expressions[i]
-                has_changed = True
+        if (
+            (
+                expression.operator is BinaryOperator.Multiply
+                or expression.operator is BinaryOperator.Divide
+            )
+            and isinstance(expression.right, int | float)
+            and (expression.right == 1 or expression.right == 1.0)
+        ):
+            # editable *= 1
+            # editable /= 1
+            return True
 
-        return has_changed
+        if (
+            (
+                expression.operator is BinaryOperator.BitwiseOr
+                or expression.operator is BinaryOperator.BitwiseXor
+                or expression.operator is BinaryOperator.LeftShift
+                or expression.operator is BinaryOperator.RightShift
+                or expression.operator is BinaryOperator.LogicalRightShift
+            )
+            and isinstance(expression.right, int)
+            and expression.right == 0
+        ):
+            # editable |= 0
+            # editable ^= 0
+            # editable <<= 0
+            # editable >>= 0
+            # editable >>>= 0
+            return True
+
+        return False
 
     @staticmethod
     def _is_left_identity_for(operator: BinaryOperator, value: object) -> bool:
@@ -374,74 +386,6 @@ class BinaryExpression[
             return value == -1
         return False
 
-    @staticmethod
-    def _merge_identity_set_with_op(expressions: list[Expression]) -> bool:
-        """`lhs = identity; lhs OP rhs` -> `lhs = rhs` (covers +, *, |, ^, &)."""
-        has_changed = False
-        i = 0
-        while i < len(expressions) - 1:
-            expr_i = expressions[i]
-            if not (
-                isinstance(expr_i, BinaryExpression)
-                and isinstance(expr_i.left, Stat)
-                and expr_i.operator is BinaryOperator.Set
-                and not expr_i.is_intentional_self_assignment
-            ):
-                i += 1
-                continue
-
-            lhs = expr_i.left
-            init_value = expr_i.right
-
-            j = i + 1
-            merge_target: BinaryExpression[Any, Any] | None = None
-            while j < len(expressions):
-                expr_j = expressions[j]
-                if BinaryExpression._is_execution_barrier(expr_j):
-                    break
-                if (
-                    isinstance(expr_j, BinaryExpression)
-                    and isinstance(expr_j.left, Stat)
-                    and expr_j.left.is_same_stat(lhs)
-                    and BinaryExpression._is_left_identity_for(
-                        expr_j.operator, init_value
-                    )
-                ):
-                    merge_target = expr_j
-                    break
-                if expr_j.is_using_stat(lhs):
-                    break
-                j += 1
-
-            if merge_target is None:
-                i += 1
-                continue
-
-            rhs = merge_target.right
-            if isinstance(rhs, Stat):
-                if rhs.is_same_stat(lhs):
-                    i += 1
-                    continue
-                if any(
-                    isinstance(expressions[k], BinaryExpression)
-                    and isinstance(expressions[k].left, Stat)  # type: ignore[union-attr]
-                    and expressions[k].left.is_same_stat(rhs)  # type: ignore[union-attr]
-                    for k in range(i + 1, j)
-                ):
-                    i += 1
-                    continue
-
-            expressions[i] = BinaryExpression(
-                left=lhs,
-                right=rhs,
-                operator=BinaryOperator.Set,
-            )
-            del expressions[j]
-            has_changed = True
-            i += 1
-
-        return has_changed
-
     @staticmethod
     def _combine_constant_ops(
         op_a: BinaryOperator,
@@ -535,107 +479,19 @@ class BinaryExpression[
 
         return None
 
-    @staticmethod
-    def _fold_consecutive_constant_ops(expressions: list[Expression]) -> bool:
-        """`lhs OP1 c1; lhs OP2 c2` -> `lhs OP_combined c_combined` when adjacent."""
-        has_changed = False
-        i = 0
-        while i < len(expressions) - 1:
-            expr_a = expressions[i]
-            expr_b = expressions[i + 1]
-            if not (
-                isinstance(expr_a, BinaryExpression)
-                and isinstance(expr_b, BinaryExpression)
-                and isinstance(expr_a.left, Stat)
-                and isinstance(expr_b.left, Stat)
-                and expr_a.left.is_same_stat(expr_b.left)
-                and isinstance(expr_a.right, int | float)
-                and isinstance(expr_b.right, int | float)
-            ):
-                i += 1
-                continue
-
-            combined = BinaryExpression._combine_constant_ops(
-                expr_a.operator,
-                expr_a.right,
-                expr_b.operator,
-                expr_b.right,
-                expr_a.left.internal_type,
-            )
-            if combined is None:
-                i += 1
-                continue
-
-            new_op, new_val = combined
-            expressions[i] = BinaryExpression(
-                left=expr_a.left,
-                right=new_val,
-                operator=new_op,
-            )
-            del expressions[i + 1]
-            has_changed = True
-            # Don't advance; the new expression at i may fold with i+1.
-
-        return has_changed
-
-    @staticmethod
-    def _eliminate_dead_stores(expressions: list[Expression]) -> bool:
-        """`lhs OP a; ... (lhs unread) ...; lhs = b` (b doesn't read lhs) -> drop first.
-
-        Any op that writes to lhs (Set, Increment, Multiply, ...) is dead if the
-        next expression that touches lhs is a full overwrite without reading it.
-        """
-        has_changed = False
-        i = 0
-        while i < len(expressions):
-            expr_i = expressions[i]
-            if not (
-                isinstance(expr_i, BinaryExpression)
-                and isinstance(expr_i.left, Stat)
-                and not expr_i.is_intentional_self_assignment
-            ):
-                i += 1
-                continue
-
-            lhs = expr_i.left
-            is_dead = False
-            for j in range(i + 1, len(expressions)):
-                expr_j = expressions[j]
-                if BinaryExpression._is_execution_barrier(expr_j):
-                    break
-                if not expr_j.is_using_stat(lhs):
-                    continue
-                if (
-                    isinstance(expr_j, BinaryExpression)
-                    and isinstance(expr_j.left, Stat)
-                    and expr_j.left.is_same_stat(lhs)
-                    and expr_j.operator is BinaryOperator.Set
-                    and not expr_j.is_intentional_self_assignment
-                    and not _rhs_references_stat(expr_j.right, lhs)
-                ):
-                    is_dead = True
-                break
-
-            if is_dead:
-                del expressions[i]
-                has_changed = True
-            else:
-                i += 1
-
-        return has_changed
-
     @staticmethod
     def rename_temporary_stats(
         expressions: list[Expression],
         *,
         finalize: bool = False,
+        live: frozenset[int] = frozenset(),
     ) -> None:
-        reserved: set[int] = set()
+        reserved: set[int] = set(live)
         first_uses: list[TemporaryStat] = []
         seen: set[Number] = set()
         for expression in expressions:
             for expr in expression.walk_expressions():
-                for stat, _ in expr.get_all_stats_used():
+                for stat in expr.iter_stats_used():
                     if isinstance(stat, TemporaryStat):
                         if stat._number.finalized:
                             reserved.add(stat.number)
@@ -659,103 +515,71 @@ class BinaryExpression[
             for stat in first_uses:
                 stat._number.finalized = True
 
+    @staticmethod
+    def finalize_temporary_stats(expressions: list[Expression]) -> None:
+        """Gives the temporary stats of `expressions` a number no other one has,
+        and keeps it when they are renamed. The block they are written to numbers
+        them for good once finalized."""
+        seen: set[Number] = set()
+        for expression in expressions:
+            for expr in expression.walk_expressions():
+                for stat in expr.iter_stats_used():
+                    if not isinstance(stat, TemporaryStat):
+                        continue
+                    number = stat._number
+                    if number.finalized or number in seen:
+                        continue
+                    seen.add(number)
+                    number.value = Number.next_value()
+                    number.finalized = True
+
     @staticmethod
     def optimize_binary_expressions(expressions: list[Expression]) -> None:
-        has_changed = True
-        while has_changed:
-            has_changed = False
-
-            for i, _expression in enumerate(expressions):
-                if not isinstance(_expression, BinaryExpression):
-                    continue
-                expression = _expression.into_assignment_expression()
-
-                if not isinstance(expression.left, Stat):
-                    continue
-                if not isinstance(expression.right, TemporaryStat):
-                    continue
-                if expression.operator is not BinaryOperator.Set:
-                    continue
-                if expression.left.is_same_stat(expression.right):
-                    continue
-
-                # We have:
-                # `left = right` (left is a stat, right is a temp stat)
-                # this means that
-                #     - we can replace all previous right with left
-                #     - but ONLY IF
-                #         * left is not used before this line together with right
-                #             the exception being `right = left`
-                #         * right is not used after this line
-
-                def left_and_right_used_together_with_exception(
-                    expr: Expression,
-                    left: Stat,
-                    right: TemporaryStat,
-                ) -> bool:
-                    if not expr.is_using_stats_together(left, right):
-                        return False
-
-                    # This would only get ran if `left = right`
-                    # The exception is: `right = left`, then this is still False
-                    if isinstance(expr, BinaryExpression):
-                        if (
-                            expr.operator is BinaryOperator.Set
-                            and left.is_same_stat(expr.right)
-                            and right.is_same_stat(expr.left)
-                        ):
-                            return False
-
-                    return True
-
-                if any(
-                    left_and_right_used_together_with_exception(
-                        expressions[j],
-                        expression.left,
-                        expression.right,
-                    )
-                    for j in range(i - 1, -1, -1)
-                ):
-                    continue
+        from .optimizer import BlockOptimizer
 
-                if any(
-                    expressions[j].is_using_stat(expression.right)
-                    for j in range(i + 1, len(expressions))
-                ):
-                    continue
-
-                first_use = next(
-                    (
-                        j
-                        for j in range(i)
-                        if expressions[j].is_using_stat(expression.right)
-                    ),
-                    None,
-                )
-                if first_use is not None and any(
-                    BinaryExpression._is_execution_barrier(expressions[j])
-                    for j in range(first_use + 1, i)
-                ):
-                    continue
+        BlockOptimizer(expressions).optimize()
 
-                # A list, not a generator: `any` must not short-circuit and
-                # leave later occurrences un-rewritten.
-                substitutions = [
-                    expressions[j].change_all_occurrences_of_stat(
-                        expression.right, expression.left
-                    )
-                    for j in range(i + 1)
-                ]
-                has_changed |= any(substitutions)
+    @staticmethod
+    def eliminate_common_subexpressions(expressions: list[Expression]) -> int:
+        """Reuse values computed by earlier statements, returning the amount of
+        actions saved."""
+        from .value_numbering import ValueNumbering
+
+        return ValueNumbering(expressions).run()
+
+    @staticmethod
+    def propagate_constants(expressions: list[Expression]) -> int:
+        """Replace the stats of a whole block known to hold a constant with it,
+        returning the amount of actions saved."""
+        from .constant_propagation import ConstantPropagation
+
+        return ConstantPropagation(expressions).run()
+
+    @staticmethod
+    def optimize_conditionals(expressions: list[Expression]) -> int:
+        """Merge, hoist out of and prune the conditional blocks of a whole block,
+        returning the amount of actions saved."""
+        from .conditional_optimizer import ConditionalOptimizer
 
-            # Inside the loop: a peephole fold can expose a new temp-stat merge.
-            has_changed |= BinaryExpression.take_out_useless_expressions(expressions)
+        return ConditionalOptimizer(expressions).run()
+
+    @staticmethod
+    def analyze_value_ranges(expressions: list[Expression]) -> int:
+        """Leave out the conditionals making the result of `%` and `abs()`
+        positive in a whole block where their operand is known to not be
+        negative, returning the amount of actions saved."""
+        from .range_analysis import ValueRangeAnalysis
+
+        return ValueRangeAnalysis(expressions).run()
 
     def into_executable_expressions(self) -> Generator[Expression, None, None]:
+        yield from self.executable_form(self._executable_expressions).expressions
+
+    def _executable_expressions(self) -> list[Expression]:
         expressions = self.flatten()
         self.optimize_binary_expressions(expressions)
-        self.rename_temporary_stats(expressions)
-        yield from expressions
+        self.rename_temporary_stats(expressions, live=self.live_temporary_numbers)
+        return expressions
 
     def create_temp_stat_and_write(self) -> TemporaryStat:
         stat = TemporaryStat(self.internal_type)
@@ -768,7 +592,7 @@ class BinaryExpression[
         self.optimize_binary_expressions(expressions)
         # Finalized: each lands in the block as its own statement and gets
         # re-rendered independently, so the numbers must not drift.
-        self.rename_temporary_stats(expressions, finalize=True)
+        self.finalize_temporary_stats(expressions)
         for expr in expressions:
             expr.write()
 
@@ -778,7 +602,7 @@ class BinaryExpression[
         stat = TemporaryStat(self.internal_type)
         expressions = BinaryExpression(
             left=stat,
-            right=self.cloned(),
+            right=self,
             operator=BinaryOperator.Set,
         ).flatten()
         return expressions, stat
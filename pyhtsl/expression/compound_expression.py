@@ -1,27 +1,63 @@
 from collections.abc import Generator
-from typing import Self, final
+from typing import TYPE_CHECKING, Self, final
 
 from ..editable import Editable
 from .expression import Expression
 
+if TYPE_CHECKING:
+    from ..checkable import Checkable
+    from ..stats.stat import Stat
+
 
 @final
 class CompoundExpression(Expression, Editable):
+    __slots__ = (
+        'internal_type',
+        'fallback_value',
+        'expressions',
+        'result',
+        'sign_fix_operand',
+    )
+    stat_fields = ('result', 'sign_fix_operand')
+
     expressions: list[Expression]
     result: Editable
-
-    def __init__(self, expressions: list[Expression], result: Editable) -> None:
+    # For `%` and `abs()`, whose last expression is a conditional making the
+    # result positive: the operand it is not needed for once that is known to
+    # not be negative, see `ValueRangeAnalysis`
+    sign_fix_operand: 'Checkable | None'
+
+    def __init__(
+        self,
+        expressions: list[Expression],
+        result: Editable,
+        *,
+        sign_fix_operand: 'Checkable | None' = None,
+    ) -> None:
         super().__init__()
         self.expressions = expressions
         self.result = result
+        self.sign_fix_operand = sign_fix_operand
         self.internal_type = result.internal_type
 
     def cloned_raw(self) -> Self:
         return self.__class__(
             [expr.cloned() for expr in self.expressions],
-            self.result.cloned(),
+            self.result,
+            sign_fix_operand=self.sign_fix_operand,
         )
 
+    def get_stat_accesses(
+        self,
+    ) -> Generator[tuple['Stat', bool, bool], None, None]:
+        from ..stats.stat import Stat
+
+        if isinstance(self.result, Stat):
+            yield (self.result, True, True)
+        # Only read, by the expressions computing the result
+        if isinstance(self.sign_fix_operand, Stat):
+            yield (self.sign_fix_operand, True, False)
+
     def equals_raw(self, other: object) -> bool:
         if not isinstance(other, CompoundExpression):
             return False
@@ -33,25 +69,29 @@ class CompoundExpression(Expression, Editable):
         )
 
     def _flattened_expressions(self) -> list[Expression]:
-        """Clone the stored expressions, flattening any unflattened BinaryExpressions."""
+        """Flatten the stored BinaryExpressions into new expressions and clone the rest."""
         from .binary_expression import BinaryExpression
 
         expressions: list[Expression] = []
         for expr in self.expressions:
-            expr = expr.cloned()
             if isinstance(expr, BinaryExpression):
                 expressions.extend(expr.flatten())
             else:
-                expressions.append(expr)
+                expressions.append(expr.cloned())
         return expressions
 
     def into_executable_expressions(self) -> Generator[Expression, None, None]:
+        yield from self.executable_form(self._executable_expressions).expressions
+
+    def _executable_expressions(self) -> list[Expression]:
         from .binary_expression import BinaryExpression
 
         expressions = self._flattened_expressions()
         BinaryExpression.optimize_binary_expressions(expressions)
-        BinaryExpression.rename_temporary_stats(expressions)
-        yield from expressions
+        BinaryExpression.rename_temporary_stats(
+            expressions, live=self.live_temporary_numbers
+        )
+        return expressions
 
     def write_and_get_result(self) -> Editable:
         from .binary_expression import BinaryExpression
@@ -60,13 +100,13 @@ class CompoundExpression(Expression, Editable):
         BinaryExpression.optimize_binary_expressions(expressions)
         # Finalized: each lands in the block as its own statement and gets
         # re-rendered independently, so the numbers must not drift.
-        BinaryExpression.rename_temporary_stats(expressions, finalize=True)
+        BinaryExpression.finalize_temporary_stats(expressions)
         for expr in expressions:
             expr.write()
         return self.result
 
     def materialize(self) -> tuple[list[Expression], Editable]:
-        return self._flattened_expressions(), self.result.cloned()
+        return self._flattened_expressions(), self.result
 
     def into_string_lhs(self) -> str:
         return self.write_and_get_result().into_string_lhs()
@@ -97,3 +137,14 @@ class CompoundExpression(Expression, Editable):
         yield from super().walk_expressions()
         for expr in self.expressions:
             yield from expr.walk_expressions()
+
+    def change_all_occurrences_of_stat(
+        self,
+        old_stat: 'Stat',
+        new_stat: 'Stat',
+    ) -> bool:
+        has_changed = self.change_own_occurrences_of_stat(old_stat, new_stat)
+        for expr in self.expressions:
+            if expr.change_all_occurrences_of_stat(old_stat, new_stat):
+                has_changed = True
+        return has_changed
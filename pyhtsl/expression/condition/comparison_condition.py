@@ -39,6 +39,8 @@ class ComparisonOperator(Enum):
 class ComparisonCondition[LeftT: 'Checkable', RightT: 'Checkable | HousingType'](
     Condition
 ):
+    __slots__ = ('inverted', 'left', 'right', 'operator')
+
     left: LeftT
     right: RightT
     operator: ComparisonOperator
@@ -51,6 +53,7 @@ class ComparisonCondition[LeftT: 'Checkable', RightT: 'Checkable | HousingType']
     ) -> None:
         from ..binary_expression import BinaryExpression
 
+        self.inverted = False
         self.left = left
         self.right = right
         self.operator = operator
@@ -98,7 +101,7 @@ class ComparisonCondition[LeftT: 'Checkable', RightT: 'Checkable | HousingType']
 
     def cloned_raw(self) -> Self:
         return self.__class__(
-            left=self.left.cloned(),
+            left=BaseObject.cloned_or_same(self.left),
             right=BaseObject.cloned_or_same(self.right),
             operator=self.operator,
         )
@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Self, final
 
 from ...base_object import BaseObject
 from ...container import Container
+from ...utils.fields import field_values
 from ...utils.log import log
 
 if TYPE_CHECKING:
@@ -17,6 +18,8 @@ __all__ = ('Condition',)
 
 
 class Condition(BaseObject):
+    __slots__ = ()
+
     inverted: bool = False
 
     @abstractmethod
@@ -81,6 +84,13 @@ class Condition(BaseObject):
     ) -> Generator[tuple['Stat', Callable[['Stat'], None]], None, None]:
         from ...stats.stat import Stat
 
-        for key, value in vars(self).items():
+        for key, value in field_values(self).items():
             if isinstance(value, Stat):
                 yield (value, lambda new, _k=key: self._set_stat(_k, new))
+
+    def iter_stats_used(self) -> Generator['Stat', None, None]:
+        from ...stats.stat import Stat
+
+        for value in field_values(self).values():
+            if isinstance(value, Stat):
+                yield value
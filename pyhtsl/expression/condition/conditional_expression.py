@@ -2,8 +2,8 @@ from collections.abc import Callable, Generator
 from enum import Enum
 from typing import TYPE_CHECKING, Self, final
 
-from ...config import INDENT
 from ...container import Container
+from ...writer import HtslWriter
 from ..expression import Expression
 
 if TYPE_CHECKING:
@@ -22,6 +22,9 @@ class ConditionalMode(Enum):
 
 @final
 class ConditionalExpression(Expression):
+    __slots__ = ('conditions', 'mode', 'if_expressions', 'else_expressions')
+    expression_list_fields = ('if_expressions', 'else_expressions')
+
     conditions: list['Condition']
     mode: ConditionalMode
 
@@ -42,20 +45,22 @@ class ConditionalExpression(Expression):
         self.else_expressions = else_expressions or []
 
     def into_htsl(self) -> str:
-        result = f'if {self.mode.value} ({", ".join(cond.into_htsl() for cond in self.conditions)}) {{'
-        for expr in self.if_expressions:
-            result += ('\n' + expr.into_htsl()).replace('\n', '\n' + INDENT)
+        return HtslWriter.render_to_string(lambda writer: self.render(writer, 0))
 
-        if not self.else_expressions:
-            result += '\n}'
-            return result
+    def render(self, writer: HtslWriter, indent: int) -> None:
+        writer.write_line(
+            f'if {self.mode.value} ({", ".join(cond.into_htsl() for cond in self.conditions)}) {{',
+            indent,
+        )
+        for expr in self.if_expressions:
+            expr.render(writer, indent + 1)
 
-        result += '\n} else {'
-        for expr in self.else_expressions:
-            result += ('\n' + expr.into_htsl()).replace('\n', '\n' + INDENT)
-        result += '\n}'
+        if self.else_expressions:
+            writer.write_line('} else {', indent)
+            for expr in self.else_expressions:
+                expr.render(writer, indent + 1)
 
-        return result
+        writer.write_line('}', indent)
 
     def cloned(self) -> Self:
         return self.__class__(
@@ -113,6 +118,17 @@ class ConditionalExpression(Expression):
         for cond in self.conditions:
             yield from cond.get_all_stats_used()
 
+    def iter_stats_used(self) -> Generator['Stat', None, None]:
+        yield from super().iter_stats_used()
+        for cond in self.conditions:
+            yield from cond.iter_stats_used()
+
+    def get_stat_accesses(
+        self,
+    ) -> Generator[tuple['Stat', bool, bool], None, None]:
+        for stat in self.iter_stats_used():
+            yield (stat, True, False)
+
     def __repr__(self) -> str:
         return f'If<{self.mode.name}, conditions={len(self.conditions)}, if_exprs={len(self.if_expressions)}, else_exprs={len(self.else_expressions)}>'
 
@@ -131,9 +147,6 @@ class ConditionalExpression(Expression):
         container.finalize_expressions(self.if_expressions)
         container.finalize_expressions(self.else_expressions)
 
-    def nested_expressions_refs(self) -> list[list['Expression']]:
-        return [self.if_expressions, self.else_expressions]
-
     def describe_nestable_block(self) -> str:
         name = 'IfAll' if self.mode is ConditionalMode.ALL else 'IfAny'
         plural = '' if len(self.conditions) == 1 else 's'
@@ -0,0 +1,242 @@
+from typing import TYPE_CHECKING, NamedTuple
+
+from ..checkable import Checkable
+from ..limits import count_actions, is_within_limits
+from ..stats.stat import Stat
+from ..utils.fields import field_values
+from .binary_expression import BinaryExpression
+from .compound_expression import CompoundExpression
+from .condition.comparison_condition import ComparisonCondition
+from .condition.conditional_expression import ConditionalExpression, ConditionalMode
+from .constant_propagation import remove_unread_temporary_stats
+from .stat_usage import StatKey, placeholder_stat_key
+
+if TYPE_CHECKING:
+    from .expression import Expression
+
+
+__all__ = ('ConditionalOptimizer',)
+
+
+class _ConditionReads(NamedTuple):
+    # The stats the conditions read, directly or by placeholder
+    keys: frozenset[StatKey]
+    # Whether they only compare those stats, and no other action can change
+    # what they evaluate to
+    only_stats: bool
+
+
+def _condition_reads(expression: ConditionalExpression) -> _ConditionReads:
+    keys: set[StatKey] = set()
+    only_stats = True
+    for condition in expression.conditions:
+        if not isinstance(condition, ComparisonCondition) or not all(
+            isinstance(value, Stat | int | float)
+            for value in (condition.left, condition.right)
+        ):
+            only_stats = False
+        for stat in condition.iter_stats_used():
+            keys.add(stat.stat_key())
+            keys.add(placeholder_stat_key(stat))
+        for value in field_values(condition).values():
+            if isinstance(value, str) and '%' in value:
+                keys.update(
+                    ref.stat_key()
+                    for ref in Checkable.iter_in_string(value)
+                    if isinstance(ref, Stat)
+                )
+    return _ConditionReads(frozenset(keys), only_stats)
+
+
+def _may_change(statements: list['Expression'], reads: _ConditionReads) -> bool:
+    """Whether running `statements` may change what conditions reading `reads`
+    evaluate to."""
+    for statement in statements:
+        if BinaryExpression._is_execution_barrier(statement):
+            return True
+        if any(
+            isinstance(part, BinaryExpression) and not isinstance(part.left, Stat)
+            for part in statement.walk_expressions()
+        ):
+            # Editables like health are not stats, so their writes are not
+            # known, and conditions may read them by placeholder
+            return True
+        if not reads.only_stats and any(
+            not isinstance(part, BinaryExpression | CompoundExpression)
+            for part in statement.walk_expressions()
+        ):
+            # Only stat assignments are known to not change what a named
+            # condition or a placeholder checks
+            return True
+        if not reads.keys.isdisjoint(statement.stat_usage().writes):
+            return True
+    return False
+
+
+def _same_action(first: 'Expression', second: 'Expression') -> bool:
+    if any(
+        isinstance(expression, BinaryExpression)
+        and isinstance(expression.right, BinaryExpression | CompoundExpression)
+        for expression in (first, second)
+    ):
+        # Only rendered once the temps they flatten into are numbered
+        return False
+    # Whether the stat is unset when set to zero is not part of `equals`
+    return first.equals(second) and first.into_htsl() == second.into_htsl()
+
+
+def _same_conditions(
+    first: ConditionalExpression,
+    second: ConditionalExpression,
+) -> bool:
+    return (
+        first.mode is second.mode
+        and len(first.conditions) == len(second.conditions)
+        and all(
+            condition.equals(other)
+            for condition, other in zip(
+                first.conditions, second.conditions, strict=True
+            )
+        )
+    )
+
+
+class ConditionalOptimizer:
+    """Makes the conditional blocks of a whole block take as few actions as
+    possible, every one of them counting against the conditionals a block can
+    hold.
+
+    Going through the block in order, each conditional block is
+    - merged into the block right before it when both check the same
+      conditions, and the earlier one can not change what they evaluate to,
+    - left without the statements both its branches start or end with, which
+      run before or after it instead; statements only go before it when they
+      can not change what its conditions evaluate to,
+    - removed when neither branch does anything,
+    - turned around when only its `else` branch does something.
+
+    Conditional blocks are never nested here, so only the block itself is gone
+    through. Temps only the conditions of a removed block read are removed
+    with it. Blocks without conditions are left as they are: this runs before
+    action limits are fixed, so they are only ever written by the user.
+    """
+
+    expressions: list['Expression']
+    saved: int
+    changed: bool
+    # Whether a conditional block went, leaving the temps it read unread
+    removed: bool
+
+    def __init__(self, expressions: list['Expression']) -> None:
+        self.expressions = expressions
+        self.saved = 0
+        self.changed = False
+        self.removed = False
+
+    def run(self) -> int:
+        """Rewrites the block in place, returning the amount of actions saved."""
+        if not any(
+            isinstance(expression, ConditionalExpression)
+            for expression in self.expressions
+        ):
+            return 0
+        result: list[Expression] = []
+        for expression in self.expressions:
+            if isinstance(expression, ConditionalExpression):
+                self._add_conditional(expression, result)
+            else:
+                result.append(expression)
+        if not self.changed:
+            return 0
+        self.expressions[:] = result
+        if self.removed:
+            saved, _ = remove_unread_temporary_stats(self.expressions)
+            self.saved += saved
+        return self.saved
+
+    def _add_conditional(
+        self,
+        expression: ConditionalExpression,
+        result: list['Expression'],
+    ) -> None:
+        if not expression.conditions:
+            # Written by the user to nest its body, the ones fixing action
+            # limits only come later
+            result.append(expression)
+            return
+
+        reads: _ConditionReads | None = None
+        previous = result[-1] if result else None
+        if isinstance(previous, ConditionalExpression) and _same_conditions(
+            previous, expression
+        ):
+            reads = _condition_reads(expression)
+            if (
+                not _may_change(previous.if_expressions, reads)
+                and not _may_change(previous.else_expressions, reads)
+                and is_within_limits(
+                    previous.if_expressions + expression.if_expressions
+                )
+                and is_within_limits(
+                    previous.else_expressions + expression.else_expressions
+                )
+            ):
+                # The bodies of both run one after the other on the same
+                # outcome, with one conditional action less
+                result.pop()
+                previous.if_expressions.extend(expression.if_expressions)
+                previous.else_expressions.extend(expression.else_expressions)
+                self.saved += 1
+                self.changed = True
+                expression = previous
+
+        if_expressions = expression.if_expressions
+        else_expressions = expression.else_expressions
+        hoisted: list[Expression] = []
+        while (
+            if_expressions
+            and else_expressions
+            and isinstance(if_expressions[0], BinaryExpression)
+            and _same_action(if_expressions[0], else_expressions[0])
+        ):
+            if reads is None:
+                reads = _condition_reads(expression)
+            if _may_change(if_expressions[:1], reads):
+                break
+            hoisted.append(if_expressions.pop(0))
+            else_expressions.pop(0)
+        after: list[Expression] = []
+        while (
+            if_expressions
+            and else_expressions
+            and _same_action(if_expressions[-1], else_expressions[-1])
+        ):
+            after.append(if_expressions.pop())
+            else_expressions.pop()
+        after.reverse()
+        if hoisted or after:
+            # Only one of the copies is left
+            self.saved += count_actions(hoisted) + count_actions(after)
+            self.changed = True
+
+        if not if_expressions and else_expressions:
+            # `if not (a and b)` is `if (not a or not b)`
+            expression.conditions = [~condition for condition in expression.conditions]
+            if len(expression.conditions) > 1:
+                expression.mode = (
+                    ConditionalMode.ANY
+                    if expression.mode is ConditionalMode.ALL
+                    else ConditionalMode.ALL
+                )
+            expression.if_expressions = else_expressions
+            expression.else_expressions = if_expressions
+            self.changed = True
+
+        result.extend(hoisted)
+        if expression.if_expressions:
+            result.append(expression)
+        else:
+            self.saved += 1
+            self.changed = True
+            self.removed = True
+        result.extend(after)
@@ -0,0 +1,547 @@
+import math
+from collections.abc import Callable, Generator
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import numpy as np
+
+from ..checkable import Checkable
+from ..execute import java_long
+from ..internal_type import InternalType
+from ..limits import count_actions
+from ..stats.player_stat import PlayerStat
+from ..stats.stat import Stat
+from ..stats.temporary_stat import Number, TemporaryStat
+from .binary_expression import BinaryExpression, BinaryOperator
+from .compound_expression import CompoundExpression
+from .condition.comparison_condition import ComparisonCondition, ComparisonOperator
+from .condition.conditional_expression import ConditionalExpression, ConditionalMode
+from .stat_usage import StatKey
+
+if TYPE_CHECKING:
+    from .condition.condition import Condition
+    from .expression import Expression
+
+
+__all__ = (
+    'ConstantPropagation',
+    'remove_unread_temporary_stats',
+)
+
+
+type Constant = int | float
+
+
+# The types of the stats whose value is tracked
+TRACKED_TYPES: tuple[InternalType, ...] = (InternalType.LONG, InternalType.DOUBLE)
+
+_LONG_OPERATIONS: dict[BinaryOperator, Callable[[int, int], java_long.JavaLong]] = {
+    BinaryOperator.Increment: java_long.add,
+    BinaryOperator.Decrement: java_long.sub,
+    BinaryOperator.Multiply: java_long.mul,
+    BinaryOperator.BitwiseAnd: java_long.bit_and,
+    BinaryOperator.BitwiseOr: java_long.bit_or,
+    BinaryOperator.BitwiseXor: java_long.bit_xor,
+    BinaryOperator.LeftShift: java_long.shl,
+    BinaryOperator.RightShift: java_long.shr,
+    BinaryOperator.LogicalRightShift: java_long.ushr,
+}
+
+_COMPARISONS: dict[ComparisonOperator, Callable[[Constant, Constant], bool]] = {
+    ComparisonOperator.Equal: lambda left, right: left == right,
+    ComparisonOperator.GreaterThan: lambda left, right: left > right,
+    ComparisonOperator.LessThan: lambda left, right: left < right,
+    ComparisonOperator.GreaterThanOrEqual: lambda left, right: left >= right,
+    ComparisonOperator.LessThanOrEqual: lambda left, right: left <= right,
+}
+
+# `a OP b` holds exactly when `b MIRRORED a` does
+_MIRRORED: dict[ComparisonOperator, ComparisonOperator] = {
+    ComparisonOperator.Equal: ComparisonOperator.Equal,
+    ComparisonOperator.GreaterThan: ComparisonOperator.LessThan,
+    ComparisonOperator.LessThan: ComparisonOperator.GreaterThan,
+    ComparisonOperator.GreaterThanOrEqual: ComparisonOperator.LessThanOrEqual,
+    ComparisonOperator.LessThanOrEqual: ComparisonOperator.GreaterThanOrEqual,
+}
+
+
+def _is_constant(value: object) -> bool:
+    return isinstance(value, int | float) and not isinstance(value, bool)
+
+
+def _is_tracked(stat: object) -> bool:
+    """Player stats and temps only change when the player runs an action, global
+    and team stats can be written by anyone at any time."""
+    return (
+        isinstance(stat, PlayerStat | TemporaryStat)
+        and stat.internal_type in TRACKED_TYPES
+    )
+
+
+def _fold(
+    operator: BinaryOperator,
+    left: Constant,
+    right: Constant,
+    internal_type: InternalType,
+) -> Constant | None:
+    """`left OP right` computed like the executor does, or None when the result
+    could differ from what the action would store."""
+    if internal_type is InternalType.LONG:
+        if not isinstance(left, int) or not isinstance(right, int):
+            return None
+        if operator is BinaryOperator.Set:
+            return right
+        if operator is BinaryOperator.Divide:
+            # Dividing by zero leaves the stat as it was
+            return left if right == 0 else int(java_long.div(left, right))
+        return int(_LONG_OPERATIONS[operator](left, right))
+
+    if internal_type is not InternalType.DOUBLE:
+        return None
+    a, b = np.float64(left), np.float64(right)
+    with np.errstate(all='ignore'):
+        if operator is BinaryOperator.Set:
+            result = b
+        elif operator is BinaryOperator.Increment:
+            result = a + b
+        elif operator is BinaryOperator.Decrement:
+            result = a - b
+        elif operator is BinaryOperator.Multiply:
+            result = a * b
+        elif operator is BinaryOperator.Divide:
+            result = a if b == 0 else a / b
+        else:
+            return None
+    value = float(result)
+    return value if math.isfinite(value) else None
+
+
+def _written_temporary(expression: 'Expression') -> Number | None:
+    """The finalized temp a single assignment writes, the only thing it does."""
+    if (
+        isinstance(expression, BinaryExpression)
+        and isinstance(expression.left, TemporaryStat)
+        and expression.left._number.finalized
+        and not isinstance(expression.right, BinaryExpression | CompoundExpression)
+    ):
+        return expression.left._number
+    return None
+
+
+def _temporary_reads(
+    expression: 'Expression',
+    written: Number | None,
+) -> Generator[Number | str, None, None]:
+    """The temps `expression` reads, by number, and by name for the ones in
+    placeholders."""
+    for stat in expression.iter_stats_used():
+        if isinstance(stat, TemporaryStat) and stat._number is not written:
+            yield stat._number
+    written_name = (
+        None if written is None else f'{TemporaryStat.name_prefix}{written.value}'
+    )
+    for _, value in expression.iter_field_values(expression.string_fields):
+        if not isinstance(value, str) or '%' not in value:
+            continue
+        for ref in Checkable.iter_in_string(value):
+            if (
+                isinstance(ref, Stat)
+                and TemporaryStat.extract_number_from_name(ref.name) is not None
+                and ref.name != written_name
+            ):
+                yield ref.name
+
+
+class _Known(NamedTuple):
+    value: Constant
+    internal_type: InternalType
+    # An auto unset stat set to zero is unset, and reads as its fallback value
+    is_set: bool
+
+
+class _Writer(NamedTuple):
+    expressions: list['Expression']
+    expression: 'Expression'
+    reads: list[Number | str]
+
+
+type State = dict[StatKey, _Known]
+
+
+def _scan_temporary_stats(
+    expressions: list['Expression'],
+    writers: dict[Number, list[_Writer]],
+    reads: dict[Number | str, int],
+) -> None:
+    for expression in expressions:
+        if isinstance(expression, ConditionalExpression):
+            for read in _temporary_reads(expression, None):
+                reads[read] = reads.get(read, 0) + 1
+            for body in expression.nested_expressions_refs():
+                _scan_temporary_stats(body, writers, reads)
+            continue
+        written = _written_temporary(expression)
+        found = [
+            read
+            for part in expression.walk_expressions()
+            for read in _temporary_reads(part, written)
+        ]
+        for read in found:
+            reads[read] = reads.get(read, 0) + 1
+        if written is not None:
+            writers.setdefault(written, []).append(
+                _Writer(expressions, expression, found)
+            )
+
+
+def remove_unread_temporary_stats(
+    expressions: list['Expression'],
+) -> tuple[int, list[list['Expression']]]:
+    """Removes the writes to finalized temps nothing in the block, nested blocks
+    included, reads, which in turn can leave the temps they read unread.
+
+    Returns the amount of actions saved and the statement lists that changed.
+    """
+    writers: dict[Number, list[_Writer]] = {}
+    reads: dict[Number | str, int] = {}
+    _scan_temporary_stats(expressions, writers, reads)
+    by_name = {
+        f'{TemporaryStat.name_prefix}{number.value}': number for number in writers
+    }
+
+    def is_unread(number: Number) -> bool:
+        name = f'{TemporaryStat.name_prefix}{number.value}'
+        return reads.get(number, 0) + reads.get(name, 0) == 0
+
+    saved = 0
+    unread = [number for number in writers if is_unread(number)]
+    removed: dict[int, tuple[list[Expression], set[int]]] = {}
+    while unread:
+        for writer in writers.pop(unread.pop(), ()):
+            saved += count_actions([writer.expression])
+            removed.setdefault(id(writer.expressions), (writer.expressions, set()))[
+                1
+            ].add(id(writer.expression))
+            for read in writer.reads:
+                reads[read] -= 1
+                number = by_name.get(read) if isinstance(read, str) else read
+                if number in writers and is_unread(number):
+                    unread.append(number)
+
+    for statements, ids in removed.values():
+        statements[:] = [expr for expr in statements if id(expr) not in ids]
+    return saved, [statements for statements, _ in removed.values()]
+
+
+class ConstantPropagation:
+    """Sparse conditional constant propagation over a whole block, nested
+    blocks included.
+
+    Going through the block in order, every player stat and temp assigned a
+    constant is known to hold it until something else may write it. Reads of
+    known stats are replaced by their value, operations on constants are
+    folded, and a stat assigned a value that is known in the end is assigned
+    that value directly. Conditions that always hold or never do are dropped,
+    along with the branch that never runs. Both branches start from what is
+    known before the condition, plus what an `==` condition tells when it
+    holds, and only what both agree on is known after it.
+
+    Everything is forgotten at execution barriers, since a triggered function
+    or whatever runs during a pause can write any stat. Global and team stats
+    and placeholders are never known, anyone can change them at any time.
+
+    Temps are never rewritten, as their value is only needed where they are
+    read. The ones nothing reads anymore once their value was used instead,
+    like the operands of a decided condition, are removed in the end.
+    """
+
+    expressions: list['Expression']
+    saved: int
+    changed: bool
+    # The statement lists that changed, by id
+    rewritten: dict[int, list['Expression']]
+
+    def __init__(self, expressions: list['Expression']) -> None:
+        self.expressions = expressions
+        self.saved = 0
+        self.changed = False
+        self.rewritten = {}
+
+    def run(self) -> int:
+        """Rewrites the block in place, returning the amount of actions saved."""
+        self._propagate(self.expressions, {})
+        if self.changed:
+            saved, rewritten = remove_unread_temporary_stats(self.expressions)
+            self.saved += saved
+            for expressions in rewritten:
+                self.rewritten[id(expressions)] = expressions
+        for expressions in self.rewritten.values():
+            self._take_out_useless_expressions(expressions)
+        return self.saved
+
+    def _rewrote(self, expressions: list['Expression']) -> None:
+        self.changed = True
+        self.rewritten[id(expressions)] = expressions
+
+    def _take_out_useless_expressions(self, expressions: list['Expression']) -> None:
+        """Stores of constants can leave earlier stores dead or foldable."""
+        before = list(expressions)
+        BinaryExpression.take_out_useless_expressions(expressions)
+        old = {id(expr) for expr in before}
+        kept = {id(expr) for expr in expressions}
+        self.saved += count_actions(
+            [expr for expr in before if id(expr) not in kept]
+        ) - count_actions([expr for expr in expressions if id(expr) not in old])
+
+    # --- values --------------------------------------------------------------
+
+    def _known(self, stat: object, state: State) -> Constant | None:
+        if not _is_tracked(stat):
+            return None
+        assert isinstance(stat, Stat)
+        known = state.get(stat.stat_key())
+        if known is None or known.internal_type is not stat.internal_type:
+            return None
+        if not known.is_set and stat.fallback_value is not None:
+            return None
+        return known.value
+
+    def _substitute(self, value: object, state: State) -> object:
+        """`value` with the stats known to hold a constant replaced by it, and
+        the operations on constants folded."""
+        if isinstance(value, Stat):
+            known = self._known(value, state)
+            return value if known is None else known
+        if not isinstance(value, BinaryExpression):
+            return value
+        result_type = BinaryExpression._operand_result_type(value.left, value.right)
+        if result_type is not value.internal_type:
+            # Cast to another type than its operands, see `flatten`
+            return value
+        left = self._substitute(value.left, state)
+        right = self._substitute(value.right, state)
+        if left is value.left and right is value.right:
+            return value
+        if _is_constant(left) and _is_constant(right):
+            assert isinstance(left, int | float) and isinstance(right, int | float)
+            folded = _fold(value.operator, left, right, result_type)
+            if folded is not None:
+                return folded
+        if BinaryExpression._operand_result_type(left, right) is not result_type:
+            return value
+        return BinaryExpression(left=left, right=right, operator=value.operator)
+
+    @staticmethod
+    def _forget(keys: frozenset[StatKey], state: State) -> None:
+        for key in keys:
+            state.pop(key, None)
+
+    # --- statements ----------------------------------------------------------
+
+    def _propagate(self, expressions: list['Expression'], state: State) -> None:
+        index = 0
+        while index < len(expressions):
+            expression = expressions[index]
+            if isinstance(expression, ConditionalExpression):
+                taken = self._conditional(expression, state)
+                if taken is not None:
+                    # The branch that always runs goes in its place, and is
+                    # propagated through next
+                    expressions[index : index + 1] = taken
+                    self._rewrote(expressions)
+                    continue
+            elif isinstance(expression, BinaryExpression):
+                rewritten = self._assignment(expression, state)
+                if rewritten is not expression:
+                    self.saved += count_actions([expression]) - count_actions(
+                        [rewritten]
+                    )
+                    expressions[index] = rewritten
+                    self._rewrote(expressions)
+            elif BinaryExpression._is_execution_barrier(expression):
+                state.clear()
+            else:
+                self._forget(expression.stat_usage().writes, state)
+            index += 1
+
+    def _assignment(
+        self,
+        expression: 'BinaryExpression[Any, Any]',
+        state: State,
+    ) -> 'Expression':
+        left = expression.left
+        right = expression.right
+        if (
+            expression.is_intentional_self_assignment
+            or isinstance(right, CompoundExpression)
+            or (
+                isinstance(right, BinaryExpression)
+                and any(
+                    isinstance(part, CompoundExpression)
+                    for part in right.walk_expressions()
+                )
+            )
+        ):
+            if BinaryExpression._is_execution_barrier(expression):
+                state.clear()
+            else:
+                self._forget(expression.stat_usage().writes, state)
+            return expression
+
+        operator = expression.operator
+        right = self._substitute(right, state)
+        if _is_constant(right) and InternalType.from_value(right) is not (
+            left.internal_type
+        ):
+            # Casting a constant is left to the action
+            right = expression.right
+
+        value: Constant | None = None
+        if _is_tracked(left) and _is_constant(right):
+            assert isinstance(right, int | float)
+            if operator is BinaryOperator.Set:
+                value = right
+            elif (current := self._known(left, state)) is not None:
+                value = _fold(operator, current, right, left.internal_type)
+
+        if isinstance(left, Stat):
+            state.pop(left.stat_key(), None)
+            if value is not None:
+                state[left.stat_key()] = _Known(
+                    value,
+                    left.internal_type,
+                    is_set=not (left.auto_unset and value == 0),
+                )
+            if isinstance(left, TemporaryStat):
+                # Replaced where read instead, see `remove_unread_temporary_stats`
+                return expression
+
+        if value is not None:
+            operator, right = BinaryOperator.Set, value
+        if operator is expression.operator and right is expression.right:
+            return expression
+        return BinaryExpression(left=left, right=right, operator=operator)
+
+    # --- conditions ----------------------------------------------------------
+
+    def _operand(self, value: object, state: State) -> Constant | None:
+        if isinstance(value, int | float) and _is_constant(value):
+            return value
+        return self._known(value, state)
+
+    def _substitute_condition(
+        self,
+        condition: 'Condition',
+        state: State,
+    ) -> 'Condition':
+        if not isinstance(condition, ComparisonCondition):
+            return condition
+        left, right, operator = condition.left, condition.right, condition.operator
+        if isinstance(right, Stat):
+            known = self._known(right, state)
+            if known is not None and InternalType.from_value(known) is (
+                left.internal_type
+            ):
+                right = known
+            elif (
+                isinstance(left, Stat)
+                and (known := self._known(left, state)) is not None
+                and right.internal_type is left.internal_type
+            ):
+                # Only stats go on the left, so the condition is turned around
+                left, right, operator = right, known, _MIRRORED[operator]
+        if right is condition.right:
+            return condition
+        substituted = ComparisonCondition(left=left, right=right, operator=operator)
+        substituted.inverted = condition.inverted
+        return substituted
+
+    def _evaluate(self, condition: 'Condition', state: State) -> bool | None:
+        """Whether `condition` holds, or None when it is not known."""
+        if not isinstance(condition, ComparisonCondition):
+            return None
+        left = self._operand(condition.left, state)
+        right = self._operand(condition.right, state)
+        if (
+            left is None
+            or right is None
+            or InternalType.from_value(left) is not InternalType.from_value(right)
+        ):
+            return None
+        return _COMPARISONS[condition.operator](left, right) != condition.inverted
+
+    @staticmethod
+    def _learn(condition: 'Condition', holds: bool, state: State) -> None:
+        """What `condition` holding, or not, tells about a stat."""
+        if not (
+            isinstance(condition, ComparisonCondition)
+            and condition.operator is ComparisonOperator.Equal
+            and holds != condition.inverted
+        ):
+            return
+        left, right = condition.left, condition.right
+        if (
+            _is_tracked(left)
+            and isinstance(left, Stat)
+            and left.fallback_value is None
+            and _is_constant(right)
+            and InternalType.from_value(right) is left.internal_type
+        ):
+            assert isinstance(right, int | float)
+            state[left.stat_key()] = _Known(
+                right, left.internal_type, is_set=right != 0
+            )
+
+    def _conditional(
+        self,
+        expression: ConditionalExpression,
+        state: State,
+    ) -> list['Expression'] | None:
+        """Propagates through both branches, or returns the one that always
+        runs."""
+        conditions = [
+            self._substitute_condition(condition, state)
+            for condition in expression.conditions
+        ]
+        outcomes = [self._evaluate(condition, state) for condition in conditions]
+        is_all = expression.mode is ConditionalMode.ALL
+        holds: bool | None = None
+        if (not is_all) in outcomes:
+            holds = not is_all
+        elif conditions and None not in outcomes:
+            holds = is_all
+        if holds is not None:
+            taken = expression.if_expressions if holds else expression.else_expressions
+            self.saved += count_actions([expression]) - count_actions(taken)
+            return list(taken)
+
+        # The conditions that are known to not change the outcome go
+        kept = [
+            condition
+            for condition, outcome in zip(conditions, outcomes, strict=True)
+            if outcome is None
+        ]
+        if len(kept) != len(expression.conditions) or any(
+            condition is not original
+            for condition, original in zip(kept, expression.conditions, strict=True)
+        ):
+            expression.conditions = kept
+            self.changed = True
+
+        if_state = dict(state)
+        else_state = dict(state)
+        if is_all or len(kept) == 1:
+            for condition in kept:
+                self._learn(condition, True, if_state)
+        if not is_all or len(kept) == 1:
+            for condition in kept:
+                self._learn(condition, False, else_state)
+        self._propagate(expression.if_expressions, if_state)
+        self._propagate(expression.else_expressions, else_state)
+
+        state.clear()
+        state.update(
+            (key, known)
+            for key, known in if_state.items()
+            if else_state.get(key) == known
+        )
+        return None
@@ -0,0 +1,94 @@
+from collections.abc import Callable
+from typing import TYPE_CHECKING, final
+
+from ..stats.temporary_stat import TemporaryStat
+
+if TYPE_CHECKING:
+    from ..limits import ActionCounts
+    from .expression import Expression
+
+
+__all__ = ('ExecutableForm',)
+
+
+type FormKey = tuple[object, ...]
+
+
+@final
+class ExecutableForm:
+    """The flattened, optimized and renamed expressions an expression executes
+    as. Rendering, execution and action limit counting all share it instead of
+    flattening the same expression again.
+
+    It stays valid as long as the key matches: the version of every expression
+    nested in it or flattened from it, which changes on every field assignment,
+    and the number of every temporary stat used, which renaming changes in place.
+    Temporary numbers live across the expression that none of its own temporary
+    stats were renamed to keep it valid as well.
+    """
+
+    expressions: list['Expression']
+    key: FormKey
+    # The temporary numbers live across the expression it was renamed around
+    live: frozenset[int]
+    action_counts: 'ActionCounts | None'
+
+    def __init__(
+        self,
+        expressions: list['Expression'],
+        key: FormKey,
+        live: frozenset[int] = frozenset(),
+    ) -> None:
+        self.expressions = expressions
+        self.key = key
+        self.live = live
+        self.action_counts = None
+
+    @staticmethod
+    def key_of(
+        expression: 'Expression',
+        expressions: list['Expression'],
+    ) -> FormKey:
+        key: list[object] = []
+        for root in (expression, *expressions):
+            for expr in root.walk_expressions():
+                key.append(expr.version or type(expr))
+                for stat in expr.iter_stats_used():
+                    if isinstance(stat, TemporaryStat):
+                        number = stat._number
+                        key.extend((number, number.value, number.finalized))
+        return tuple(key)
+
+    @staticmethod
+    def compute(
+        expression: 'Expression',
+        flatten: Callable[[], list['Expression']],
+    ) -> 'ExecutableForm':
+        expressions = flatten()
+        # Keyed after flattening: renaming the temporary stats of the flattened
+        # expressions can renumber temporary stats shared with `expression`
+        key = ExecutableForm.key_of(expression, expressions)
+        return ExecutableForm(expressions, key, expression.live_temporary_numbers)
+
+    def renamed_numbers(self) -> set[int]:
+        return {
+            stat.number
+            for root in self.expressions
+            for expr in root.walk_expressions()
+            for stat in expr.iter_stats_used()
+            if isinstance(stat, TemporaryStat) and not stat._number.finalized
+        }
+
+    def is_current(self, expression: 'Expression') -> bool:
+        live = expression.live_temporary_numbers
+        if live != self.live:
+            # Renaming skips live numbers from the lowest up, so nothing would
+            # be renamed differently when every number live before still is
+            # and none of the renamed ones is
+            if not self.live <= live or not live.isdisjoint(self.renamed_numbers()):
+                return False
+            self.live = live
+        return self.key == ExecutableForm.key_of(expression, self.expressions)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}<{len(self.expressions)} expressions>'
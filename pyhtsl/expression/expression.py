@@ -1,29 +1,114 @@
 from abc import abstractmethod
 from collections.abc import Callable, Generator
-from typing import TYPE_CHECKING, Any, final
+from itertools import count
+from typing import TYPE_CHECKING, Any, ClassVar, Self, final
 
 from ..base_object import BaseObject
 from ..container import Container, get_current_container
+from ..utils.fields import field_values, has_undeclared_fields, slot_fields
 from ..utils.log import log
 
 if TYPE_CHECKING:
     from ..execute.context import ExecutionContext
     from ..stats.stat import Stat
+    from ..writer import HtslWriter
+    from .executable_form import ExecutableForm
+    from .stat_usage import StatUsage
 
 
 __all__ = ('Expression',)
 
 
+# Stamped onto an expression whenever one of its fields is assigned
+_VERSIONS = count(1)
+
+
 class Expression(BaseObject):
+    __slots__ = (
+        '_stat_usage',
+        '_version',
+        '_executable_form',
+        '_live_temporary_numbers',
+        '_in_block',
+        '__weakref__',
+    )
+
+    # Declared next to `__slots__` by every expression: the fields that can
+    # hold a stat or another checkable, the fields that can hold text with
+    # placeholders in it, and the fields holding the bodies of nested blocks.
+    # Traversals only read these instead of every attribute of every expression.
+    stat_fields: ClassVar[tuple[str, ...]] = ()
+    string_fields: ClassVar[tuple[str, ...]] = ()
+    expression_list_fields: ClassVar[tuple[str, ...]] = ()
+
+    fields: ClassVar[tuple[str, ...]] = ()
+    stat_and_string_fields: ClassVar[tuple[str, ...]] = ()
+    has_undeclared_fields: ClassVar[bool] = False
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.fields = tuple(
+            name for name in slot_fields(cls) if name not in Expression.__slots__
+        )
+        cls.stat_and_string_fields = tuple(
+            name
+            for name in cls.fields
+            if name in cls.stat_fields or name in cls.string_fields
+        )
+        cls.has_undeclared_fields = has_undeclared_fields(cls)
+
     def into_executable_expressions(self) -> Generator['Expression', None, None]:
         yield self
 
+    def executable_form(
+        self,
+        flatten: Callable[[], list['Expression']],
+    ) -> 'ExecutableForm':
+        """The cached result of `flatten`, computed again once this expression,
+        an expression nested in it or one of its temporary stats changed."""
+        from .executable_form import ExecutableForm
+
+        form: ExecutableForm | None = getattr(self, '_executable_form', None)
+        if form is None or not form.is_current(self):
+            form = ExecutableForm.compute(self, flatten)
+            object.__setattr__(self, '_executable_form', form)
+        return form
+
+    @property
+    def version(self) -> int:
+        return getattr(self, '_version', 0)
+
+    @property
+    def live_temporary_numbers(self) -> frozenset[int]:
+        """Numbers of the temporary stats of the block live across this
+        expression, which the temporary stats it flattens into are not renamed
+        to."""
+        return getattr(self, '_live_temporary_numbers', frozenset())
+
+    def set_live_temporary_numbers(self, numbers: frozenset[int]) -> None:
+        # Part of the key of the executable form, so no new version is needed
+        object.__setattr__(self, '_live_temporary_numbers', numbers)
+
     @abstractmethod
     def into_htsl(self) -> str:
         raise NotImplementedError()
 
+    def render(self, writer: 'HtslWriter', indent: int) -> None:
+        writer.write_lines(self.into_htsl(), indent)
+
     def write(self) -> None:
-        get_current_container().write_expression(self.cloned())
+        get_current_container().write_expression(self.into_block_expression())
+
+    def into_block_expression(self) -> Self:
+        """This expression, or a copy of it when it was written before.
+
+        Passes change the expressions of a block in place, so one expression
+        can only be in one place. Operands are shared between expressions
+        instead, and whatever changes one copies it first.
+        """
+        expression = self.cloned() if getattr(self, '_in_block', False) else self
+        object.__setattr__(expression, '_in_block', True)
+        return expression
 
     def raw_execute(self, context: 'ExecutionContext') -> None:
         log(
@@ -39,58 +124,123 @@ class Expression(BaseObject):
         self.raw_execute(context)
 
     def _get_all_values(self) -> dict[str, Any]:
-        return vars(self)
+        values = field_values(self)
+        for name in Expression.__slots__:
+            values.pop(name, None)
+        return values
+
+    def iter_field_values(
+        self,
+        names: tuple[str, ...],
+    ) -> Generator[tuple[str, Any], None, None]:
+        """The fields in `names` that are set, plus every undeclared field for
+        expressions that are not fully slotted."""
+        for name in names:
+            try:
+                yield name, getattr(self, name)
+            except AttributeError:
+                continue
+        if self.has_undeclared_fields:
+            yield from list(vars(self).items())
 
     def get_all_stats_used(
         self,
     ) -> Generator[tuple['Stat', Callable[['Stat'], None]], None, None]:
         from ..stats.stat import Stat
 
-        for key, value in self._get_all_values().items():
+        for key, value in self.iter_field_values(self.stat_fields):
             if isinstance(value, Stat):
                 yield (value, lambda new, _key=key: setattr(self, _key, new))
 
-    def is_using_stat(self, stat: 'Stat') -> bool:
-        from ..checkable import Checkable
+    def iter_stats_used(self) -> Generator['Stat', None, None]:
+        """The stats of `get_all_stats_used`, without building their setters."""
         from ..stats.stat import Stat
-        from ..stats.temporary_stat import TemporaryStat
 
-        string_stat: Stat = (
-            stat.into_player_stat() if isinstance(stat, TemporaryStat) else stat
-        )
+        for _, value in self.iter_field_values(self.stat_fields):
+            if isinstance(value, Stat):
+                yield value
+
+    def get_stat_accesses(
+        self,
+    ) -> Generator[tuple['Stat', bool, bool], None, None]:
+        """Every stat in `get_all_stats_used` as `(stat, is_read, is_written)`.
+        Without knowing what the action does with it, a stat is both."""
+        for stat in self.iter_stats_used():
+            yield (stat, True, True)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name not in Expression.__slots__:
+            object.__setattr__(self, '_stat_usage', None)
+            object.__setattr__(self, '_version', next(_VERSIONS))
 
-        for expr in self.walk_expressions():
-            for s, _ in expr.get_all_stats_used():
-                if s.is_same_stat(stat):
-                    return True
-            # Stats can also be referenced by their placeholders inside string fields, kind of hacky but whatever
-            for value in expr._get_all_values().values():
-                if not isinstance(value, str):
-                    continue
-                for ref in Checkable.iter_in_string(value):
-                    if isinstance(ref, Stat) and ref.is_same_stat(string_stat):
-                        return True
-        return False
+    def invalidate_stat_usage(self) -> None:
+        """Clears the cached `stat_usage` and `executable_form`. Only needed
+        after changing a stat without assigning to a field of this expression,
+        like mutating a condition in place."""
+        object.__setattr__(self, '_stat_usage', None)
+        object.__setattr__(self, '_version', next(_VERSIONS))
+
+    def own_stat_usage(self) -> 'StatUsage':
+        """Cached usage of the fields of this expression, not of nested ones."""
+        from .stat_usage import StatUsage
+
+        usage: StatUsage | None = getattr(self, '_stat_usage', None)
+        if usage is None or not usage.is_current():
+            usage = StatUsage.collect(self)
+            self._stat_usage = usage
+        return usage
+
+    def stat_usage(self) -> 'StatUsage':
+        """The stats this expression and everything nested in it read and write."""
+        from .stat_usage import StatUsage
+
+        usages = [expr.own_stat_usage() for expr in self.walk_expressions()]
+        if len(usages) == 1:
+            return usages[0]
+        return StatUsage.union(usages)
+
+    def is_using_stat(self, stat: 'Stat') -> bool:
+        return any(
+            expr.own_stat_usage().is_using(stat) for expr in self.walk_expressions()
+        )
 
     def is_using_stats_together(
         self,
         stat1: 'Stat',
         stat2: 'Stat',
     ) -> bool:
-        return self.is_using_stat(stat1) and self.is_using_stat(stat2)
+        usage = self.stat_usage()
+        return usage.is_using(stat1) and usage.is_using(stat2)
 
     def change_all_occurrences_of_stat(
         self,
         old_stat: 'Stat',
         new_stat: 'Stat',
     ) -> bool:
+        has_changed = self.change_own_occurrences_of_stat(old_stat, new_stat)
+        for expressions in self.nested_expressions_refs():
+            for expr in expressions:
+                if expr.change_all_occurrences_of_stat(old_stat, new_stat):
+                    has_changed = True
+        return has_changed
+
+    def change_own_occurrences_of_stat(
+        self,
+        old_stat: 'Stat',
+        new_stat: 'Stat',
+    ) -> bool:
+        """Like `change_all_occurrences_of_stat`, for the fields of this
+        expression only."""
+        if old_stat.stat_key() not in self.own_stat_usage().stats:
+            return False
         has_changed: bool = False
-        for expr in self.walk_expressions():
-            for value, setter in expr.get_all_stats_used():
-                if not value.is_same_stat(old_stat):
-                    continue
-                setter(new_stat)
-                has_changed = True
+        for value, setter in self.get_all_stats_used():
+            if not value.is_same_stat(old_stat):
+                continue
+            setter(new_stat)
+            has_changed = True
+        self.invalidate_stat_usage()
         return has_changed
 
     def walk_expressions(self) -> Generator['Expression', None, None]:
@@ -100,7 +250,7 @@ class Expression(BaseObject):
         self.into_htsl()
 
     def nested_expressions_refs(self) -> list[list['Expression']]:
-        return []
+        return [getattr(self, name) for name in self.expression_list_fields]
 
     def can_be_nested(self) -> bool:
         return len(self.nested_expressions_refs()) == 0
@@ -0,0 +1,468 @@
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Callable
+from typing import Any
+
+from ..checkable import Checkable
+from ..profiler import get_profiler
+from ..stats.stat import Stat
+from ..stats.temporary_stat import TemporaryStat
+from .binary_expression import BinaryExpression, BinaryOperator
+from .expression import Expression
+from .stat_usage import StatKey, placeholder_stat_key
+
+__all__ = ('BlockOptimizer',)
+
+
+_NONE = -1
+_EMPTY: list[int] = []
+
+
+def _rhs_references_stat(rhs: object, stat: Stat) -> bool:
+    if isinstance(rhs, Stat):
+        return rhs.is_same_stat(stat)
+    if isinstance(rhs, Expression):
+        return rhs.is_using_stat(stat)
+    if isinstance(rhs, str):
+        for ref in Checkable.iter_in_string(rhs):
+            if isinstance(ref, Stat) and ref.is_same_stat(stat):
+                return True
+    return False
+
+
+def _remove_sorted(values: list[int], value: int) -> None:
+    index = bisect_left(values, value)
+    if index < len(values) and values[index] == value:
+        del values[index]
+
+
+class BlockOptimizer:
+    """Peephole and temp-merge optimizer for one block of statements.
+
+    Every statement gets a stable ordinal. Passes only ever replace a
+    statement in place or delete it, so ordinals stay in program order and
+    "next use of `x` after this line" is a bisect into a sorted per-stat list
+    instead of a scan over the rest of the block. The index is updated as
+    statements are rewritten, so each pass is near-linear in the block size.
+
+    The passes, and the order in which they are tried, match the original
+    fixpoint in `BinaryExpression.optimize_binary_expressions`, so the result
+    is the same statement list.
+    """
+
+    expressions: list[Expression]
+    nodes: list[Expression | None]
+    next: list[int]
+    prev: list[int]
+    head: int
+
+    direct_uses: dict[StatKey, list[int]]
+    string_uses: dict[StatKey, list[int]]
+    node_direct: list[frozenset[StatKey]]
+    node_strings: list[frozenset[StatKey]]
+    barriers: list[int]
+
+    def __init__(self, expressions: list[Expression]) -> None:
+        self.expressions = expressions
+        self.nodes = list(expressions)
+        count = len(self.nodes)
+        self.next = [*range(1, count), _NONE] if count else []
+        self.prev = list(range(-1, count - 1))
+        self.head = 0 if count else _NONE
+
+        self.direct_uses = {}
+        self.string_uses = {}
+        self.node_direct = [frozenset()] * count
+        self.node_strings = [frozenset()] * count
+        self.barriers = []
+        for ordinal, expression in enumerate(self.nodes):
+            assert expression is not None
+            self._index(ordinal, expression)
+
+    # --- index maintenance ---------------------------------------------------
+
+    def _index(self, ordinal: int, expression: Expression) -> None:
+        usage = expression.stat_usage()
+        direct, strings = usage.stats, usage.placeholders
+        self.node_direct[ordinal] = direct
+        self.node_strings[ordinal] = strings
+        for key in direct:
+            insort(self.direct_uses.setdefault(key, []), ordinal)
+        for key in strings:
+            insort(self.string_uses.setdefault(key, []), ordinal)
+        if BinaryExpression._is_execution_barrier(expression):
+            insort(self.barriers, ordinal)
+
+    def _unindex(self, ordinal: int) -> None:
+        for key in self.node_direct[ordinal]:
+            _remove_sorted(self.direct_uses[key], ordinal)
+        for key in self.node_strings[ordinal]:
+            _remove_sorted(self.string_uses[key], ordinal)
+        _remove_sorted(self.barriers, ordinal)
+
+    def _reindex(self, ordinal: int) -> None:
+        expression = self.nodes[ordinal]
+        assert expression is not None
+        self._unindex(ordinal)
+        self._index(ordinal, expression)
+
+    def _replace(self, ordinal: int, expression: Expression) -> None:
+        self._unindex(ordinal)
+        self.nodes[ordinal] = expression
+        self._index(ordinal, expression)
+
+    def _delete(self, ordinal: int) -> None:
+        self._unindex(ordinal)
+        self.nodes[ordinal] = None
+        before, after = self.prev[ordinal], self.next[ordinal]
+        if before == _NONE:
+            self.head = after
+        else:
+            self.next[before] = after
+        if after != _NONE:
+            self.prev[after] = before
+
+    def _node(self, ordinal: int) -> Expression:
+        expression = self.nodes[ordinal]
+        assert expression is not None
+        return expression
+
+    def write_back(self) -> None:
+        self.expressions[:] = [expr for expr in self.nodes if expr is not None]
+
+    # --- queries -------------------------------------------------------------
+
+    def _use_lists(self, stat: Stat) -> tuple[list[int], list[int]]:
+        return (
+            self.direct_uses.get(stat.stat_key(), _EMPTY),
+            self.string_uses.get(placeholder_stat_key(stat), _EMPTY),
+        )
+
+    def _uses(self, ordinal: int, stat: Stat) -> bool:
+        return (
+            stat.stat_key() in self.node_direct[ordinal]
+            or placeholder_stat_key(stat) in self.node_strings[ordinal]
+        )
+
+    def _next_use(self, stat: Stat, after: int) -> int:
+        best = _NONE
+        for uses in self._use_lists(stat):
+            index = bisect_right(uses, after)
+            if index < len(uses) and (best == _NONE or uses[index] < best):
+                best = uses[index]
+        return best
+
+    def _first_use(self, stat: Stat) -> int:
+        firsts = [uses[0] for uses in self._use_lists(stat) if uses]
+        return min(firsts) if firsts else _NONE
+
+    def _last_use(self, stat: Stat) -> int:
+        lasts = [uses[-1] for uses in self._use_lists(stat) if uses]
+        return max(lasts) if lasts else _NONE
+
+    def _uses_between(self, stat: Stat, low: int, high: int) -> list[int]:
+        """Uses of `stat` from `low` up to, not including, `high`."""
+        found: set[int] = set()
+        for uses in self._use_lists(stat):
+            found.update(uses[bisect_left(uses, low) : bisect_left(uses, high)])
+        return sorted(found)
+
+    def _next_barrier(self, after: int) -> int:
+        index = bisect_right(self.barriers, after)
+        return self.barriers[index] if index < len(self.barriers) else _NONE
+
+    def _has_barrier_between(self, low: int, high: int) -> bool:
+        barrier = self._next_barrier(low)
+        return barrier != _NONE and barrier < high
+
+    def _next_use_or_barrier(self, stat: Stat, after: int) -> int:
+        use = self._next_use(stat, after)
+        barrier = self._next_barrier(after)
+        if use == _NONE or (barrier != _NONE and barrier <= use):
+            return barrier
+        return use
+
+    # --- passes --------------------------------------------------------------
+
+    def optimize(self) -> None:
+        has_changed = True
+        while has_changed:
+            has_changed = self._run_pass(
+                'merge temporary stats', self._merge_temporary_stats
+            )
+            # Inside the loop: a peephole fold can expose a new temp-stat merge.
+            has_changed |= self.take_out_useless_expressions()
+        self.write_back()
+
+    def take_out_useless_expressions(self) -> bool:
+        """Run the peephole passes to a fixed point, returning whether anything changed."""
+        changed_any = False
+        has_changed = True
+        while has_changed:
+            has_changed = False
+            has_changed |= self._run_pass(
+                'remove no-ops', self._remove_no_op_expressions
+            )
+            has_changed |= self._run_pass(
+                'merge identity set', self._merge_identity_set_with_op
+            )
+            has_changed |= self._run_pass(
+                'fold constant ops', self._fold_consecutive_constant_ops
+            )
+            has_changed |= self._run_pass('dead stores', self._eliminate_dead_stores)
+            changed_any |= has_changed
+        return changed_any
+
+    @staticmethod
+    def _run_pass(name: str, run: Callable[[], bool]) -> bool:
+        profiler = get_profiler()
+        if profiler is None:
+            return run()
+        return profiler.time(name, run)
+
+    def _merge_temporary_stats(self) -> bool:
+        """`left = tmp` -> rename every earlier `tmp` to `left`.
+
+        Only when `left` is not used from the first use of `tmp` up to this line
+        (the exception being a first use `tmp = left`), `tmp` is not used after
+        it, and no execution barrier sits between the first use of `tmp` and
+        this line.
+        """
+        has_changed = False
+        ordinal = self.head
+        while ordinal != _NONE:
+            current = ordinal
+            ordinal = self.next[ordinal]
+
+            _expression = self._node(current)
+            if not isinstance(_expression, BinaryExpression):
+                continue
+            expression = _expression.into_assignment_expression()
+
+            left = expression.left
+            right = expression.right
+            if not isinstance(left, Stat):
+                continue
+            if not isinstance(right, TemporaryStat):
+                continue
+            if expression.operator is not BinaryOperator.Set:
+                continue
+            if left.is_same_stat(right):
+                continue
+
+            if self._last_use(right) > current:
+                continue
+
+            # `current` itself reads `right`, so there always is a first use.
+            # When that is all, `right` was written before this block of
+            # statements and there is nothing to rename.
+            first_use = self._first_use(right)
+            if first_use == current:
+                continue
+            if self._has_barrier_between(first_use, current):
+                continue
+
+            # Renamed, `left` already changes at the first use of `right`
+            if any(
+                j != first_use or not self._is_copy(j, right, left)
+                for j in self._uses_between(left, first_use, current)
+            ):
+                continue
+
+            for j in list(self.direct_uses.get(right.stat_key(), _EMPTY)):
+                if j > current:
+                    break
+                if self._node(j).change_all_occurrences_of_stat(right, left):
+                    self._reindex(j)
+                    has_changed = True
+
+        return has_changed
+
+    def _is_copy(self, ordinal: int, target: Stat, source: Stat) -> bool:
+        """Whether the statement at `ordinal` is `target = source`."""
+        expr = self._node(ordinal)
+        return (
+            isinstance(expr, BinaryExpression)
+            and expr.operator is BinaryOperator.Set
+            and target.is_same_stat(expr.left)
+            and source.is_same_stat(expr.right)
+        )
+
+    def _remove_no_op_expressions(self) -> bool:
+        has_changed = False
+        ordinal = self.head
+        while ordinal != _NONE:
+            current = ordinal
+            ordinal = self.next[ordinal]
+
+            _expression = self._node(current)
+            if not isinstance(_expression, BinaryExpression):
+                continue
+            expression = _expression.into_assignment_expression()
+
+            if BinaryExpression._is_no_op(expression):
+                self._delete(current)
+                has_changed = True
+
+        return has_changed
+
+    def _merge_identity_set_with_op(self) -> bool:
+        """`lhs = identity; lhs OP rhs` -> `lhs = rhs` (covers +, *, |, ^, &)."""
+        has_changed = False
+        ordinal = self.head
+        while ordinal != _NONE and self.next[ordinal] != _NONE:
+            expr_i = self._node(ordinal)
+            if not (
+                isinstance(expr_i, BinaryExpression)
+                and isinstance(expr_i.left, Stat)
+                and expr_i.operator is BinaryOperator.Set
+                and not expr_i.is_intentional_self_assignment
+            ):
+                ordinal = self.next[ordinal]
+                continue
+
+            lhs = expr_i.left
+            init_value = expr_i.right
+
+            # The first statement after `i` that either is a barrier or touches
+            # `lhs` decides: only a same-lhs identity op may be merged into.
+            j = self._next_use_or_barrier(lhs, ordinal)
+            merge_target: BinaryExpression[Any, Any] | None = None
+            if j != _NONE and not self._is_barrier(j):
+                expr_j = self._node(j)
+                if (
+                    isinstance(expr_j, BinaryExpression)
+                    and isinstance(expr_j.left, Stat)
+                    and expr_j.left.is_same_stat(lhs)
+                    and BinaryExpression._is_left_identity_for(
+                        expr_j.operator, init_value
+                    )
+                ):
+                    merge_target = expr_j
+
+            if merge_target is None:
+                ordinal = self.next[ordinal]
+                continue
+
+            rhs = merge_target.right
+            if isinstance(rhs, Stat):
+                if rhs.is_same_stat(lhs):
+                    ordinal = self.next[ordinal]
+                    continue
+                if self._is_written_between(rhs, ordinal, j):
+                    ordinal = self.next[ordinal]
+                    continue
+
+            self._replace(
+                ordinal,
+                BinaryExpression(
+                    left=lhs,
+                    right=rhs,
+                    operator=BinaryOperator.Set,
+                ),
+            )
+            self._delete(j)
+            has_changed = True
+            ordinal = self.next[ordinal]
+
+        return has_changed
+
+    def _is_written_between(self, stat: Stat, low: int, high: int) -> bool:
+        uses = self.direct_uses.get(stat.stat_key(), _EMPTY)
+        for k in uses[bisect_right(uses, low) : bisect_left(uses, high)]:
+            expr = self._node(k)
+            if (
+                isinstance(expr, BinaryExpression)
+                and isinstance(expr.left, Stat)
+                and expr.left.is_same_stat(stat)
+            ):
+                return True
+        return False
+
+    def _fold_consecutive_constant_ops(self) -> bool:
+        """`lhs OP1 c1; lhs OP2 c2` -> `lhs OP_combined c_combined` when adjacent."""
+        has_changed = False
+        ordinal = self.head
+        while ordinal != _NONE and self.next[ordinal] != _NONE:
+            following = self.next[ordinal]
+            expr_a = self._node(ordinal)
+            expr_b = self._node(following)
+            if not (
+                isinstance(expr_a, BinaryExpression)
+                and isinstance(expr_b, BinaryExpression)
+                and isinstance(expr_a.left, Stat)
+                and isinstance(expr_b.left, Stat)
+                and expr_a.left.is_same_stat(expr_b.left)
+                and isinstance(expr_a.right, int | float)
+                and isinstance(expr_b.right, int | float)
+            ):
+                ordinal = following
+                continue
+
+            combined = BinaryExpression._combine_constant_ops(
+                expr_a.operator,
+                expr_a.right,
+                expr_b.operator,
+                expr_b.right,
+                expr_a.left.internal_type,
+            )
+            if combined is None:
+                ordinal = following
+                continue
+
+            new_op, new_val = combined
+            self._replace(
+                ordinal,
+                BinaryExpression(
+                    left=expr_a.left,
+                    right=new_val,
+                    operator=new_op,
+                ),
+            )
+            self._delete(following)
+            has_changed = True
+            # Don't advance; the new expression may fold with the next one.
+
+        return has_changed
+
+    def _eliminate_dead_stores(self) -> bool:
+        """`lhs OP a; ... (lhs unread) ...; lhs = b` (b doesn't read lhs) -> drop first.
+
+        Any op that writes to lhs (Set, Increment, Multiply, ...) is dead if the
+        next expression that touches lhs is a full overwrite without reading it.
+        """
+        has_changed = False
+        ordinal = self.head
+        while ordinal != _NONE:
+            current = ordinal
+            ordinal = self.next[ordinal]
+
+            expr_i = self._node(current)
+            if not (
+                isinstance(expr_i, BinaryExpression)
+                and isinstance(expr_i.left, Stat)
+                and not expr_i.is_intentional_self_assignment
+            ):
+                continue
+
+            lhs = expr_i.left
+            j = self._next_use_or_barrier(lhs, current)
+            if j == _NONE or self._is_barrier(j):
+                continue
+
+            expr_j = self._node(j)
+            if (
+                isinstance(expr_j, BinaryExpression)
+                and isinstance(expr_j.left, Stat)
+                and expr_j.left.is_same_stat(lhs)
+                and expr_j.operator is BinaryOperator.Set
+                and not expr_j.is_intentional_self_assignment
+                and not _rhs_references_stat(expr_j.right, lhs)
+            ):
+                self._delete(current)
+                has_changed = True
+
+        return has_changed
+
+    def _is_barrier(self, ordinal: int) -> bool:
+        index = bisect_left(self.barriers, ordinal)
+        return index < len(self.barriers) and self.barriers[index] == ordinal
@@ -0,0 +1,328 @@
+import math
+from typing import TYPE_CHECKING, Any
+
+from ..stats.player_stat import PlayerStat
+from ..stats.stat import Stat
+from ..stats.temporary_stat import TemporaryStat
+from .binary_expression import BinaryExpression
+from .compound_expression import CompoundExpression
+from .condition.comparison_condition import ComparisonCondition, ComparisonOperator
+from .condition.conditional_expression import ConditionalExpression, ConditionalMode
+from .expression import Expression
+from .stat_usage import StatKey
+from .value_range import ValueRange, value_range_after, value_range_of
+
+if TYPE_CHECKING:
+    from ..internal_type import InternalType
+    from .condition.condition import Condition
+
+
+__all__ = ('ValueRangeAnalysis',)
+
+
+type State = dict[StatKey, ValueRange]
+
+
+# `not (a OP b)` is `a NEGATED b`
+_NEGATED: dict[ComparisonOperator, ComparisonOperator] = {
+    ComparisonOperator.GreaterThan: ComparisonOperator.LessThanOrEqual,
+    ComparisonOperator.LessThan: ComparisonOperator.GreaterThanOrEqual,
+    ComparisonOperator.GreaterThanOrEqual: ComparisonOperator.LessThan,
+    ComparisonOperator.LessThanOrEqual: ComparisonOperator.GreaterThan,
+}
+
+
+def _is_tracked(stat: object) -> bool:
+    """Player stats and temps only change when the player runs an action, global
+    and team stats can be written by anyone at any time. A stat with a fallback
+    value reads as it when unset, which setting it to zero may do."""
+    return (
+        isinstance(stat, PlayerStat | TemporaryStat)
+        and stat.fallback_value is None
+        and ValueRange.of_type(stat.internal_type) is not None
+    )
+
+
+def _has_sign_fix(expression: Expression) -> bool:
+    return any(
+        isinstance(part, CompoundExpression) and part.sign_fix_operand is not None
+        for part in expression.walk_expressions()
+    )
+
+
+def _bounds(
+    operator: ComparisonOperator,
+    value: float,
+    internal_type: 'InternalType',
+) -> tuple[float, float] | None:
+    """The values of a stat of `internal_type` for which `stat OP value`
+    holds, as the bounds of a range."""
+    from ..internal_type import InternalType
+
+    if operator is ComparisonOperator.Equal:
+        return value, value
+    if operator is ComparisonOperator.GreaterThanOrEqual:
+        return value, math.inf
+    if operator is ComparisonOperator.LessThanOrEqual:
+        return -math.inf, value
+    # A long is past a bound it is strictly beyond by at least one
+    is_long = internal_type is InternalType.LONG
+    if operator is ComparisonOperator.GreaterThan:
+        return (math.floor(value) + 1 if is_long else value), math.inf
+    if operator is ComparisonOperator.LessThan:
+        return -math.inf, (math.ceil(value) - 1 if is_long else value)
+    return None
+
+
+class ValueRangeAnalysis:
+    """Interval analysis over a whole block, nested blocks included, before it
+    is finalized.
+
+    `%` and `abs()` end in a conditional making their result positive, which
+    is not needed when their operand is known to not be negative, and keeps
+    them from being nested in another conditional block. The operand is
+    already left without it when it is built, if the ranges the stats it reads
+    are declared with tell enough, see `Stat.with_range`. This tells more,
+    going through the block in order: a player stat or temp assigned something
+    whose range is known holds a value from it until something else may write
+    it, and the conditions of a block narrow it down within its branches. After
+    a block, the range of a stat spans what each branch left in it.
+
+    Everything is forgotten at execution barriers, since a triggered function
+    or whatever runs during a pause can write any stat. Global and team stats
+    and placeholders are only known by their declared range, anyone can change
+    them at any time.
+    """
+
+    expressions: list[Expression]
+    saved: int
+
+    def __init__(self, expressions: list[Expression]) -> None:
+        self.expressions = expressions
+        self.saved = 0
+
+    def run(self) -> int:
+        """Rewrites the block in place, returning the amount of actions saved."""
+        if any(_has_sign_fix(expression) for expression in self.expressions):
+            self._analyze(self.expressions, {})
+        return self.saved
+
+    # --- values --------------------------------------------------------------
+
+    @staticmethod
+    def _range_of(value: object, state: State) -> ValueRange | None:
+        def known(stat: Stat) -> ValueRange | None:
+            if not _is_tracked(stat):
+                return None
+            return state.get(stat.stat_key())
+
+        return value_range_of(value, known)
+
+    def _narrow(self, value: Any, state: State) -> Any:
+        """`value` with the `%` and `abs()` on operands known to not be negative
+        left without the conditional making their result positive. What they
+        are built from may be shared, so it is copied instead of changed."""
+        if isinstance(value, CompoundExpression):
+            return self._narrow_compound(value, state)
+        if not isinstance(value, BinaryExpression):
+            return value
+        left = self._narrow(value.left, state)
+        right = self._narrow(value.right, state)
+        if left is value.left and right is value.right:
+            return value
+        # Cloned to keep the type it is cast to, see `flatten`
+        narrowed = value.cloned()
+        narrowed.left = left
+        narrowed.right = right
+        return narrowed
+
+    def _narrow_compound(
+        self,
+        value: CompoundExpression,
+        state: State,
+    ) -> CompoundExpression:
+        inner = dict(state)
+        expressions: list[Expression] = []
+        changed = False
+        for expression in value.expressions:
+            if isinstance(expression, BinaryExpression):
+                right = self._narrow(expression.right, inner)
+                if right is not expression.right:
+                    expression = expression.cloned()
+                    expression.right = right
+                    changed = True
+                self._assign(expression, right, inner)
+            expressions.append(expression)
+
+        result = value.result
+        assert isinstance(result, Stat)
+        sign_fix_operand = value.sign_fix_operand
+        state.pop(result.stat_key(), None)
+        if sign_fix_operand is not None:
+            operand_range = self._range_of(sign_fix_operand, inner)
+            if operand_range is not None and operand_range.is_non_negative:
+                sign_fix = expressions.pop()
+                # Counted without rendering, which would number the temps
+                # before they are allocated
+                self.saved += 1 + sum(
+                    len(expression.flatten())
+                    if isinstance(expression, BinaryExpression)
+                    else 1
+                    for expression in sign_fix.walk_expressions()
+                    if expression is not sign_fix
+                )
+                sign_fix_operand = None
+                changed = True
+                # Nothing but assignments is left to compute the result
+                result_range = inner.get(result.stat_key())
+                declared = result.declared_range()
+                if declared is not None:
+                    result_range = (
+                        declared
+                        if result_range is None
+                        else result_range.clamped(*declared)
+                    )
+                if result_range is not None:
+                    state[result.stat_key()] = result_range
+
+        if not changed:
+            return value
+        shared = {id(expression) for expression in value.expressions}
+        return CompoundExpression(
+            [
+                expression.cloned() if id(expression) in shared else expression
+                for expression in expressions
+            ],
+            result,
+            sign_fix_operand=sign_fix_operand,
+        )
+
+    @staticmethod
+    def _forget(keys: frozenset[StatKey], state: State) -> None:
+        for key in keys:
+            state.pop(key, None)
+
+    # --- statements ----------------------------------------------------------
+
+    def _analyze(self, expressions: list[Expression], state: State) -> None:
+        for expression in expressions:
+            if isinstance(expression, ConditionalExpression):
+                self._conditional(expression, state)
+            elif isinstance(expression, BinaryExpression):
+                self._assignment(expression, state)
+            elif BinaryExpression._is_execution_barrier(expression):
+                state.clear()
+            elif bodies := expression.nested_expressions_refs():
+                # Like a random block, which runs one of its bodies
+                self._branches(bodies, state, may_skip=True)
+            else:
+                self._forget(expression.stat_usage().writes, state)
+
+    def _assignment(
+        self,
+        expression: 'BinaryExpression[Any, Any]',
+        state: State,
+    ) -> None:
+        right = self._narrow(expression.right, state)
+        if right is not expression.right:
+            expression.right = right
+        if isinstance(right, BinaryExpression | CompoundExpression):
+            if BinaryExpression._is_execution_barrier(expression):
+                state.clear()
+                return
+            # The temps they are flattened into
+            self._forget(expression.stat_usage().writes, state)
+        self._assign(expression, right, state)
+
+    def _assign(
+        self,
+        expression: 'BinaryExpression[Any, Any]',
+        right: object,
+        state: State,
+    ) -> None:
+        """Keeps what the stat `expression` assigns `right` to holds after it."""
+        left = expression.left
+        if not isinstance(left, Stat):
+            self._forget(expression.stat_usage().writes, state)
+            return
+        value_range: ValueRange | None = None
+        if _is_tracked(left) and not expression.is_intentional_self_assignment:
+            value_range = value_range_after(
+                expression.operator,
+                self._range_of(left, state),
+                self._range_of(right, state),
+                left.internal_type,
+            )
+        state.pop(left.stat_key(), None)
+        if value_range is not None:
+            state[left.stat_key()] = value_range
+
+    # --- conditions ----------------------------------------------------------
+
+    def _learn(self, condition: 'Condition', holds: bool, state: State) -> None:
+        """What `condition` holding, or not, tells about the range of a stat."""
+        if not isinstance(condition, ComparisonCondition):
+            return
+        left, right = condition.left, condition.right
+        if (
+            not _is_tracked(left)
+            or isinstance(right, bool)
+            or not isinstance(right, int | float)
+        ):
+            return
+        operator = condition.operator
+        if holds == condition.inverted:
+            if operator not in _NEGATED:
+                return
+            operator = _NEGATED[operator]
+        bounds = _bounds(operator, right, left.internal_type)
+        current = self._range_of(left, state) or ValueRange.of_type(left.internal_type)
+        if bounds is None or current is None:
+            return
+        narrowed = current.clamped(*bounds)
+        if narrowed is not None:
+            assert isinstance(left, Stat)
+            state[left.stat_key()] = narrowed
+
+    def _conditional(self, expression: ConditionalExpression, state: State) -> None:
+        is_all = expression.mode is ConditionalMode.ALL
+        conditions = expression.conditions
+        if_state = dict(state)
+        else_state = dict(state)
+        if is_all or len(conditions) == 1:
+            for condition in conditions:
+                self._learn(condition, True, if_state)
+        if not is_all or len(conditions) == 1:
+            for condition in conditions:
+                self._learn(condition, False, else_state)
+        self._analyze(expression.if_expressions, if_state)
+        self._analyze(expression.else_expressions, else_state)
+        self._join(state, [if_state, else_state])
+
+    def _branches(
+        self,
+        bodies: list[list[Expression]],
+        state: State,
+        *,
+        may_skip: bool,
+    ) -> None:
+        states = [dict(state) for _ in bodies]
+        for body, body_state in zip(bodies, states, strict=True):
+            self._analyze(body, body_state)
+        if may_skip:
+            states.append(dict(state))
+        self._join(state, states)
+
+    @staticmethod
+    def _join(state: State, states: list[State]) -> None:
+        """Keeps what is known after any of `states`."""
+        state.clear()
+        first, *rest = states
+        for key, value_range in first.items():
+            for other in rest:
+                other_range = other.get(key)
+                if other_range is None:
+                    break
+                value_range = value_range.hull(other_range)
+            else:
+                state[key] = value_range
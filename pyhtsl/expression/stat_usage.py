@@ -0,0 +1,128 @@
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, final
+
+from ..stats.stat import Stat
+from ..stats.temporary_stat import Number, TemporaryStat
+
+if TYPE_CHECKING:
+    from .expression import Expression
+
+
+__all__ = (
+    'StatKey',
+    'StatUsage',
+    'placeholder_stat_key',
+)
+
+
+type StatKey = tuple[object, ...]
+
+
+def placeholder_stat_key(stat: Stat) -> StatKey:
+    """Key under which `stat` shows up when referenced by placeholder inside a
+    string. Placeholders always parse back into regular stats, so a temp is
+    found there as its `tmpN` player stat."""
+    if isinstance(stat, TemporaryStat):
+        return stat.into_player_stat().stat_key()
+    return stat.stat_key()
+
+
+@final
+class StatUsage:
+    """The stats an expression reads and writes, as `Stat.stat_key` sets.
+
+    `reads` and `writes` hold the stats found directly in fields, and
+    `placeholders` the ones referenced by placeholder inside string fields
+    (those are always reads). Temporary stat keys depend on the temp's current
+    number, so the usage remembers the numbers it was built with and stops
+    being current once a temp is renamed.
+    """
+
+    reads: frozenset[StatKey]
+    writes: frozenset[StatKey]
+    placeholders: frozenset[StatKey]
+    stats: frozenset[StatKey]
+    temporaries: tuple[tuple[Number, int], ...]
+
+    def __init__(
+        self,
+        reads: frozenset[StatKey],
+        writes: frozenset[StatKey],
+        placeholders: frozenset[StatKey],
+        temporaries: tuple[tuple[Number, int], ...] = (),
+    ) -> None:
+        self.reads = reads
+        self.writes = writes
+        self.placeholders = placeholders
+        self.stats = reads | writes
+        self.temporaries = temporaries
+
+    @staticmethod
+    def collect(expression: 'Expression') -> 'StatUsage':
+        """Usage of the fields of `expression` itself, not of nested expressions."""
+        from ..checkable import Checkable
+
+        reads: set[StatKey] = set()
+        writes: set[StatKey] = set()
+        placeholders: set[StatKey] = set()
+        temporaries: dict[Number, int] = {}
+        for stat, is_read, is_written in expression.get_stat_accesses():
+            key = stat.stat_key()
+            if is_read:
+                reads.add(key)
+            if is_written:
+                writes.add(key)
+            if isinstance(stat, TemporaryStat):
+                temporaries[stat._number] = stat.number
+        # Stats can also be referenced by their placeholders inside string fields, kind of hacky but whatever
+        for _, value in expression.iter_field_values(expression.string_fields):
+            if not isinstance(value, str):
+                continue
+            for ref in Checkable.iter_in_string(value):
+                if isinstance(ref, Stat):
+                    placeholders.add(ref.stat_key())
+        return StatUsage(
+            frozenset(reads),
+            frozenset(writes),
+            frozenset(placeholders),
+            tuple(temporaries.items()),
+        )
+
+    @staticmethod
+    def union(usages: Iterable['StatUsage']) -> 'StatUsage':
+        reads: set[StatKey] = set()
+        writes: set[StatKey] = set()
+        placeholders: set[StatKey] = set()
+        temporaries: list[tuple[Number, int]] = []
+        for usage in usages:
+            reads |= usage.reads
+            writes |= usage.writes
+            placeholders |= usage.placeholders
+            temporaries.extend(usage.temporaries)
+        return StatUsage(
+            frozenset(reads),
+            frozenset(writes),
+            frozenset(placeholders),
+            tuple(temporaries),
+        )
+
+    def is_current(self) -> bool:
+        return all(number.value == value for number, value in self.temporaries)
+
+    def is_using(self, stat: Stat) -> bool:
+        return (
+            stat.stat_key() in self.stats
+            or placeholder_stat_key(stat) in self.placeholders
+        )
+
+    def is_reading(self, stat: Stat) -> bool:
+        return (
+            stat.stat_key() in self.reads
+            or placeholder_stat_key(stat) in self.placeholders
+        )
+
+    def is_writing(self, stat: Stat) -> bool:
+        return stat.stat_key() in self.writes
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}<reads={len(self.reads)}, writes={len(self.writes)}, placeholders={len(self.placeholders)}>'
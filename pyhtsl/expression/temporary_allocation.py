@@ -0,0 +1,228 @@
+from typing import TYPE_CHECKING
+
+from ..stats.player_stat import PlayerStat
+from ..stats.stat import Stat
+from ..stats.temporary_stat import Number, TemporaryStat
+from ..utils.placeholders import PlaceholderRegistry
+from .binary_expression import BinaryExpression
+from .compound_expression import CompoundExpression
+
+if TYPE_CHECKING:
+    from .expression import Expression
+
+
+__all__ = ('TemporaryStatAllocator',)
+
+
+class _LiveRange:
+    """The points of the block from the first to the last use of one temporary
+    stat, or of every use of a hand-written `tmpN` stat, which keeps its number.
+    """
+
+    number: Number | None
+    fixed: int | None
+    start: int
+    end: int
+
+    def __init__(self, point: int, *, number: Number | None, fixed: int | None):
+        self.number = number
+        self.fixed = fixed
+        self.start = point
+        self.end = point
+
+    @property
+    def value(self) -> int:
+        if self.number is not None:
+            return self.number.value
+        assert self.fixed is not None
+        return self.fixed
+
+    def overlaps(self, other: '_LiveRange') -> bool:
+        return self.start <= other.end and other.start <= self.end
+
+
+class _StringSite:
+    """A string field referencing temporary stats by placeholder, with where
+    each name is in it."""
+
+    expression: 'Expression'
+    field: str
+    names: list[tuple[int, int, _LiveRange]]
+
+    def __init__(self, expression: 'Expression', field: str) -> None:
+        self.expression = expression
+        self.field = field
+        self.names = []
+
+    def rewrite(self) -> None:
+        old_text: str = getattr(self.expression, self.field)
+        text = old_text
+        for start, end, live_range in reversed(self.names):
+            name = f'{TemporaryStat.name_prefix}{live_range.value}'
+            text = text[:start] + name + text[end:]
+        if text != old_text:
+            setattr(self.expression, self.field, text)
+
+
+class TemporaryStatAllocator:
+    """Names the temporary stats of a whole block, nested blocks included, with
+    as few `tmpN` stats as possible.
+
+    Finalized temporary stats are written with a number no other one has, see
+    `BinaryExpression.finalize_temporary_stats`, and only get their name here.
+    Every statement is a point, in the order the block is written, with the
+    statements of a nested block right after the statement holding it. As the
+    block only ever runs forward, a temporary stat is live from its first to its
+    last use, and two temporary stats can share a number whenever those ranges
+    do not overlap. The ranges are numbered by linear scan, from the one
+    starting first, with the lowest number no overlapping range has.
+
+    Stats named like temporary stats that are not, like the ones `ext` modules
+    write by hand, keep their number and are only avoided. A placeholder naming
+    a temporary stat, like the ones deferred expressions are substituted with,
+    refers to the range last using that number, and is renamed with it.
+
+    Temporary stats that are not finalized only live within the statement using
+    them, and get the lowest numbers not live across that statement when it is
+    flattened.
+    """
+
+    expressions: list['Expression']
+    point: int
+    ranges: dict[Number, _LiveRange]
+    fixed: dict[int, _LiveRange]
+    # The range last using each number, which placeholders refer to
+    latest: dict[int, _LiveRange]
+    sites: list[_StringSite]
+    flattening: list[tuple[int, 'Expression']]
+
+    def __init__(self, expressions: list['Expression']) -> None:
+        self.expressions = expressions
+        self.point = 0
+        self.ranges = {}
+        self.fixed = {}
+        self.latest = {}
+        self.sites = []
+        self.flattening = []
+
+    def run(self) -> None:
+        self._collect(self.expressions)
+        self._number_ranges()
+        for site in self.sites:
+            site.rewrite()
+        self._mark_live_numbers()
+
+    # --- live ranges ---------------------------------------------------------
+
+    def _collect(self, expressions: list['Expression']) -> None:
+        for expression in expressions:
+            point = self.point
+            self.point += 1
+            bodies = expression.nested_expressions_refs()
+            if bodies:
+                # The conditions of a nested block are used before its body runs
+                self._use_stats(expression, point)
+                self._use_placeholders(expression, point)
+                for body in bodies:
+                    self._collect(body)
+                continue
+            for part in expression.walk_expressions():
+                self._use_stats(part, point)
+                if part.string_fields:
+                    self._use_placeholders(part, point)
+            if isinstance(expression, BinaryExpression | CompoundExpression):
+                self.flattening.append((point, expression))
+
+    def _use(self, live_range: _LiveRange, point: int) -> None:
+        live_range.end = point
+        self.latest[live_range.value] = live_range
+
+    def _use_fixed(self, number: int, point: int) -> _LiveRange:
+        live_range = self.fixed.get(number)
+        if live_range is None:
+            live_range = self.fixed[number] = _LiveRange(
+                point, number=None, fixed=number
+            )
+        self._use(live_range, point)
+        return live_range
+
+    def _use_stats(self, expression: 'Expression', point: int) -> None:
+        for stat in expression.iter_stats_used():
+            if isinstance(stat, TemporaryStat):
+                if not stat._number.finalized:
+                    # Renamed along with what the statement flattens into
+                    continue
+                live_range = self.ranges.get(stat._number)
+                if live_range is None:
+                    live_range = self.ranges[stat._number] = _LiveRange(
+                        point, number=stat._number, fixed=None
+                    )
+                self._use(live_range, point)
+                continue
+            number = TemporaryStat.extract_number_from_name(stat.name)
+            if number is not None:
+                self._use_fixed(number, point)
+
+    def _use_placeholders(self, expression: 'Expression', point: int) -> None:
+        for field, value in expression.iter_field_values(expression.string_fields):
+            if not isinstance(value, str) or '%' not in value:
+                continue
+            site = _StringSite(expression, field)
+            for match, factory in PlaceholderRegistry.scan(value):
+                stat = factory(match)
+                if not isinstance(stat, Stat):
+                    continue
+                number = TemporaryStat.extract_number_from_name(stat.name)
+                if number is None:
+                    continue
+                live_range = self.latest.get(number)
+                if (
+                    live_range is None
+                    or live_range.number is None
+                    or not isinstance(stat, PlayerStat)
+                    or not match.group(1).startswith(stat.name)
+                ):
+                    self._use_fixed(number, point)
+                    continue
+                self._use(live_range, point)
+                start = match.start(1)
+                site.names.append((start, start + len(stat.name), live_range))
+            if site.names:
+                self.sites.append(site)
+
+    # --- numbering -----------------------------------------------------------
+
+    def _number_ranges(self) -> None:
+        fixed = list(self.fixed.values())
+        active: list[_LiveRange] = []
+        for live_range in sorted(self.ranges.values(), key=lambda r: r.start):
+            active = [other for other in active if other.end >= live_range.start]
+            taken = {other.value for other in active}
+            taken.update(other.value for other in fixed if other.overlaps(live_range))
+            number = 0
+            while number in taken:
+                number += 1
+            assert live_range.number is not None
+            live_range.number.value = number
+            active.append(live_range)
+
+    def _mark_live_numbers(self) -> None:
+        ranges = sorted(
+            (*self.ranges.values(), *self.fixed.values()), key=lambda r: r.start
+        )
+        index = 0
+        active: list[_LiveRange] = []
+        numbers: frozenset[int] = frozenset()
+        for point, expression in self.flattening:
+            changed = False
+            while index < len(ranges) and ranges[index].start <= point:
+                active.append(ranges[index])
+                index += 1
+                changed = True
+            if any(live_range.end < point for live_range in active):
+                active = [r for r in active if r.end >= point]
+                changed = True
+            if changed:
+                # Shared by every statement in between, blocks can be long
+                numbers = frozenset(live_range.value for live_range in active)
+            expression.set_live_temporary_numbers(numbers)
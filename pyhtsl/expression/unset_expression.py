@@ -9,13 +9,16 @@ if TYPE_CHECKING:
 
 @final
 class UnsetExpression(Expression):
+    __slots__ = ('target',)
+    stat_fields = ('target',)
+
     target: 'Stat'
 
     def __init__(self, target: 'Stat') -> None:
         self.target = target
 
     def cloned(self) -> Self:
-        return self.__class__(self.target.cloned())
+        return self.__class__(self.target)
 
     def equals(self, other: object) -> bool:
         if not isinstance(other, UnsetExpression):
@@ -0,0 +1,378 @@
+from typing import TYPE_CHECKING, Any
+
+from ..checkable import Checkable
+from ..internal_type import InternalType
+from ..placeholders import PlaceholderCheckable
+from ..stats.stat import Stat
+from ..stats.temporary_stat import TemporaryStat
+from .binary_expression import BinaryExpression, BinaryOperator
+from .compound_expression import CompoundExpression
+from .stat_usage import StatKey, placeholder_stat_key
+
+if TYPE_CHECKING:
+    from .expression import Expression
+
+
+__all__ = ('ValueNumbering',)
+
+
+# Placeholders that are different every time they are read
+VOLATILE_PLACEHOLDER_PREFIXES: tuple[str, ...] = ('%random.', '%date.')
+
+
+def _is_scratch_stat(stat: Stat) -> bool:
+    """Temps, and stats named like them, which the temps of any other
+    statement can overwrite once rendered."""
+    return (
+        isinstance(stat, TemporaryStat)
+        or TemporaryStat.extract_number_from_name(stat.name) is not None
+    )
+
+
+def _is_flat(expression: 'Expression') -> bool:
+    return isinstance(expression, BinaryExpression) and not isinstance(
+        expression.right, BinaryExpression | CompoundExpression
+    )
+
+
+class _Copy:
+    """`temp = source`, left behind by a reuse into a temp of the statement.
+    Reads of the temp are redirected to `source` while it still holds the same
+    value, and once none is left the copy itself goes."""
+
+    position: int
+    source: Stat
+    is_needed: bool
+
+    def __init__(self, position: int, source: Stat) -> None:
+        self.position = position
+        self.source = source
+        self.is_needed = False
+
+
+class ValueNumbering:
+    """Common subexpression elimination over the statements of one block.
+
+    Every statement is looked at in its executable form, and every value a
+    stat gets is numbered: the same operator applied to the same numbered
+    operands gives the same number. When the statements writing a stat since
+    it was last set compute a value another stat already holds, they are
+    replaced with a single copy of that stat.
+
+    Only the statements that changed are replaced by their executable form,
+    with finalized temps like `create_temp_stat_and_write` has them. Everything
+    else is left alone.
+
+    What is known is forgotten at execution barriers, and what a stat holds is
+    forgotten at every action that may write it. Placeholders keep their value
+    until the next action that is not a stat assignment, except random and
+    date placeholders, which never have the same value twice.
+    """
+
+    expressions: list['Expression']
+    saved: int
+
+    table: dict[tuple[object, ...], int]
+    state: dict[StatKey, tuple[int, Stat]]
+    holders: dict[int, dict[StatKey, Stat]]
+    generations: dict[StatKey, int]
+    scratch: set[StatKey]
+    epoch: int
+
+    def __init__(self, expressions: list['Expression']) -> None:
+        self.expressions = expressions
+        self.saved = 0
+        self.table = {}
+        self.state = {}
+        self.holders = {}
+        self.generations = {}
+        self.scratch = set()
+        self.epoch = 0
+
+    def run(self) -> int:
+        """Rewrites the block in place, returning the amount of actions saved."""
+        # Only a statement flattening into several can have some of them
+        # replaced, using what is known from the assignments before it
+        nested = [
+            index
+            for index, expression in enumerate(self.expressions)
+            if isinstance(expression, BinaryExpression) and not _is_flat(expression)
+        ]
+        if not nested:
+            return 0
+        first = next(
+            index
+            for index, expression in enumerate(self.expressions)
+            if isinstance(expression, BinaryExpression)
+        )
+        last = nested[-1]
+        result: list[Expression] = self.expressions[:first]
+        for expression in self.expressions[first : last + 1]:
+            result.append(expression)
+            if _is_flat(expression):
+                # A single assignment is its own executable form, give or take
+                # type casting, and can not reuse anything of itself
+                self._number_assignment(expression)
+            elif BinaryExpression._is_execution_barrier(expression):
+                self._forget_everything()
+            elif isinstance(expression, BinaryExpression):
+                statements = list(expression.into_executable_expressions())
+                rewritten = self._number_statement(statements)
+                if rewritten is not None:
+                    BinaryExpression.finalize_temporary_stats(rewritten)
+                    result[-1:] = rewritten
+            else:
+                self._number_opaque(expression)
+
+            for key in self.scratch:
+                self._kill(key)
+            self.scratch.clear()
+
+        if self.saved:
+            self.expressions[:] = result + self.expressions[last + 1 :]
+        return self.saved
+
+    # --- values --------------------------------------------------------------
+
+    def _number(self, key: tuple[object, ...]) -> int:
+        return self.table.setdefault(key, len(self.table))
+
+    def _fresh(self) -> int:
+        return self._number(('fresh', len(self.table)))
+
+    def _kill(self, key: StatKey) -> None:
+        self.generations[key] = self.generations.get(key, 0) + 1
+        known = self.state.pop(key, None)
+        if known is not None:
+            self.holders[known[0]].pop(key, None)
+
+    def _assign(self, stat: Stat, value: int) -> None:
+        key = stat.stat_key()
+        self._kill(key)
+        self.state[key] = (value, stat)
+        self.holders.setdefault(value, {})[key] = stat
+        if _is_scratch_stat(stat):
+            self.scratch.add(key)
+
+    def _forget_everything(self) -> None:
+        for key in list(self.state):
+            self._kill(key)
+        self.epoch += 1
+
+    def _read_stat(self, stat: Stat) -> int:
+        key = stat.stat_key()
+        known = self.state.get(key)
+        if (
+            known is not None
+            and known[1].internal_type is stat.internal_type
+            and stat.fallback_value is None
+        ):
+            return known[0]
+        value = self._number(
+            (
+                'read',
+                key,
+                stat.internal_type,
+                repr(stat.fallback_value),
+                self.generations.get(key, 0),
+            )
+        )
+        if known is None and stat.fallback_value is None:
+            # The stat holds the value it was read as from now on
+            self._assign(stat, value)
+        return value
+
+    def _read(self, value: object) -> int:
+        if isinstance(value, Stat):
+            return self._read_stat(value)
+        if isinstance(value, PlaceholderCheckable):
+            if value.as_string.startswith(VOLATILE_PLACEHOLDER_PREFIXES):
+                return self._fresh()
+            return self._number(
+                ('placeholder', value.as_string, value.internal_type, self.epoch)
+            )
+        if isinstance(value, str):
+            if any(True for _ in Checkable.iter_in_string(value)):
+                return self._fresh()
+            return self._number(('constant', str, value))
+        if isinstance(value, int | float):
+            return self._number(('constant', type(value), value))
+        return self._fresh()
+
+    # --- statements ----------------------------------------------------------
+
+    def _number_opaque(self, expression: 'Expression') -> None:
+        usage = expression.stat_usage()
+        for key in usage.writes:
+            self._kill(key)
+        self.epoch += 1
+
+    def _assignment_value(
+        self,
+        left: Stat,
+        operator: BinaryOperator,
+        right: Any,
+    ) -> int:
+        right_value = self._read(right)
+        if operator is BinaryOperator.Set:
+            if InternalType.from_value(right) is left.internal_type:
+                return right_value
+            return self._number(('cast', right_value, left.internal_type))
+        return self._number(
+            (
+                'op',
+                operator,
+                self._read_stat(left),
+                right_value,
+                left.internal_type,
+            )
+        )
+
+    def _number_assignment(self, statement: 'Expression') -> None:
+        if not (
+            isinstance(statement, BinaryExpression)
+            and isinstance(statement.left, Stat)
+            and not statement.is_intentional_self_assignment
+        ):
+            self._number_opaque(statement)
+            return
+        left: Stat = statement.left
+        self._assign(
+            left, self._assignment_value(left, statement.operator, statement.right)
+        )
+
+    def _number_statement(
+        self,
+        statements: list['Expression'],
+    ) -> list['Expression'] | None:
+        """Numbers the executable form of one statement, returning it rewritten,
+        or None when nothing could be reused."""
+        result: list[Expression | None] = list(statements)
+        # Positions of the writes to a stat since it was last set, unread since
+        chains: dict[StatKey, list[int]] = {}
+        copies: dict[StatKey, _Copy] = {}
+        written: dict[StatKey, Stat] = {}
+        saved = 0
+
+        def touch(usage_keys: frozenset[StatKey]) -> None:
+            # Placeholders find temps as their `tmpN` player stat
+            for key, stat in written.items():
+                if key in usage_keys or placeholder_stat_key(stat) in usage_keys:
+                    chains.pop(key, None)
+                    if key in copies:
+                        copies[key].is_needed = True
+
+        def end_copy(key: StatKey) -> None:
+            nonlocal saved
+            copy = copies.pop(key, None)
+            if copy is not None and not copy.is_needed:
+                result[copy.position] = None
+                saved += 1
+
+        for position, statement in enumerate(statements):
+            if not isinstance(
+                statement, BinaryExpression
+            ) and BinaryExpression._is_execution_barrier(statement):
+                self._forget_everything()
+                chains.clear()
+                for copy in copies.values():
+                    copy.is_needed = True
+                continue
+
+            if not (
+                isinstance(statement, BinaryExpression)
+                and isinstance(statement.left, Stat)
+                and not statement.is_intentional_self_assignment
+            ):
+                usage = statement.stat_usage()
+                touch(usage.reads | usage.placeholders | usage.writes)
+                for key in usage.writes:
+                    end_copy(key)
+                self._number_opaque(statement)
+                continue
+
+            left: Stat = statement.left
+            left_key = left.stat_key()
+            written[left_key] = left
+            right: Any = statement.right
+
+            if isinstance(right, Stat) and not right.is_same_stat(left):
+                right_key = right.stat_key()
+                copy = copies.get(right_key)
+                if copy is not None and not copy.is_needed:
+                    if self._holds_same_value(copy.source, right):
+                        right = copy.source
+                        result[position] = BinaryExpression(
+                            left=left, right=right, operator=statement.operator
+                        )
+                    else:
+                        copy.is_needed = True
+                chains.pop(right.stat_key(), None)
+                chains.pop(right_key, None)
+            elif isinstance(right, str):
+                touch(
+                    frozenset(
+                        placeholder_stat_key(ref)
+                        for ref in Checkable.iter_in_string(right)
+                        if isinstance(ref, Stat)
+                    )
+                )
+
+            value = self._assignment_value(left, statement.operator, right)
+            if statement.operator is BinaryOperator.Set:
+                chain = [position]
+            else:
+                if left_key in copies:
+                    copies[left_key].is_needed = True
+                chain = chains.get(left_key, [])
+                if chain:
+                    chain.append(position)
+
+            end_copy(left_key)
+            self._assign(left, value)
+            chains[left_key] = chain
+            if len(chain) < 2:
+                continue
+
+            source = self._find_holder(value, left)
+            if source is None:
+                continue
+            for earlier in chain[:-1]:
+                result[earlier] = None
+            result[position] = BinaryExpression(
+                left=left, right=source, operator=BinaryOperator.Set
+            )
+            saved += len(chain) - 1
+            chains[left_key] = [position]
+            chains.pop(source.stat_key(), None)
+            if source.stat_key() in copies:
+                copies[source.stat_key()].is_needed = True
+            if isinstance(left, TemporaryStat) and not left._number.finalized:
+                copies[left_key] = _Copy(position, source)
+
+        for key in list(copies):
+            end_copy(key)
+
+        if not saved:
+            return None
+        self.saved += saved
+        return [statement for statement in result if statement is not None]
+
+    def _holds_same_value(self, source: Stat, stat: Stat) -> bool:
+        known = self.state.get(stat.stat_key())
+        if known is None:
+            return False
+        return self.holders.get(known[0], {}).get(source.stat_key()) is source
+
+    def _find_holder(self, value: int, left: Stat) -> Stat | None:
+        left_key = left.stat_key()
+        candidates = [
+            stat
+            for key, stat in self.holders.get(value, {}).items()
+            if key != left_key
+            and stat.internal_type is left.internal_type
+            and stat.fallback_value is None
+        ]
+        # A temp only holds its value until the end of the statement
+        candidates.sort(key=lambda stat: isinstance(stat, TemporaryStat))
+        return candidates[0] if candidates else None
@@ -0,0 +1,208 @@
+import math
+from collections.abc import Callable
+from typing import TYPE_CHECKING, NamedTuple
+
+from ..execute.java_long import INT64_MAX, INT64_MIN
+from ..internal_type import InternalType
+
+if TYPE_CHECKING:
+    from ..stats.stat import Stat
+    from .binary_expression import BinaryOperator
+
+
+__all__ = (
+    'ValueRange',
+    'value_range_of',
+    'value_range_after',
+    'remainder_range',
+    'absolute_range',
+)
+
+
+class ValueRange(NamedTuple):
+    """The values something can hold, both bounds included. Unbounded sides are
+    infinite."""
+
+    lower: float
+    upper: float
+
+    @property
+    def is_non_negative(self) -> bool:
+        return self.lower >= 0
+
+    @staticmethod
+    def of_type(internal_type: InternalType) -> 'ValueRange | None':
+        """Every value a stat of `internal_type` can hold."""
+        if internal_type is InternalType.LONG:
+            return ValueRange(INT64_MIN, INT64_MAX)
+        if internal_type is InternalType.DOUBLE:
+            return ValueRange(-math.inf, math.inf)
+        return None
+
+    def hull(self, other: 'ValueRange') -> 'ValueRange':
+        return ValueRange(min(self.lower, other.lower), max(self.upper, other.upper))
+
+    def clamped(
+        self,
+        lower: float = -math.inf,
+        upper: float = math.inf,
+    ) -> 'ValueRange | None':
+        """This range without what is outside of `lower` and `upper`, or None if
+        nothing is left."""
+        clamped = ValueRange(max(self.lower, lower), min(self.upper, upper))
+        if clamped.lower > clamped.upper:
+            return None
+        return clamped
+
+
+type KnownRanges = Callable[['Stat'], ValueRange | None]
+
+
+def _fits(value_range: ValueRange, internal_type: InternalType) -> ValueRange | None:
+    if any(math.isnan(bound) for bound in value_range):
+        return None
+    if internal_type is InternalType.LONG:
+        # Longs wrap around once they leave their range
+        if value_range.lower < INT64_MIN or value_range.upper > INT64_MAX:
+            return None
+        # Doubles cast to a long lose their fraction
+        return ValueRange(math.floor(value_range.lower), math.ceil(value_range.upper))
+    if internal_type is InternalType.DOUBLE:
+        return value_range
+    return None
+
+
+def value_range_after(
+    operator: 'BinaryOperator',
+    left: ValueRange | None,
+    right: ValueRange | None,
+    internal_type: InternalType,
+) -> ValueRange | None:
+    """What `left` holds once `operator` applied `right` to it, as a stat of
+    `internal_type`, or None if that is not known."""
+    from .binary_expression import BinaryOperator
+
+    if right is None:
+        return None
+    if operator is BinaryOperator.Set:
+        return _fits(right, internal_type)
+    if left is None:
+        return None
+
+    result: ValueRange | None = None
+    if operator is BinaryOperator.Increment:
+        result = ValueRange(left.lower + right.lower, left.upper + right.upper)
+    elif operator is BinaryOperator.Decrement:
+        result = ValueRange(left.lower - right.upper, left.upper - right.lower)
+    elif operator is BinaryOperator.Multiply:
+        products = [
+            a * b
+            for a in left
+            for b in right
+            # An unbounded side times zero is still zero
+            if not (math.isinf(a) and b == 0 or math.isinf(b) and a == 0)
+        ]
+        result = ValueRange(min(products, default=0), max(products, default=0))
+    elif operator is BinaryOperator.Divide:
+        # Only dividing a value that is not negative by one that is positive,
+        # the stat being left as it is when dividing by zero
+        if left.is_non_negative and right.lower >= 1:
+            result = ValueRange(left.lower / right.upper, left.upper / right.lower)
+    elif internal_type is InternalType.LONG:
+        if operator is BinaryOperator.BitwiseAnd:
+            if left.is_non_negative or right.is_non_negative:
+                result = ValueRange(
+                    0,
+                    min(side.upper for side in (left, right) if side.is_non_negative),
+                )
+        elif operator in (
+            BinaryOperator.RightShift,
+            BinaryOperator.LogicalRightShift,
+        ):
+            if left.is_non_negative and 0 <= right.lower and right.upper < 64:
+                result = ValueRange(0, left.upper)
+    if result is None:
+        return None
+    return _fits(result, internal_type)
+
+
+def value_range_of(
+    value: object,
+    known: KnownRanges | None = None,
+) -> ValueRange | None:
+    """The values `value` can hold when it is read, from the ranges stats are
+    declared with, what `known` tells about stats, and the operations it is
+    built from. None if nothing is known about it."""
+    from ..checkable import Checkable
+    from ..stats.stat import Stat
+    from .binary_expression import BinaryExpression
+    from .compound_expression import CompoundExpression
+
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int | float):
+        return ValueRange(value, value)
+    if isinstance(value, CompoundExpression):
+        return value_range_of(value.result, known)
+    if isinstance(value, BinaryExpression):
+        return value_range_after(
+            value.operator,
+            value_range_of(value.left, known),
+            value_range_of(value.right, known),
+            value.internal_type,
+        )
+    if not isinstance(value, Checkable):
+        return None
+    if isinstance(value, Stat) and known is not None:
+        value_range = known(value)
+        if value_range is not None:
+            return value_range
+    declared = value.declared_range()
+    if declared is None:
+        return None
+    return _fits(declared, value.internal_type)
+
+
+def remainder_range(
+    dividend: ValueRange | None,
+    divisor: ValueRange | None,
+    *,
+    integral: bool,
+) -> ValueRange | None:
+    """What `%` results in once its result is made positive, which is only
+    needed when `dividend` may be negative. The remainder is smaller than the
+    divisor, by one more when both are whole numbers."""
+    non_negative = dividend is not None and dividend.is_non_negative
+    if divisor is None or divisor.lower <= 0 <= divisor.upper:
+        # Dividing by zero leaves the dividend as it is
+        if not non_negative:
+            return None
+        assert dividend is not None
+        return ValueRange(0, dividend.upper)
+    if not non_negative and divisor.lower < 0:
+        # Adding a negative divisor does not make the result positive
+        return None
+    bound = max(-divisor.lower, divisor.upper) - (1 if integral else 0)
+    if non_negative:
+        assert dividend is not None
+        bound = min(bound, dividend.upper)
+    return ValueRange(0, bound)
+
+
+def absolute_range(
+    operand: ValueRange | None,
+    internal_type: InternalType,
+) -> ValueRange | None:
+    """What `abs()` of something holding `operand` results in."""
+    if operand is None:
+        if internal_type is InternalType.DOUBLE:
+            return ValueRange(0, math.inf)
+        return None
+    if operand.is_non_negative:
+        return operand
+    if internal_type is InternalType.LONG and operand.lower <= INT64_MIN:
+        # The smallest long is its own negation
+        return None
+    if operand.upper <= 0:
+        return ValueRange(-operand.upper, -operand.lower)
+    return ValueRange(0, max(-operand.lower, operand.upper))
@@ -1,4 +1,6 @@
-from typing import TYPE_CHECKING
+from collections.abc import Callable
+from enum import Enum
+from typing import TYPE_CHECKING, final
 
 if TYPE_CHECKING:
     from .actions.function import Function
@@ -99,11 +101,8 @@ ActionCounts = dict[type['Expression'] | type['PlaceholderEditable'], int]
 class Counter:
     count: ActionCounts
 
-    def __init__(self, memo: dict[int, ActionCounts] | None = None) -> None:
+    def __init__(self) -> None:
         self.count = {}
-        # Shared across the counters of one fix pass so the (somewhat costly)
-        # flatten per expression happens at most once.
-        self._memo = memo if memo is not None else {}
 
     @staticmethod
     def expression_into_cls(
@@ -122,26 +121,24 @@ class Counter:
         """Rendered HTSL actions, by class, for one expression at its own block
         level. A `BinaryExpression` / `CompoundExpression` flattens into several
         actions (temps, modulo's if-block, ...), so counting the object as one
-        undercounts the real actions and lets a block slip past its limit."""
+        undercounts the real actions and lets a block slip past its limit.
+
+        The counts are kept on the expression's `executable_form`, so the
+        flatten happens once for counting, rendering and executing alike."""
         from .expression.binary_expression import BinaryExpression
         from .expression.compound_expression import CompoundExpression
 
-        key = id(expression)
-        cached = self._memo.get(key)
-        if cached is not None:
-            return cached
+        if not isinstance(expression, BinaryExpression | CompoundExpression):
+            return {self.expression_into_cls(expression): 1}
 
-        counts: ActionCounts = {}
-        rendered = (
-            expression.into_executable_expressions()
-            if isinstance(expression, BinaryExpression | CompoundExpression)
-            else (expression,)
-        )
-        for rendered_expr in rendered:
-            cls = self.expression_into_cls(rendered_expr)
-            counts[cls] = counts.get(cls, 0) + 1
-        self._memo[key] = counts
-        return counts
+        form = expression.executable_form(expression._executable_expressions)
+        if form.action_counts is None:
+            counts: ActionCounts = {}
+            for rendered_expr in form.expressions:
+                cls = self.expression_into_cls(rendered_expr)
+                counts[cls] = counts.get(cls, 0) + 1
+            form.action_counts = counts
+        return form.action_counts
 
     def increment(self, expression: 'Expression') -> None:
         for cls, amount in self.action_counts(expression).items():
@@ -157,7 +154,7 @@ class Counter:
     def exceeds_on_its_own(self, expression: 'Expression') -> bool:
         """A single expression that renders to more actions than the limit can
         never be made to fit by wrapping or moving it to a new block."""
-        return Counter(self._memo).would_exceed(expression)
+        return Counter().would_exceed(expression)
 
 
 def is_within_limits(expressions: list['Expression']) -> bool:
@@ -188,8 +185,7 @@ def fix_action_limits(
     )
 
     result: list[Expression] = []
-    memo: dict[int, ActionCounts] = {}
-    global_counter = Counter(memo)
+    global_counter = Counter()
     index = 0
 
     while index < len(expressions):
@@ -219,7 +215,7 @@ def fix_action_limits(
                 break
 
             group: list[Expression] = []
-            group_counter = Counter(memo)
+            group_counter = Counter()
             while index < len(expressions) and expressions[index].can_be_nested():
                 if group_counter.would_exceed(expressions[index]):
                     break
@@ -296,6 +292,11 @@ def fix_action_limits(
             global_counter.increment(trigger)
             result.append(trigger)
 
+    check_nested_limits(result)
+    return result, remaining
+
+
+def check_nested_limits(result: list['Expression']) -> None:
     for expr in result:
         for nested_ref in expr.nested_expressions_refs():
             if not is_within_limits(nested_ref):
@@ -303,4 +304,299 @@ def fix_action_limits(
                     f'Expression {expr} contains nested expressions that exceed limits: {nested_ref}'
                 )
 
-    return result, remaining
+
+class PackingMode(Enum):
+    # Fill each block action by action, the way `fix_action_limits` does
+    GREEDY = 'greedy'
+    # Fewest overflow functions first, then fewest actions, see `pack_action_limits`
+    OPTIMAL = 'optimal'
+
+
+@final
+class PackingReport:
+    """Functions and actions a block ends up as when packed optimally, next to
+    what greedy packing would have made of it."""
+
+    block_name: str
+    greedy_functions: int
+    greedy_actions: int
+    optimal_functions: int
+    optimal_actions: int
+
+    def __init__(
+        self,
+        block_name: str,
+        *,
+        greedy_functions: int,
+        greedy_actions: int,
+        optimal_functions: int,
+        optimal_actions: int,
+    ) -> None:
+        self.block_name = block_name
+        self.greedy_functions = greedy_functions
+        self.greedy_actions = greedy_actions
+        self.optimal_functions = optimal_functions
+        self.optimal_actions = optimal_actions
+
+    @property
+    def saved_functions(self) -> int:
+        return self.greedy_functions - self.optimal_functions
+
+    @property
+    def saved_actions(self) -> int:
+        return self.greedy_actions - self.optimal_actions
+
+    @staticmethod
+    def compare(
+        block_name: str,
+        expressions: list['Expression'],
+    ) -> 'PackingReport':
+        from .actions.function import Function
+        from .expression.condition.conditional_expression import (
+            ConditionalExpression,
+        )
+
+        def simulate(pack: 'Packer') -> tuple[int, int]:
+            functions = 0
+            actions = 0
+            rest = expressions
+            while rest:
+                # Greedy packing appends the trigger to an empty conditional it
+                # finds in the block, which must not be one that was written
+                rest = [
+                    expr.cloned()
+                    if isinstance(expr, ConditionalExpression) and not expr.conditions
+                    else expr
+                    for expr in rest
+                ]
+                fixed, rest = pack(
+                    rest,
+                    function_if_exceeds=Function(f'{block_name} {functions + 2}'),
+                )
+                if not fixed:
+                    break
+                functions += 1
+                actions += count_actions(fixed)
+            return functions, actions
+
+        greedy_functions, greedy_actions = simulate(fix_action_limits)
+        optimal_functions, optimal_actions = simulate(pack_action_limits)
+        return PackingReport(
+            block_name,
+            greedy_functions=greedy_functions,
+            greedy_actions=greedy_actions,
+            optimal_functions=optimal_functions,
+            optimal_actions=optimal_actions,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f'{self.__class__.__name__}<{self.block_name!r}, '
+            f'functions {self.greedy_functions} -> {self.optimal_functions}, '
+            f'actions {self.greedy_actions} -> {self.optimal_actions}>'
+        )
+
+
+type Packer = Callable[..., tuple[list['Expression'], list['Expression']]]
+
+
+def count_actions(expressions: list['Expression']) -> int:
+    """Every rendered action in `expressions`, nested ones included."""
+    counter = Counter()
+    total = 0
+    for expr in expressions:
+        total += sum(counter.action_counts(expr).values())
+        for nested_ref in expr.nested_expressions_refs():
+            total += count_actions(nested_ref)
+    return total
+
+
+# Partial packings kept per expression, see `pack_action_limits`
+PACKING_FRONT_SIZE = 48
+
+type Vector = tuple[int, ...]
+
+
+@final
+class _PackingNode:
+    __slots__ = ('wrappers', 'top', 'run', 'parent', 'placement')
+
+    wrappers: int
+    top: Vector
+    run: Vector | None
+    parent: '_PackingNode | None'
+    placement: str
+
+    def __init__(
+        self,
+        wrappers: int,
+        top: Vector,
+        run: Vector | None,
+        parent: '_PackingNode | None',
+        placement: str,
+    ) -> None:
+        self.wrappers = wrappers
+        self.top = top
+        self.run = run
+        self.parent = parent
+        self.placement = placement
+
+    def dominates(self, other: '_PackingNode') -> bool:
+        # An open wrapper can always be left closed, so it is never worse
+        if self.wrappers > other.wrappers:
+            return False
+        if any(a > b for a, b in zip(self.top, other.top, strict=True)):
+            return False
+        if self.run is None:
+            return other.run is None
+        if other.run is None:
+            return True
+        return all(a <= b for a, b in zip(self.run, other.run, strict=True))
+
+
+def _prune(candidates: list[_PackingNode]) -> list[_PackingNode]:
+    candidates.sort(key=lambda node: (node.wrappers, sum(node.top), node.run is None))
+    front: list[_PackingNode] = []
+    for node in candidates:
+        if any(kept.dominates(node) for kept in front):
+            continue
+        front.append(node)
+        if len(front) >= PACKING_FRONT_SIZE:
+            break
+    return front
+
+
+def pack_action_limits(
+    expressions: list['Expression'],
+    *,
+    function_if_exceeds: 'Function | None' = None,
+) -> tuple[list['Expression'], list['Expression']]:
+    """Like `fix_action_limits`, but searches for the packing of the block
+    instead of filling it greedily.
+
+    Every expression is placed either in the block itself or in an empty
+    conditional wrapping a run of consecutive nestable expressions. A dynamic
+    program over the expressions keeps, per position, the partial packings
+    whose per class action counts are not dominated by another one with as
+    few wrappers. The block takes the longest prefix that still fits with the
+    trigger of the next function, which gives the fewest functions overall,
+    and the packing of that prefix with the fewest wrapping conditionals. Only
+    the `PACKING_FRONT_SIZE` packings with the fewest wrappers are kept per
+    position, so very mixed blocks may be packed slightly worse than possible.
+
+    Falls back to `fix_action_limits` for an expression that exceeds the
+    limits on its own, which greedy packing emits as is.
+    """
+    from .actions.trigger_function import TriggerFunctionExpression
+    from .expression.condition.conditional_expression import (
+        ConditionalExpression,
+        ConditionalMode,
+    )
+
+    def greedy() -> tuple[list['Expression'], list['Expression']]:
+        return fix_action_limits(expressions, function_if_exceeds=function_if_exceeds)
+
+    counter = Counter()
+    limits = get_limits()
+    item_counts = [counter.action_counts(expr) for expr in expressions]
+    classes: list[type[Expression] | type[PlaceholderEditable]] = [
+        ConditionalExpression,
+        TriggerFunctionExpression,
+    ]
+    for counts in item_counts:
+        classes.extend(cls for cls in counts if cls not in classes)
+    unlimited = len(expressions) + 2
+    limit = tuple(limits.get(cls, unlimited) for cls in classes)
+
+    def vector(counts: ActionCounts) -> Vector:
+        return tuple(counts.get(cls, 0) for cls in classes)
+
+    def add(a: Vector, b: Vector) -> Vector | None:
+        total = tuple(x + y for x, y in zip(a, b, strict=True))
+        if any(x > y for x, y in zip(total, limit, strict=True)):
+            return None
+        return total
+
+    zero = (0,) * len(classes)
+    wrapper = vector({ConditionalExpression: 1})
+    trigger = vector({TriggerFunctionExpression: 1})
+
+    def with_trigger(node: _PackingNode) -> _PackingNode | None:
+        if (top := add(node.top, trigger)) is not None:
+            return _PackingNode(node.wrappers, top, None, node, 'top')
+        if node.run is not None and (run := add(node.run, trigger)) is not None:
+            return _PackingNode(node.wrappers, node.top, run, node, 'join')
+        if (top := add(node.top, wrapper)) is not None:
+            return _PackingNode(node.wrappers + 1, top, trigger, node, 'open')
+        return None
+
+    front = [_PackingNode(0, zero, None, None, '')]
+    end = 0
+    best: _PackingNode | None = None
+    for index, expr in enumerate(expressions):
+        counts = vector(item_counts[index])
+        if add(zero, counts) is None:
+            return greedy()
+        nestable = expr.can_be_nested()
+        candidates: list[_PackingNode] = []
+        for node in front:
+            if (top := add(node.top, counts)) is not None:
+                candidates.append(_PackingNode(node.wrappers, top, None, node, 'top'))
+            if not nestable:
+                continue
+            if node.run is not None and (run := add(node.run, counts)) is not None:
+                candidates.append(
+                    _PackingNode(node.wrappers, node.top, run, node, 'join')
+                )
+            if (top := add(node.top, wrapper)) is not None:
+                candidates.append(
+                    _PackingNode(node.wrappers + 1, top, counts, node, 'open')
+                )
+        if not candidates:
+            break
+        front = _prune(candidates)
+        if index == len(expressions) - 1:
+            end, best = len(expressions), front[0]
+            break
+        finished = (
+            front
+            if function_if_exceeds is None
+            else [node for node in map(with_trigger, front) if node is not None]
+        )
+        if finished:
+            end = index + 1
+            best = min(finished, key=lambda node: node.wrappers)
+
+    if best is None:
+        return greedy()
+
+    placements: list[str] = []
+    node: _PackingNode | None = best
+    while node is not None and node.parent is not None:
+        placements.append(node.placement)
+        node = node.parent
+    placements.reverse()
+
+    items: list[Expression] = list(expressions[:end])
+    if end < len(expressions):
+        assert function_if_exceeds is not None
+        items.append(TriggerFunctionExpression(function_if_exceeds))
+    result: list[Expression] = []
+    for expr, placement in zip(items, placements, strict=True):
+        if placement == 'top':
+            result.append(expr)
+        elif placement == 'open':
+            result.append(
+                ConditionalExpression(
+                    conditions=[],
+                    mode=ConditionalMode.ALL,
+                    if_expressions=[expr],
+                )
+            )
+        else:
+            wrapping = result[-1]
+            assert isinstance(wrapping, ConditionalExpression)
+            wrapping.if_expressions.append(expr)
+
+    check_nested_limits(result)
+    return result, list(expressions[end:])
@@ -0,0 +1,94 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import NamedTuple, final
+
+__all__ = (
+    'ExportManifest',
+    'FunctionDiff',
+)
+
+
+MANIFEST_FORMAT_VERSION: int = 1
+
+
+class FunctionDiff(NamedTuple):
+    added: list[str]
+    changed: list[str]
+    removed: list[str]
+
+    @property
+    def to_import(self) -> set[str]:
+        """The functions HTSL has to import again to catch up."""
+        return {*self.added, *self.changed}
+
+    def summary(self) -> str:
+        parts = [
+            f'\x1b[38;2;0;255;0m{len(self.added)} added\x1b[0m',
+            f'\x1b[38;2;255;255;0m{len(self.changed)} changed\x1b[0m',
+            f'\x1b[38;2;255;0;0m{len(self.removed)} removed\x1b[0m',
+        ]
+        lines = [f'Functions since the previous export: {", ".join(parts)}']
+        for label, names in (
+            ('added', self.added),
+            ('changed', self.changed),
+            ('removed', self.removed),
+        ):
+            lines.extend(f'  {label}: {name}' for name in names)
+        return '\n'.join(lines)
+
+
+@final
+class ExportManifest:
+    """Content hashes of the rendered blocks of an export, by block name, kept
+    next to the `.htsl` file so the next export knows what changed since."""
+
+    hashes: dict[str, str]
+
+    def __init__(self, hashes: dict[str, str]) -> None:
+        self.hashes = hashes
+
+    @classmethod
+    def from_rendered(cls, rendered: dict[str, str]) -> 'ExportManifest':
+        return cls(
+            {
+                name: hashlib.sha256(htsl.encode()).hexdigest()
+                for name, htsl in rendered.items()
+            }
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> 'ExportManifest | None':
+        """The manifest stored at `path`, or None when there is none yet or it
+        was written by an incompatible version."""
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get('format') != MANIFEST_FORMAT_VERSION:
+            return None
+        return cls(dict(data['blocks']))
+
+    def dump(self, path: Path) -> None:
+        path.write_text(
+            json.dumps(
+                {'format': MANIFEST_FORMAT_VERSION, 'blocks': self.hashes},
+                indent=2,
+            )
+            + '\n',
+            encoding='utf-8',
+        )
+
+    def diff(self, previous: 'ExportManifest | None') -> FunctionDiff:
+        """What changed since `previous`, in the order of this export. Without a
+        previous manifest every block counts as added."""
+        old = {} if previous is None else previous.hashes
+        return FunctionDiff(
+            added=[name for name in self.hashes if name not in old],
+            changed=[
+                name
+                for name, digest in self.hashes.items()
+                if name in old and old[name] != digest
+            ],
+            removed=[name for name in old if name not in self.hashes],
+        )
@@ -1,6 +1,10 @@
+import hashlib
 import json
+import re
+from collections.abc import Callable, Generator, Iterator, Mapping
+from functools import lru_cache
 from pathlib import Path
-from typing import Literal, TypedDict
+from typing import Literal, TypedDict, cast, final
 
 from ..nbt import NBTCompound, NBTInt, NBTList, NBTString
 
@@ -2410,38 +2414,222 @@ class SkullData(TypedDict):
 
 
 SKULL_DATA_FILE = HERE / 'skulls.json'
+SKULL_INDEX_FILE = HERE / 'skulls.index.json'
+SKULL_CACHE_SIZE: int = 256
 
+WHITESPACE = re.compile(r'[ \t\n\r]*')
 
-def read_skull_data() -> SkullData:
-    raw = json.loads(SKULL_DATA_FILE.read_text(encoding='utf-8'))
+
+def into_category_key(category: str) -> str:
+    return category.lower().replace(' ', '_')
+
+
+def skip_whitespace(text: str, index: int) -> int:
+    match = WHITESPACE.match(text, index)
+    assert match is not None
+    return match.end()
+
+
+def iter_object_spans(
+    text: str,
+    start: int,
+) -> Generator[tuple[str, int, int], None, None]:
+    """The key and the start and end offsets of the value of every member of
+    the JSON object that starts at `start`."""
+    decoder = json.JSONDecoder()
+    index = skip_whitespace(text, start + 1)
+    if text[index] == '}':
+        return
+    while True:
+        key, index = decoder.raw_decode(text, index)
+        index = skip_whitespace(text, index)
+        assert text[index] == ':', f'Expected ":" at offset {index}'
+        value_start = skip_whitespace(text, index + 1)
+        _, value_end = decoder.raw_decode(text, value_start)
+        yield key, value_start, value_end
+        index = skip_whitespace(text, value_end)
+        if text[index] == '}':
+            return
+        assert text[index] == ',', f'Expected "," at offset {index}'
+        index = skip_whitespace(text, index + 1)
+
+
+type SkullIndex = dict[str, dict[str, tuple[int, int]]]
+
+
+def build_skull_index(text: str) -> SkullIndex:
+    """Category to skull name to the offset and length of that skull's entry
+    inside `skulls.json`."""
+    # Offsets are used as byte offsets into the file
+    assert text.isascii(), 'skulls.json must be written with ensure_ascii'
+    start = skip_whitespace(text, 0)
     return {
-        key.lower().replace(' ', '_'): {
-            sub_key: NBTCompound(
+        into_category_key(category): {
+            name: (skull_start, skull_end - skull_start)
+            for name, skull_start, skull_end in iter_object_spans(text, category_start)
+        }
+        for category, category_start, _ in iter_object_spans(text, start)
+    }
+
+
+def skull_data_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def write_skull_index() -> None:
+    """Regenerates `skulls.index.json`, run this after changing `skulls.json`."""
+    data = SKULL_DATA_FILE.read_bytes()
+    index = build_skull_index(data.decode('ascii'))
+    SKULL_INDEX_FILE.write_text(
+        json.dumps(
+            {'size': len(data), 'sha256': skull_data_digest(data), 'categories': index},
+            separators=(',', ':'),
+        ),
+        encoding='utf-8',
+    )
+
+
+def read_skull_index(
+    data_file: Path = SKULL_DATA_FILE,
+    index_file: Path = SKULL_INDEX_FILE,
+) -> SkullIndex:
+    # Read as bytes, newlines translated by a checkout would move the offsets
+    data = data_file.read_bytes()
+    try:
+        raw = json.loads(index_file.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        raw = None
+    if (
+        raw is None
+        or raw.get('size') != len(data)
+        or raw.get('sha256') != skull_data_digest(data)
+    ):
+        # Missing or stale index, still correct but slower to start up
+        return build_skull_index(data.decode('ascii'))
+    return {
+        category: {name: (offset, length) for name, (offset, length) in skulls.items()}
+        for category, skulls in raw['categories'].items()
+    }
+
+
+def create_skull_nbt(skull_id: str, texture: str) -> NBTCompound:
+    return NBTCompound(
+        {
+            'Id': NBTString(skull_id),
+            'hypixelPopulated': NBTInt(1),
+            'Properties': NBTCompound(
                 {
-                    'Id': NBTString(sub_value['id']),
-                    'hypixelPopulated': NBTInt(1),
-                    'Properties': NBTCompound(
-                        {
-                            'textures': NBTList(
-                                [
-                                    NBTCompound(
-                                        {
-                                            'Signature': NBTString(
-                                                'I love https://github.com/69Jesse'
-                                            ),
-                                            'Value': NBTString(sub_value['texture']),
-                                        }
-                                    )
-                                ]
+                    'textures': NBTList(
+                        [
+                            NBTCompound(
+                                {
+                                    'Signature': NBTString(
+                                        'I love https://github.com/69Jesse'
+                                    ),
+                                    'Value': NBTString(texture),
+                                }
                             )
-                        }
-                    ),
+                        ]
+                    )
                 }
-            )
+            ),
+        }
+    )
+
+
+@final
+class SkullCategory(Mapping[str, NBTCompound]):
+    store: 'SkullStore'
+    category: str
+    offsets: dict[str, tuple[int, int]]
+
+    def __init__(
+        self,
+        store: 'SkullStore',
+        category: str,
+        offsets: dict[str, tuple[int, int]],
+    ) -> None:
+        self.store = store
+        self.category = category
+        self.offsets = offsets
+
+    def __getitem__(self, name: str) -> NBTCompound:
+        if name not in self.offsets:
+            raise KeyError(name)
+        return self.store.load(self.category, name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}<{self.category}, skulls={len(self)}>'
+
+
+@final
+class SkullStore(Mapping[str, SkullCategory]):
+    """Every skull in `skulls.json` by category and name. Only the offsets of
+    the skulls are kept in memory, a skull is read from the file and turned
+    into NBT when it is looked up, and the most recent ones are cached."""
+
+    path: Path
+    index_loader: Callable[[], SkullIndex]
+    _categories: dict[str, SkullCategory] | None
+    load: Callable[[str, str], NBTCompound]
+
+    def __init__(
+        self,
+        path: Path,
+        index_loader: Callable[[], SkullIndex],
+        *,
+        cache_size: int = SKULL_CACHE_SIZE,
+    ) -> None:
+        self.path = path
+        self.index_loader = index_loader
+        self._categories = None
+        self.load = lru_cache(maxsize=cache_size)(self._load)
+
+    @property
+    def categories(self) -> dict[str, SkullCategory]:
+        if self._categories is None:
+            self._categories = {
+                category: SkullCategory(self, category, offsets)
+                for category, offsets in self.index_loader().items()
+            }
+        return self._categories
+
+    def _load(self, category: str, name: str) -> NBTCompound:
+        offset, length = self.categories[category].offsets[name]
+        with self.path.open('rb') as file:
+            file.seek(offset)
+            raw = json.loads(file.read(length))
+        return create_skull_nbt(raw['id'], raw['texture'])
+
+    def __getitem__(self, category: str) -> SkullCategory:
+        return self.categories[category]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.categories)
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}<categories={len(self)}>'
+
+
+def read_skull_data() -> SkullData:
+    """Every skull as NBT at once, prefer looking them up in `SKULL_DATA`."""
+    raw = json.loads(SKULL_DATA_FILE.read_text(encoding='utf-8'))
+    return {
+        into_category_key(key): {
+            sub_key: create_skull_nbt(sub_value['id'], sub_value['texture'])
             for sub_key, sub_value in value.items()
         }
         for key, value in raw.items()
     }  # pyright: ignore[reportReturnType]
 
 
-SKULL_DATA: SkullData = read_skull_data()
+SKULL_DATA: SkullData = cast('SkullData', SkullStore(SKULL_DATA_FILE, read_skull_index))
@@ -1,6 +1,6 @@
 import re
 from abc import ABC, abstractmethod
-from typing import Any, Self
+from typing import Any, NoReturn, Self, final
 
 import numpy as np
 
@@ -20,6 +20,12 @@ class NBT[T](ABC):
         """
         raise NotImplementedError
 
+    def write_snbt(self, out: list[str]) -> None:
+        """
+        Append the SNBT of the NBT object to `out`, in parts.
+        """
+        out.append(self.into_snbt())
+
     @abstractmethod
     def into_object(self) -> Any:
         """
@@ -33,7 +39,14 @@ class NBT[T](ABC):
         Load the NBT object from a string in SNBT format.
         Raises an exception if the string is not valid SNBT.
         """
-        nbt, offset = cls._parse_snbt(s)
+        if cls is NBT:
+            try:
+                nbt, offset = SNBTParser(s).parse_value(0)
+            except SNBTParserError:
+                # Invalid SNBT, let the per-type parsers raise their error
+                nbt, offset = cls._parse_snbt(s)
+        else:
+            nbt, offset = cls._parse_snbt(s)
         if offset == len(s):
             return nbt
         raise ValueError(
@@ -364,7 +377,17 @@ class NBTList[T: NBT](NBT[list[T]]):
         super().__init__(value)
 
     def into_snbt(self) -> str:
-        return f'[{",".join(item.into_snbt() for item in self.value)}]'
+        out: list[str] = []
+        self.write_snbt(out)
+        return ''.join(out)
+
+    def write_snbt(self, out: list[str]) -> None:
+        out.append('[')
+        for index, item in enumerate(self.value):
+            if index:
+                out.append(',')
+            item.write_snbt(out)
+        out.append(']')
 
     def into_object(self) -> list[T]:
         return [item.into_object() for item in self.value]
@@ -444,19 +467,21 @@ class NBTCompound[V: NBT](NBT[dict[str, V]]):
         super().__init__(value)
 
     def into_snbt(self) -> str:
-        def format_key(key: str) -> str:
-            if not re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', key):
-                return BaseObject.inline_quoted(key)
-            return key
-
-        return (
-            '{'
-            + ','.join(
-                f'{format_key(key)}:{item.into_snbt()}'
-                for key, item in self.value.items()
+        out: list[str] = []
+        self.write_snbt(out)
+        return ''.join(out)
+
+    def write_snbt(self, out: list[str]) -> None:
+        out.append('{')
+        for index, (key, item) in enumerate(self.value.items()):
+            if index:
+                out.append(',')
+            out.append(
+                key if self.KEY_REGEX.match(key) else BaseObject.inline_quoted(key)
             )
-            + '}'
-        )
+            out.append(':')
+            item.write_snbt(out)
+        out.append('}')
 
     def into_object(self) -> dict[str, Any]:
         return {key: item.into_object() for key, item in self.value.items()}
@@ -561,9 +586,17 @@ class NBTGenericArray[IT: NBT, OT](NBT[list[IT]]):
         super().__init__(value)
 
     def into_snbt(self) -> str:
-        return (
-            f'[{self.id_character};{",".join(item.into_snbt() for item in self.value)}]'
-        )
+        out: list[str] = []
+        self.write_snbt(out)
+        return ''.join(out)
+
+    def write_snbt(self, out: list[str]) -> None:
+        out.append(f'[{self.id_character};')
+        for index, item in enumerate(self.value):
+            if index:
+                out.append(',')
+            item.write_snbt(out)
+        out.append(']')
 
     def into_object(self) -> list[OT]:
         return [item.into_object() for item in self.value]
@@ -629,3 +662,164 @@ class NBTIntArray(NBTGenericArray[NBTInt, int], item_type=NBTInt, id_character='
 
 class NBTLongArray(NBTGenericArray[NBTLong, int], item_type=NBTLong, id_character='L'):
     pass
+
+
+class SNBTParserError(Exception):
+    pass
+
+
+@final
+class SNBTParser:
+    """
+    Parses SNBT with a single cursor, dispatching on the first character of
+    every value instead of trying every type in turn, and without slicing off
+    the rest of the string.
+    Accepts exactly what the `_parse_snbt` class methods accept and builds the
+    same NBT objects. Anything else raises `SNBTParserError`, so that those can
+    raise their own error for it.
+    """
+
+    DIGITS_REGEX: re.Pattern[str] = re.compile(r'-?([0-9]+)')
+    FRACTION_REGEX: re.Pattern[str] = re.compile(r'\.[0-9]+')
+    KEY_END_REGEX: re.Pattern[str] = re.compile(r'[^:,}]*')
+
+    text: str
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    @staticmethod
+    def fail() -> NoReturn:
+        raise SNBTParserError()
+
+    def parse_value(self, offset: int) -> tuple[NBT, int]:
+        """
+        Parse the value starting at `offset`.
+        Returns a tuple of the NBT object and the offset right after it.
+        """
+        if offset >= len(self.text):
+            self.fail()
+        character = self.text[offset]
+        if character == '{':
+            return self.parse_compound(offset)
+        if character == '[':
+            return self.parse_list(offset)
+        if character in ('"', "'"):
+            return self.parse_string(offset)
+        if character == '-' or '0' <= character <= '9':
+            return self.parse_number(offset)
+        self.fail()
+
+    def parse_number(self, offset: int) -> tuple[NBT, int]:
+        # Mirrors the number types being tried in order of definition, so for
+        # example `5l` is an int followed by `l`, like it is for `_parse_snbt`
+        text = self.text
+        match = self.DIGITS_REGEX.match(text, offset)
+        if match is None:
+            self.fail()
+        digits_start, end = match.span(1)
+        digit_count = end - digits_start
+        suffix = text[end] if end < len(text) else ''
+
+        if suffix in ('b', 'B') and digit_count <= 3:
+            try:
+                return NBTByte(int(text[offset:end])), end + 1
+            except ValueError:
+                pass
+        if suffix in ('s', 'S') and digit_count <= 5:
+            try:
+                return NBTShort(int(text[offset:end])), end + 1
+            except ValueError:
+                pass
+        int_end = digits_start + min(digit_count, 10)
+        try:
+            return NBTInt(int(text[offset:int_end])), int_end
+        except ValueError:
+            pass
+        if suffix in ('l', 'L') and digit_count <= 19:
+            try:
+                return NBTLong(int(text[offset:end])), end + 1
+            except ValueError:
+                pass
+
+        fraction = self.FRACTION_REGEX.match(text, end)
+        if fraction is not None:
+            end = fraction.end()
+        value = float(text[offset:end])
+        suffix = text[end] if end < len(text) else ''
+        if suffix in ('f', 'F'):
+            return NBTFloat(value), end + 1
+        if suffix in ('d', 'D'):
+            return NBTDouble(value), end + 1
+        return NBTDouble(value), end
+
+    def parse_string(self, offset: int) -> tuple[NBTString, int]:
+        text = self.text
+        quote = text[offset]
+        end = offset + 1
+        while True:
+            end = text.find(quote, end)
+            if end == -1:
+                self.fail()
+            if text[end - 1] != '\\':
+                break
+            end += 1
+        return NBTString(text[offset + 1 : end]), end + 1
+
+    def parse_list(self, offset: int) -> tuple[NBTList, int]:
+        text = self.text
+        offset += 1
+        items: list[NBT] = []
+        while offset < len(text) and text[offset] != ']':
+            prefix = f'{len(items)}:'
+            if text.startswith(prefix, offset):
+                offset += len(prefix)
+            item, offset = self.parse_value(offset)
+            items.append(item)
+            if offset >= len(text):
+                self.fail()
+            if text[offset] == ']':
+                break
+            if text[offset] != ',':
+                self.fail()
+            offset += 1
+        if offset >= len(text):
+            self.fail()
+        try:
+            return NBTList(items), offset + 1
+        except ValueError:
+            self.fail()
+
+    def parse_compound(self, offset: int) -> tuple[NBTCompound, int]:
+        text = self.text
+        offset += 1
+        compound: dict[str, NBT] = {}
+        while offset < len(text) and text[offset] != '}':
+            key_start = offset
+            match = self.KEY_END_REGEX.match(text, offset)
+            assert match is not None
+            offset = match.end()
+            if offset >= len(text) or text[offset] != ':':
+                self.fail()
+            raw_key = text[key_start:offset]
+            key = raw_key.strip()
+            if not NBTCompound.KEY_REGEX.match(key):
+                try:
+                    key = NBTString._parse_snbt(raw_key)[0].into_object()
+                except ValueError:
+                    self.fail()
+            if key in compound:
+                self.fail()
+
+            value, offset = self.parse_value(offset + 1)
+            compound[key] = value
+            if offset >= len(text):
+                self.fail()
+            if text[offset] == '}':
+                break
+            if text[offset] != ',':
+                self.fail()
+            offset += 1
+        if offset >= len(text):
+            self.fail()
+        return NBTCompound(compound), offset + 1
@@ -0,0 +1,208 @@
+import json
+import sys
+from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from time import perf_counter
+from typing import Any, final
+
+from .utils.log import log
+
+__all__ = (
+    'CompileProfiler',
+    'PhaseTiming',
+    'enable_profiler',
+    'disable_profiler',
+    'get_profiler',
+    'profiled',
+)
+
+
+DEFAULT_JSON_PATH: Path = Path('pyhtsl-profile.json')
+DEFAULT_COLLAPSED_PATH: Path = Path('pyhtsl-profile.folded')
+
+
+@final
+class PhaseTiming:
+    count: int
+    total: float
+    own: float
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.own = 0.0
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}<x{self.count}, {self.total * 1000:.2f}ms>'
+
+
+@final
+class CompileProfiler:
+    """Times the phases of compiling, finalizing and exporting blocks.
+
+    Phases nest: each timing is keyed by the stack of phases it ran in, with
+    the block name at the bottom, so the same phase is told apart per block
+    and per caller. `own` leaves out the time spent in nested phases.
+    """
+
+    timings: dict[tuple[str, ...], PhaseTiming]
+    stack: list[str]
+    nested_time: list[float]
+    json_path: Path | None
+    collapsed_path: Path | None
+
+    def __init__(
+        self,
+        *,
+        json_path: Path | None = None,
+        collapsed_path: Path | None = None,
+    ) -> None:
+        self.timings = {}
+        self.stack = []
+        self.nested_time = []
+        self.json_path = json_path
+        self.collapsed_path = collapsed_path
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        self.stack.append(name)
+        self.nested_time.append(0.0)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            nested = self.nested_time.pop()
+            key = tuple(self.stack)
+            self.stack.pop()
+            timing = self.timings.get(key)
+            if timing is None:
+                timing = self.timings[key] = PhaseTiming()
+            timing.count += 1
+            timing.total += elapsed
+            timing.own += elapsed - nested
+            if self.nested_time:
+                self.nested_time[-1] += elapsed
+
+    def time[T](self, name: str, func: Callable[[], T]) -> T:
+        with self.phase(name):
+            return func()
+
+    def by_phase(self) -> dict[str, PhaseTiming]:
+        """Timings summed over every stack a phase ran in, by phase name."""
+        phases: dict[str, PhaseTiming] = {}
+        for key, timing in self.timings.items():
+            summed = phases.get(key[-1])
+            if summed is None:
+                summed = phases[key[-1]] = PhaseTiming()
+            summed.count += timing.count
+            summed.own += timing.own
+            # A phase running inside itself would be counted twice
+            if key[-1] not in key[:-1]:
+                summed.total += timing.total
+        return phases
+
+    def summary(self) -> str:
+        phases = sorted(
+            self.by_phase().items(),
+            key=lambda item: item[1].own,
+            reverse=True,
+        )
+        overall = sum(timing.own for timing in self.timings.values()) or 1.0
+        lines = [
+            f'{"phase":<32} {"count":>8} {"total ms":>10} {"own ms":>10} {"own %":>6}'
+        ]
+        for name, timing in phases:
+            lines.append(
+                f'{name[:32]:<32} {timing.count:>8} {timing.total * 1000:>10.2f} '
+                f'{timing.own * 1000:>10.2f} {timing.own / overall:>6.1%}'
+            )
+        return '\n'.join(lines)
+
+    def to_json(self) -> list[dict[str, Any]]:
+        return [
+            {
+                'stack': list(key),
+                'count': timing.count,
+                'total_ms': timing.total * 1000,
+                'own_ms': timing.own * 1000,
+            }
+            for key, timing in sorted(
+                self.timings.items(),
+                key=lambda item: item[1].total,
+                reverse=True,
+            )
+        ]
+
+    def dump_json(self, path: Path | str) -> None:
+        Path(path).write_text(json.dumps(self.to_json(), indent=2), encoding='utf-8')
+
+    def dump_collapsed(self, path: Path | str) -> None:
+        """Writes one `block;phase;nested phase <microseconds>` line per stack,
+        the input format of flamegraph.pl, speedscope and inferno."""
+        with Path(path).open('w', encoding='utf-8') as file:
+            for key, timing in self.timings.items():
+                frames = ';'.join(frame.replace(';', ',') for frame in key)
+                file.write(f'{frames} {round(timing.own * 1_000_000)}\n')
+
+    def report(self) -> None:
+        if not self.timings:
+            return
+        log(f'\n\x1b[38;2;0;255;0mCompile profile\x1b[0m\n{self.summary()}')
+        if self.json_path is not None:
+            self.dump_json(self.json_path)
+            log(
+                f'Wrote the compile profile to \x1b[38;2;0;255;0m{self.json_path}\x1b[0m'
+            )
+        if self.collapsed_path is not None:
+            self.dump_collapsed(self.collapsed_path)
+            log(
+                f'Wrote the collapsed stacks to \x1b[38;2;0;255;0m{self.collapsed_path}\x1b[0m'
+            )
+
+
+def _profiler_from_args() -> CompileProfiler | None:
+    """`profile` prints the summary on exit, `profile-json` and
+    `profile-folded` also dump it next to the script that is run."""
+    args = sys.argv[1:]
+    json_path = DEFAULT_JSON_PATH if 'profile-json' in args else None
+    collapsed_path = DEFAULT_COLLAPSED_PATH if 'profile-folded' in args else None
+    if 'profile' not in args and json_path is None and collapsed_path is None:
+        return None
+    return CompileProfiler(json_path=json_path, collapsed_path=collapsed_path)
+
+
+PROFILER: CompileProfiler | None = _profiler_from_args()
+
+
+def enable_profiler(
+    *,
+    json_path: Path | str | None = None,
+    collapsed_path: Path | str | None = None,
+) -> CompileProfiler:
+    """Times every compile phase from now on. A summary is printed when the
+    program exits, and optionally dumped to `json_path` and, as collapsed
+    stacks for flame graphs, to `collapsed_path`."""
+    global PROFILER
+    PROFILER = CompileProfiler(
+        json_path=None if json_path is None else Path(json_path),
+        collapsed_path=None if collapsed_path is None else Path(collapsed_path),
+    )
+    return PROFILER
+
+
+def disable_profiler() -> None:
+    global PROFILER
+    PROFILER = None
+
+
+def get_profiler() -> CompileProfiler | None:
+    return PROFILER
+
+
+def profiled(name: str) -> AbstractContextManager[None]:
+    """Times the body as the phase `name`, if profiling is enabled."""
+    if PROFILER is None:
+        return nullcontext()
+    return PROFILER.phase(name)
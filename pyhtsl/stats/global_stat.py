@@ -24,6 +24,8 @@ class GlobalStat(
     pattern=re.compile(r'%var\.global/([^%]+)%'),
     pattern_factory=_global_stat_factory,
 ):
+    __slots__ = ()
+
     @staticmethod
     def left_side_keyword() -> str:
         return 'globalvar'
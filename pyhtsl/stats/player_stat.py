@@ -41,6 +41,8 @@ class PlayerStat(
     pattern=re.compile(r'%var\.player/([^%]+)%'),
     pattern_factory=_player_stat_factory,
 ):
+    __slots__ = ()
+
     @staticmethod
     def left_side_keyword() -> str:
         return 'var'
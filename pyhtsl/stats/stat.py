@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import Self
+from typing import TYPE_CHECKING, Self
 
 from ..actions.no_fallback_values import no_fallback_values
 from ..editable import Editable
@@ -7,12 +7,24 @@ from ..expression.housing_type import HousingType
 from ..expression.unset_expression import UnsetExpression
 from ..internal_type import InternalType
 
+if TYPE_CHECKING:
+    from ..expression.value_range import ValueRange
+
 __all__ = ('Stat',)
 
 
 class Stat(Editable):
+    __slots__ = (
+        'internal_type',
+        'fallback_value',
+        'name',
+        'auto_unset',
+        'value_range',
+    )
+
     name: str
     auto_unset: bool
+    value_range: 'ValueRange | None'
 
     def __init__(
         self,
@@ -29,6 +41,7 @@ class Stat(Editable):
         )
         self.name = name
         self.auto_unset = auto_unset
+        self.value_range = None
 
     def into_hashable(self) -> tuple[object, ...]:
         return (*super().into_hashable(), self.name)
@@ -106,6 +119,11 @@ class Stat(Editable):
     def is_same_stat(self, other: object) -> bool:
         return self.equals_raw(other)
 
+    def stat_key(self) -> tuple[object, ...]:
+        """Hashable identity of the stored value: two stats have equal keys
+        exactly when `is_same_stat` holds between them."""
+        return (self.__class__, self.name)
+
     def with_auto_unset(self, flag: bool = True) -> Self:
         """
         Creates a copy of the current object, with the automatic unset flag set to the given value.
@@ -122,9 +140,26 @@ class Stat(Editable):
         clone.auto_unset = False
         return clone
 
+    def declared_range(self) -> 'ValueRange | None':
+        return self.value_range
+
+    def with_range(self, lower: float, upper: float) -> Self:
+        """
+        Creates a copy of the current object, promising it always holds a value from `lower` to `upper`, both included.
+        `%` and `abs()` on it then leave out the check making their result positive where it can not be negative.
+        """
+        from ..expression.value_range import ValueRange
+
+        if lower > upper:
+            raise ValueError('lower must not be greater than upper')
+        clone = self.cloned()
+        clone.value_range = ValueRange(lower, upper)
+        return clone
+
     def cloned(self) -> Self:
         clone = super().cloned()
         clone.auto_unset = self.auto_unset
+        clone.value_range = self.value_range
         return clone
 
     def unset(self) -> None:
@@ -26,6 +26,8 @@ class TeamStat(
     pattern=re.compile(r'%var\.team/([^%]+)%'),
     pattern_factory=_team_stat_factory,
 ):
+    __slots__ = ('team',)
+
     team: Team | None
 
     def __init__(
@@ -86,6 +88,9 @@ class TeamStat(
             return False
         return self.team == other.team
 
+    def stat_key(self) -> tuple[object, ...]:
+        return (*super().stat_key(), self.team)
+
     def cloned_raw(self) -> 'TeamStat':
         return TeamStat(self.name, self.team)
 
@@ -11,9 +11,13 @@ class Number:
     counter: ClassVar[int] = 1_000_000
 
     @staticmethod
-    def new() -> 'Number':
+    def next_value() -> int:
         Number.counter += 1
-        return Number(Number.counter)
+        return Number.counter
+
+    @staticmethod
+    def new() -> 'Number':
+        return Number(Number.next_value())
 
     value: int
     finalized: bool
@@ -25,6 +29,8 @@ class Number:
 
 @final
 class TemporaryStat(Stat):
+    __slots__ = ('_number',)
+
     name_prefix: ClassVar[str] = 'tmp'
 
     _number: Number
@@ -0,0 +1,50 @@
+from typing import Any
+
+__all__ = (
+    'slot_fields',
+    'has_undeclared_fields',
+    'field_values',
+)
+
+
+_SLOT_FIELDS: dict[type, tuple[tuple[str, Any], ...]] = {}
+
+
+def _slot_descriptors(cls: type) -> tuple[tuple[str, Any], ...]:
+    descriptors = _SLOT_FIELDS.get(cls)
+    if descriptors is None:
+        found: dict[str, Any] = {}
+        for klass in reversed(cls.__mro__):
+            slots = klass.__dict__.get('__slots__', ())
+            for name in (slots,) if isinstance(slots, str) else slots:
+                if name in ('__dict__', '__weakref__'):
+                    continue
+                # The descriptor itself, so a property of the same name in a
+                # subclass (like `TemporaryStat.name`) does not get in the way
+                found[name] = klass.__dict__[name]
+        descriptors = _SLOT_FIELDS[cls] = tuple(found.items())
+    return descriptors
+
+
+def slot_fields(cls: type) -> tuple[str, ...]:
+    """Every field declared in `__slots__` along the MRO of `cls`, base classes
+    first."""
+    return tuple(name for name, _ in _slot_descriptors(cls))
+
+
+def has_undeclared_fields(cls: type) -> bool:
+    """Whether instances of `cls` have a `__dict__`, which happens as soon as
+    one class in its MRO does not declare `__slots__`."""
+    return any('__dict__' in klass.__dict__ for klass in cls.__mro__)
+
+
+def field_values(value: object) -> dict[str, Any]:
+    """Every field that is set on `value`, from its slots and its `__dict__`."""
+    fields: dict[str, Any] = {}
+    for name, descriptor in _slot_descriptors(type(value)):
+        try:
+            fields[name] = descriptor.__get__(value, type(value))
+        except AttributeError:
+            continue
+    fields.update(getattr(value, '__dict__', ()))
+    return fields
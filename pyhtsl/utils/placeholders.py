@@ -1,18 +1,166 @@
-def get_placeholder_parts(value: str) -> list[str]:
+import re
+from collections.abc import Callable, Generator
+from importlib import import_module
+from typing import TYPE_CHECKING, ClassVar
+
+if TYPE_CHECKING:
     from ..checkable import Checkable
 
-    spans: list[tuple[int, int]] = []
-    for pattern, _ in Checkable.iter_pattern_factories():
-        for match in pattern.finditer(value):
-            spans.append(match.span())
 
-    spans.sort()
+__all__ = (
+    'PlaceholderRegistry',
+    'get_placeholder_parts',
+)
+
+
+type PlaceholderFactory = Callable[[re.Match[str]], 'Checkable']
+
+
+# Modules defining a `Checkable` with a placeholder pattern. The package is
+# imported lazily, so these are imported before the first scan to make sure
+# every pattern is registered. `tests/test_lazy_import.py` fails when a module
+# giving a class a pattern is missing here.
+PLACEHOLDER_MODULES: tuple[str, ...] = (
+    '.actions.date_unix',
+    '.actions.group_color',
+    '.actions.group_name',
+    '.actions.group_priority',
+    '.actions.group_tag',
+    '.actions.house_cookies',
+    '.actions.house_guests',
+    '.actions.house_players',
+    '.actions.house_visiting_rules',
+    '.actions.player_block_x',
+    '.actions.player_block_y',
+    '.actions.player_block_z',
+    '.actions.player_experience',
+    '.actions.player_gamemode',
+    '.actions.player_health',
+    '.actions.player_hunger',
+    '.actions.player_level',
+    '.actions.player_max_health',
+    '.actions.player_name',
+    '.actions.player_ping',
+    '.actions.player_position_pitch',
+    '.actions.player_position_x',
+    '.actions.player_position_y',
+    '.actions.player_position_yaw',
+    '.actions.player_position_z',
+    '.actions.player_protocol',
+    '.actions.player_version',
+    '.actions.random_decimal',
+    '.actions.random_whole',
+    '.actions.server_name',
+    '.actions.server_short_name',
+    '.actions.team_color',
+    '.actions.team_name',
+    '.actions.team_players',
+    '.actions.team_tag',
+    '.stats.global_stat',
+    '.stats.player_stat',
+    '.stats.team_stat',
+)
+
+
+class PlaceholderRegistry:
+    """Every placeholder pattern registered by a `Checkable` subclass, compiled
+    into one alternation so a string is tokenized in a single pass.
+
+    Each pattern is wrapped in a named group to tell which one matched. That
+    pattern is then matched again at the same position, so the factory gets a
+    match object with the pattern's own group numbering.
+    """
+
+    entries: ClassVar[
+        list[tuple[type['Checkable'], re.Pattern[str], PlaceholderFactory]]
+    ] = []
+    _scanner: ClassVar[re.Pattern[str] | None] = None
+    _modules_loaded: ClassVar[bool] = False
 
+    @staticmethod
+    def load_modules() -> None:
+        if PlaceholderRegistry._modules_loaded:
+            return
+        PlaceholderRegistry._modules_loaded = True
+        for module_name in PLACEHOLDER_MODULES:
+            import_module(module_name, 'pyhtsl')
+
+    @staticmethod
+    def all_entries() -> list[
+        tuple[type['Checkable'], re.Pattern[str], PlaceholderFactory]
+    ]:
+        PlaceholderRegistry.load_modules()
+        return PlaceholderRegistry.entries
+
+    @staticmethod
+    def register(
+        owner: type['Checkable'],
+        pattern: re.Pattern[str],
+        factory: PlaceholderFactory,
+    ) -> None:
+        PlaceholderRegistry.entries.append((owner, pattern, factory))
+        PlaceholderRegistry._scanner = None
+
+    @staticmethod
+    def scanner() -> re.Pattern[str]:
+        PlaceholderRegistry.load_modules()
+        if PlaceholderRegistry._scanner is None:
+            PlaceholderRegistry._scanner = re.compile(
+                '|'.join(
+                    f'(?P<_{index}>{pattern.pattern})'
+                    for index, (_, pattern, _) in enumerate(PlaceholderRegistry.entries)
+                )
+                or '(?!)'
+            )
+        return PlaceholderRegistry._scanner
+
+    @staticmethod
+    def _entry_of(
+        found: re.Match[str],
+    ) -> tuple[re.Pattern[str], PlaceholderFactory]:
+        assert found.lastgroup is not None
+        _, pattern, factory = PlaceholderRegistry.entries[int(found.lastgroup[1:])]
+        return pattern, factory
+
+    @staticmethod
+    def scan(
+        text: str,
+    ) -> Generator[tuple[re.Match[str], PlaceholderFactory], None, None]:
+        """Every placeholder in `text`, left to right and without overlaps, with
+        the factory that turns its match into a `Checkable`."""
+        if '%' not in text:
+            return
+        for found in PlaceholderRegistry.scanner().finditer(text):
+            pattern, factory = PlaceholderRegistry._entry_of(found)
+            match = pattern.match(text, found.start())
+            assert match is not None
+            yield match, factory
+
+    @staticmethod
+    def fullmatch(text: str) -> tuple[re.Match[str], PlaceholderFactory] | None:
+        """The placeholder `text` consists of, if it is exactly one."""
+        if '%' not in text:
+            return None
+        found = PlaceholderRegistry.scanner().fullmatch(text)
+        if found is None:
+            return None
+        pattern, factory = PlaceholderRegistry._entry_of(found)
+        match = pattern.fullmatch(text)
+        assert match is not None
+        return match, factory
+
+    @staticmethod
+    def has_any(text: str) -> bool:
+        if '%' not in text:
+            return False
+        return PlaceholderRegistry.scanner().search(text) is not None
+
+
+def get_placeholder_parts(value: str) -> list[str]:
     parts: list[str] = []
     last_index = 0
-    for start, end in spans:
-        if start < last_index:
-            continue
+    for match, _ in PlaceholderRegistry.scan(value):
+        start, end = match.span()
         parts.append(value[last_index:start])
         parts.append(value[start:end])
         last_index = end
@@ -0,0 +1,111 @@
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import final
+
+from .build import BuildJob, BuildResult, resolve_imports_folder, run_build_job
+
+__all__ = ('Watcher', 'watch')
+
+
+def _mtime(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+@final
+class Watcher:
+    """Keeps pyhtsl imported and rebuilds a job whenever one of the files it ran
+    changes, polling their modification times. A rebuild runs every module of
+    the job again from a fresh global state, and only rewrites the `.htsl`
+    files whose content changed. Jobs that did not touch the changed files are
+    left alone."""
+
+    jobs: list[BuildJob]
+    imports_folder: Path
+    cache_folder: Path | None
+    sources: dict[BuildJob, frozenset[Path]]
+    mtimes: dict[Path, int | None]
+
+    def __init__(
+        self,
+        jobs: Iterable[BuildJob],
+        *,
+        imports_folder: Path | str | None = None,
+        cache_folder: Path | str | None = None,
+    ) -> None:
+        self.jobs = list(jobs)
+        self.imports_folder = resolve_imports_folder(imports_folder)
+        self.cache_folder = None if cache_folder is None else Path(cache_folder)
+        self.sources = {}
+        self.mtimes = {}
+
+    def build(self, jobs: Iterable[BuildJob]) -> list[BuildResult]:
+        results: list[BuildResult] = []
+        for job in jobs:
+            result = run_build_job(
+                job,
+                imports_folder=self.imports_folder,
+                cache_folder=self.cache_folder,
+            )
+            sources = result.sources
+            if not result.ok:
+                # A failed job may not have gotten to every file it uses yet
+                sources |= self.sources.get(job, frozenset())
+            self.sources[job] = sources
+            for path in sources:
+                self.mtimes[path] = _mtime(path)
+            results.append(result)
+        return results
+
+    def changed_files(self) -> set[Path]:
+        changed: set[Path] = set()
+        for path, mtime in self.mtimes.items():
+            current = _mtime(path)
+            if current != mtime:
+                self.mtimes[path] = current
+                changed.add(path)
+        return changed
+
+    def affected_jobs(self, changed: set[Path]) -> list[BuildJob]:
+        return [
+            job
+            for job in self.jobs
+            if job not in self.sources or not self.sources[job].isdisjoint(changed)
+        ]
+
+    def poll(self) -> list[BuildResult]:
+        """Rebuilds the jobs affected by files changed since the last poll."""
+        return self.build(self.affected_jobs(self.changed_files()))
+
+    def run(
+        self,
+        on_results: Callable[[list[BuildResult]], None],
+        *,
+        interval: float = 0.5,
+    ) -> None:
+        """Builds every job, then keeps rebuilding the affected ones until
+        interrupted."""
+        on_results(self.build(self.jobs))
+        while True:
+            time.sleep(interval)
+            results = self.poll()
+            if results:
+                on_results(results)
+
+
+def watch(
+    jobs: Iterable[BuildJob],
+    on_results: Callable[[list[BuildResult]], None],
+    *,
+    interval: float = 0.5,
+    imports_folder: Path | str | None = None,
+    cache_folder: Path | str | None = None,
+) -> None:
+    Watcher(
+        jobs,
+        imports_folder=imports_folder,
+        cache_folder=cache_folder,
+    ).run(on_results, interval=interval)
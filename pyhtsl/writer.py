@@ -0,0 +1,50 @@
+import io
+from collections.abc import Callable
+from typing import TextIO, final
+
+from .config import INDENT
+
+__all__ = ('HtslWriter',)
+
+
+IGNORE_MARKER: str = '// @ignore'
+
+
+@final
+class HtslWriter:
+    """Streams HTSL lines to `stream`, one line at a time, indenting each by
+    the level it is written at. With `skip_ignored`, lines marked with
+    `// @ignore` are dropped on the way out."""
+
+    stream: TextIO
+    skip_ignored: bool
+    lines_written: int
+
+    def __init__(self, stream: TextIO, *, skip_ignored: bool = False) -> None:
+        self.stream = stream
+        self.skip_ignored = skip_ignored
+        self.lines_written = 0
+
+    def write_line(self, line: str, indent: int = 0) -> None:
+        if self.skip_ignored and line.lstrip().startswith(IGNORE_MARKER):
+            return
+        if self.lines_written:
+            self.stream.write('\n')
+        if indent:
+            self.stream.write(INDENT * indent)
+        self.stream.write(line)
+        self.lines_written += 1
+
+    def write_lines(self, text: str, indent: int = 0) -> None:
+        for line in text.split('\n'):
+            self.write_line(line, indent)
+
+    @staticmethod
+    def render_to_string(
+        render: Callable[['HtslWriter'], None],
+        *,
+        skip_ignored: bool = False,
+    ) -> str:
+        stream = io.StringIO()
+        render(HtslWriter(stream, skip_ignored=skip_ignored))
+        return stream.getvalue()
@@ -0,0 +1,53 @@
+"""Optimal packing fits a block greedy packing would split, and reports it.
+
+Greedy packing keeps the first 20 writes in the block itself, so every write
+after a conditional needs a wrapping `if and ()` of its own and the block runs
+out of conditionals. Wrapping the first 20 writes instead leaves room for all
+of them.
+"""
+
+from pyhtsl import Container, IfAll, PackingMode, PlayerStat, create_function
+from pyhtsl.expression.condition.conditional_expression import ConditionalExpression
+from pyhtsl.limits import Counter, count_actions, get_limits, is_within_limits
+
+
+def build(packing: PackingMode) -> Container:
+    with Container(packing=packing) as container:
+        stats = [PlayerStat(f's{i}').as_long() for i in range(50)]
+        # Never written here, so the conditions are not known to hold or not
+        flags = [PlayerStat(f'f{j}').as_long() for j in range(24)]
+
+        @create_function('packed')
+        def packed() -> None:
+            for i in range(20):
+                stats[i].value = i
+            for j in range(24):
+                with IfAll(flags[j] == 3):
+                    stats[0].value = 5
+                stats[20 + j].value = j
+
+    return container
+
+
+def function_blocks(container: Container) -> list[list]:
+    return [block.expressions for block in container.blocks if not block.is_empty()]
+
+
+greedy = build(PackingMode.GREEDY)
+assert len(function_blocks(greedy)) == 2
+assert greedy.packing_reports == []
+
+optimal = build(PackingMode.OPTIMAL)
+(expressions,) = function_blocks(optimal)
+assert is_within_limits(expressions)
+counter = Counter()
+for expr in expressions:
+    counter.increment(expr)
+assert counter.count[ConditionalExpression] == get_limits()[ConditionalExpression]
+
+(report,) = optimal.packing_reports
+assert report.block_name == 'packed'
+assert (report.greedy_functions, report.optimal_functions) == (2, 1)
+assert report.saved_functions == 1 and report.saved_actions > 0
+assert report.optimal_actions == count_actions(expressions)
+assert report.greedy_actions == sum(map(count_actions, function_blocks(greedy)))
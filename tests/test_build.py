@@ -0,0 +1,59 @@
+"""`build` compiles houses in worker processes, each from a fresh state."""
+
+import tempfile
+from pathlib import Path
+
+from pyhtsl.build import BuildJob, build, parse_build_target
+
+assert parse_build_target('houses/Main Lobby.py') == BuildJob(
+    'main_lobby', 'houses/Main Lobby.py'
+)
+assert parse_build_target('houses.arena') == BuildJob('arena', 'houses.arena')
+assert parse_build_target('lobby=houses.lib:lobby') == BuildJob(
+    'lobby', 'houses.lib:lobby'
+)
+
+SCRIPT = """
+from pyhtsl import PlayerStat, chat, create_function
+
+x = PlayerStat('x').as_long()
+
+@create_function({name!r})
+def function():
+    x.value = (x + {n}) * (x - 1) % 7
+    chat(f'{{x}}')
+"""
+
+with tempfile.TemporaryDirectory() as folder:
+    houses = Path(folder) / 'houses'
+    output = Path(folder) / 'out'
+    houses.mkdir()
+    jobs: list[BuildJob] = []
+    for i in range(4):
+        path = houses / f'house_{i}.py'
+        path.write_text(SCRIPT.format(name=f'house {i}', n=i), encoding='utf-8')
+        jobs.append(BuildJob(f'build_house_{i}', str(path)))
+    broken = houses / 'broken.py'
+    broken.write_text("raise ValueError('broken house')\n", encoding='utf-8')
+    jobs.append(BuildJob('build_broken', str(broken)))
+
+    results = list(build(jobs, workers=2, imports_folder=output))
+    assert [result.job for result in results] == jobs
+    for result in results[:-1]:
+        assert result.ok, result.error
+        assert result.exports == {result.job.name: True}
+    assert not results[-1].ok and results[-1].exports == {}
+    assert results[-1].error is not None and 'broken house' in results[-1].error
+    contents = {
+        path.name: path.read_text(encoding='utf-8') for path in output.iterdir()
+    }
+    assert sorted(contents) == [f'build_house_{i}.htsl' for i in range(4)]
+    assert 'goto "function" "house 2"' in contents['build_house_2.htsl']
+
+    # Every job starts from the same temporary stat numbering, so building
+    # again in another order leaves every file as it was
+    again = list(build(reversed(jobs[:-1]), workers=3, imports_folder=output))
+    assert all(result.ok and not any(result.exports.values()) for result in again)
+    assert {
+        path.name: path.read_text(encoding='utf-8') for path in output.iterdir()
+    } == contents
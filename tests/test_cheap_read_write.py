@@ -177,7 +177,8 @@ assert len(counts) == 1, counts
 assert counts[BinaryExpression] == 4, counts
 
 
-# Width=3 Mode A (shared prefix, flat numbering) → 15 BinaryExpressions.
+# Width=3 Mode A (shared prefix, flat numbering) → 17 BinaryExpressions: the
+# later columns reuse `idx * 3` of the first one, each as a copy and its offset.
 with Container() as container:
     items = [
         tuple(PlayerStat(f'a{i * 3 + k}').as_long() for k in range(3))
@@ -189,7 +190,7 @@ with Container() as container:
 
 counts = container.expression_counts(nested=True)
 assert len(counts) == 1, counts
-assert counts[BinaryExpression] == 15, counts
+assert counts[BinaryExpression] == 17, counts
 
 
 # Width=3 Mode B (per-column independent prefix) → 15 BinaryExpressions.
@@ -148,8 +148,8 @@ assert _counts(_render(3, 3)) == (1, 1)
 assert _counts(_render(60, 3)) == (3, 1)
 
 # Small `if` (1 chunk), big `else` (3 chunks): one slot filled, two extra
-# empty-`if` blocks appended.
-assert _counts(_render(3, 60)) == (3, 3)
+# empty-`if` blocks appended, which are turned around.
+assert _counts(_render(3, 60)) == (3, 1)
 
 # Big `if` (3 chunks), big `else` with fewer chunks (2): both else chunks land
 # in existing slots, no extra blocks.
@@ -157,17 +157,18 @@ assert _counts(_render(60, 40)) == (3, 2)
 
 # Big `if` (2 chunks), bigger `else` (4 chunks): two slots filled, two extra
 # blocks appended.
-assert _counts(_render(40, 80)) == (4, 4)
+assert _counts(_render(40, 80)) == (4, 2)
 
 # Equal big bodies: every block gets exactly one else chunk, no extras.
 assert _counts(_render(60, 60)) == (3, 3)
 
 
-# The extra blocks carry an empty `if` body.
+# The extra blocks carry an empty `if` body, so their condition is inverted and
+# the `else` body takes its place.
 _extra_htsl = _render(3, 60)
 assert _extra_htsl.count('if and') == 3
-# Two of the three blocks have nothing before their `else`.
-assert _extra_htsl.count('0) {\n} else {') == 2
+assert _extra_htsl.count('if and (!var "rc" > 0 0) {') == 2
+assert '0) {\n} else {' not in _extra_htsl
 
 
 # === Finalization through a real Container respects the action limits ===
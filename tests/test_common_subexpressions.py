@@ -0,0 +1,175 @@
+"""Common subexpression elimination: a value an earlier statement of the block
+already computed is copied instead of computed again, as long as nothing it was
+computed from changed in between and no execution barrier sits in between.
+Random placeholders are never reused, other placeholders only up to the next
+action that is not a stat assignment.
+"""
+
+from pyhtsl import (
+    Container,
+    ExecutionContext,
+    NoOptimization,
+    PlayerPositionX,
+    PlayerStat,
+    RandomWhole,
+    chat,
+    pause_execution,
+    trigger_function,
+)
+
+reward = PlayerStat('reward').as_long()
+mult = PlayerStat('mult').as_long()
+x = PlayerStat('x').as_long()
+y = PlayerStat('y').as_long()
+z = PlayerStat('z').as_long()
+
+
+# `reward * mult` is still in `x`, so `y` starts from a copy of it.
+with Container() as container:
+    x.value = reward * mult
+    y.value = reward * mult + 5
+
+expected = '\n'.join(
+    (
+        'var "x" = "%var.player/reward 0%L" true',
+        'var "x" *= "%var.player/mult 0%L" true',
+        'var "y" = "%var.player/x 0%L" true',
+        'var "y" += 5 true',
+    )
+)
+assert container.into_htsl() == expected, container.into_htsl()
+assert container.reused_actions == 1, container.reused_actions
+
+
+# A reused temp is not even copied, its reads go to `x` directly.
+with Container() as container:
+    x.value = reward * mult
+    z.value = y + reward * mult
+
+expected = '\n'.join(
+    (
+        'var "x" = "%var.player/reward 0%L" true',
+        'var "x" *= "%var.player/mult 0%L" true',
+        'var "z" = "%var.player/y 0%L" true',
+        'var "z" += "%var.player/x 0%L" true',
+    )
+)
+assert container.into_htsl() == expected, container.into_htsl()
+assert container.reused_actions == 2, container.reused_actions
+
+
+# Within a single statement as well.
+with Container() as container:
+    z.value = (reward * mult) * (reward * mult)
+
+expected = '\n'.join(
+    (
+        'var "z" = "%var.player/reward 0%L" true',
+        'var "z" *= "%var.player/mult 0%L" true',
+        'var "z" *= "%var.player/z 0%L" true',
+    )
+)
+assert container.into_htsl() == expected, container.into_htsl()
+assert container.reused_actions == 2, container.reused_actions
+
+
+# An operand written in between: computed again.
+with Container() as container:
+    x.value = reward * mult
+    reward.value += 1
+    y.value = reward * mult + 5
+
+assert container.reused_actions == 0, container.reused_actions
+assert container.into_htsl().count('*= "%var.player/mult 0%L"') == 2
+
+
+# The stat holding the value written in between: computed again.
+with Container() as container:
+    x.value = reward * mult
+    x.value += 1
+    y.value = reward * mult + 5
+
+assert container.reused_actions == 0, container.reused_actions
+
+
+# A pause or a triggered function can change anything in the meantime.
+for barrier in (lambda: pause_execution(1), lambda: trigger_function('hello')):
+    with Container() as container:
+        x.value = reward * mult
+        barrier()
+        y.value = reward * mult + 5
+
+    assert container.reused_actions == 0, container.reused_actions
+
+
+# Every random placeholder is a different value.
+with Container() as container:
+    x.value = RandomWhole(1, 7) * mult
+    y.value = RandomWhole(1, 7) * mult + 1
+
+assert container.reused_actions == 0, container.reused_actions
+assert container.into_htsl().count('%random.whole/1 7%') == 2
+
+
+# The position of the player stays the same between stat assignments...
+px = PlayerStat('px').as_double()
+py = PlayerStat('py').as_double()
+with Container() as container:
+    px.value = PlayerPositionX * 2
+    py.value = PlayerPositionX * 2 + 1
+
+assert container.reused_actions == 1, container.reused_actions
+assert container.into_htsl().count('%player.pos.x%') == 1
+
+# ...but not across other actions.
+with Container() as container:
+    px.value = PlayerPositionX * 2
+    chat('hi')
+    py.value = PlayerPositionX * 2 + 1
+
+assert container.reused_actions == 0, container.reused_actions
+assert container.into_htsl().count('%player.pos.x%') == 2
+
+
+# Nothing is reused without optimization.
+with NoOptimization():
+    with Container() as container:
+        x.value = reward * mult
+        y.value = reward * mult + 5
+
+assert container.reused_actions == 0, container.reused_actions
+
+
+# The reused values are the same values.
+with ExecutionContext() as ctx:
+    ctx.put(reward, 6)
+    ctx.put(mult, 7)
+    x.value = reward * mult
+    y.value = reward * mult + 5
+    z.value = (reward * mult) * (reward * mult) - y
+    reward.value += 1
+    PlayerStat('w').as_long().value = reward * mult + z
+
+assert ctx.reused_actions > 0, ctx.reused_actions
+assert int(ctx.get(x)) == 42, ctx.get(x)
+assert int(ctx.get(y)) == 47, ctx.get(y)
+assert int(ctx.get(z)) == 42 * 42 - 47, ctx.get(z)
+assert int(ctx.get(PlayerStat('w').as_long())) == 49 + 42 * 42 - 47
+
+
+# Merging a temp into the stat it is copied to must not move the write of that
+# stat before a read of its old value.
+with Container() as container:
+    x.value = y * 3 + x * 2
+
+expected = '\n'.join(
+    (
+        'var "tmp0" = "%var.player/y 0%L" false',
+        'var "tmp0" *= 3 false',
+        'var "tmp1" = "%var.player/x 0%L" false',
+        'var "tmp1" *= 2 false',
+        'var "tmp0" += "%var.player/tmp1 0%L" false',
+        'var "x" = "%var.player/tmp0 0%L" true',
+    )
+)
+assert container.into_htsl() == expected, container.into_htsl()
@@ -0,0 +1,68 @@
+"""Function blocks whose expressions did not change reuse their cached HTSL."""
+
+import tempfile
+
+from pyhtsl import (
+    Container,
+    NoOptimization,
+    PlayerStat,
+    chat,
+    create_function,
+    disable_compile_cache,
+    enable_compile_cache,
+)
+
+
+def build(message: str, *, count: int = 3) -> Container:
+    with Container() as container:
+
+        @create_function('cached')
+        def cached() -> None:
+            x = PlayerStat('x').as_long()
+            y = PlayerStat('y').as_long()
+            y.value = 1
+            y.value = 2
+            for index in range(count):
+                x.value = (x + index) * y + 7
+            chat(f'{message} {x}')
+
+    return container
+
+
+with tempfile.TemporaryDirectory() as folder:
+    cache = enable_compile_cache(folder)
+    try:
+        expected = build('hello').into_htsl()
+        assert (cache.stats.hits, cache.stats.misses, cache.stats.stored) == (0, 1, 1)
+
+        # Same expressions, different global temp numbers: still a hit
+        assert build('hello').into_htsl() == expected
+        assert (cache.stats.hits, cache.stats.misses, cache.stats.stored) == (1, 1, 1)
+
+        # A changed block misses and is stored separately
+        changed = build('bye').into_htsl()
+        assert changed == expected.replace('hello', 'bye'), changed
+        assert (cache.stats.hits, cache.stats.misses, cache.stats.stored) == (1, 2, 2)
+
+        # Flags that change the output are part of the key
+        with NoOptimization():
+            unoptimized = build('hello').into_htsl()
+        assert unoptimized != expected
+        assert cache.stats.misses == 3
+
+        # Overflow blocks are restored together with their root block
+        large = build('large', count=300)
+        blocks = [block.get_name() for block in large.blocks if not block.is_empty()]
+        assert blocks == ['cached', 'cached 2'], blocks
+        expected_large = large.into_htsl()
+
+        restored = build('large', count=300)
+        assert [b.get_name() for b in restored.blocks if not b.is_empty()] == blocks
+        assert restored.into_htsl() == expected_large
+        assert cache.stats.hits == 2
+    finally:
+        disable_compile_cache()
+
+# Without the cache nothing is looked up
+assert build('hello').into_htsl() == expected
+assert cache.stats.hits == 2
@@ -34,10 +34,10 @@ expected = (
     'var "tmp1" -= "%player.pos.y%D" false\n'
     'var "tmp1" *= "%var.player/tmp1 0.0%D" false\n'
     'var "tmp0" += "%var.player/tmp1 0.0%D" false\n'
-    'var "tmp2" = "%var.player/z 0.0%D" false\n'
-    'var "tmp2" -= "%player.pos.z%D" false\n'
-    'var "tmp2" *= "%var.player/tmp2 0.0%D" false\n'
-    'var "tmp0" += "%var.player/tmp2 0.0%D" false\n'
+    'var "tmp1" = "%var.player/z 0.0%D" false\n'
+    'var "tmp1" -= "%player.pos.z%D" false\n'
+    'var "tmp1" *= "%var.player/tmp1 0.0%D" false\n'
+    'var "tmp0" += "%var.player/tmp1 0.0%D" false\n'
     'if and (var "tmp0" > 1000.0 0.0) {\n'
     '    chat "hi"\n'
     '}'
@@ -0,0 +1,176 @@
+"""Conditional blocks checking the same conditions one after the other are
+merged, statements both branches start or end with run outside of them, empty
+blocks go and blocks with an empty `if` body are turned around. Nothing changes
+what the block does.
+"""
+
+from pyhtsl import (
+    Container,
+    Else,
+    ExecutionContext,
+    IfAll,
+    IfAny,
+    PlayerHealth,
+    PlayerSneaking,
+    PlayerStat,
+    chat,
+    trigger_function,
+)
+
+x = PlayerStat('x').as_long()
+y = PlayerStat('y').as_long()
+z = PlayerStat('z').as_long()
+
+
+# Adjacent blocks with the same conditions are merged, unless the first one
+# may change what they evaluate to.
+with Container() as container:
+    with IfAll(y > 2):
+        chat('a')
+    with Else:
+        x.value = 1
+    with IfAll(y > 2):
+        chat('b')
+    with IfAll(y == 1):
+        y.value = 2
+    with IfAll(y == 1):
+        chat('not merged')
+    with IfAll(y == 3):
+        trigger_function('f')
+    with IfAll(y == 3):
+        chat('not merged either')
+
+expected = '\n'.join(
+    (
+        'if and (var "y" > 2 0) {',
+        '    chat "a"',
+        '    chat "b"',
+        '} else {',
+        '    var "x" = 1 true',
+        '}',
+        'if and (var "y" == 1 0) {',
+        '    var "y" = 2 true',
+        '}',
+        'if and (var "y" == 1 0) {',
+        '    chat "not merged"',
+        '}',
+        'if and (var "y" == 3 0) {',
+        '    function "f" false',
+        '}',
+        'if and (var "y" == 3 0) {',
+        '    chat "not merged either"',
+        '}',
+    )
+)
+assert container.into_htsl() == expected, container.into_htsl()
+assert container.pruned_actions == 1, container.pruned_actions
+
+
+# Any action can change what a named condition checks.
+with Container() as container:
+    with IfAll(PlayerSneaking):
+        chat('a')
+    with IfAll(PlayerSneaking):
+        chat('b')
+
+assert container.into_htsl().count('if and') == 2, container.into_htsl()
+
+
+# Neither can setting something that is not a stat, like health.
+with Container() as container:
+    with IfAll(PlayerHealth > 5):
+        PlayerHealth.value = 1
+    with IfAll(PlayerHealth > 5):
+        chat('healthy')
+
+assert container.into_htsl().count('if and') == 2, container.into_htsl()
+
+
+# What both branches start with runs before the block, unless it changes what
+# the conditions evaluate to, and what both end with runs after it.
+with Container() as container:
+    with IfAll(y > 3):
+        z.value = 1
+        y.value = 0
+        chat('a')
+        x.value = 5
+    with Else:
+        z.value = 1
+        y.value = 0
+        chat('b')
+        x.value = 5
+
+expected = '\n'.join(
+    (
+        'var "z" = 1 true',
+        'if and (var "y" > 3 0) {',
+        '    var "y" = 0 true',
+        '    chat "a"',
+        '} else {',
+        '    var "y" = 0 true',
+        '    chat "b"',
+        '}',
+        'var "x" = 5 true',
+    )
+)
+assert container.into_htsl() == expected, container.into_htsl()
+assert container.pruned_actions == 2, container.pruned_actions
+
+# Setting health may change what a condition on it evaluates to, so it stays in
+# both branches.
+with Container() as container:
+    with IfAll(PlayerHealth > 5):
+        PlayerHealth.value = 1
+        chat('a')
+    with Else:
+        PlayerHealth.value = 1
+        chat('b')
+
+assert container.into_htsl().startswith('if and ('), container.into_htsl()
+assert container.pruned_actions == 0, container.pruned_actions
+
+
+# A block with an empty `if` body is turned around, and one with nothing in
+# either goes along with the temps its conditions read. A block without
+# conditions is left as it is.
+with Container() as container:
+    with IfAll(y > 4, x < 3):
+        pass
+    with Else:
+        chat('else only')
+    with IfAll(y * 2 > 9):
+        pass
+    with IfAny():
+        chat('always')
+
+expected = '\n'.join(
+    (
+        'if or (!var "y" > 4 0, !var "x" < 3 0) {',
+        '    chat "else only"',
+        '}',
+        'if and () {',
+        '    chat "always"',
+        '}',
+    )
+)
+assert container.into_htsl() == expected, container.into_htsl()
+
+
+# The rewritten blocks do what the original ones did.
+for value in (0, 5):
+    with ExecutionContext() as ctx:
+        ctx.put(y, value)
+        with IfAll(y > 2):
+            z.value = 1
+            x.value = y
+        with Else:
+            z.value = 1
+            x.value = 7
+        with IfAll(y > 2):
+            x.value += 10
+        with IfAll(y > 4, x < 3):
+            pass
+        with Else:
+            z.value += 100
+
+        ctx.assert_all(x == (15 if value > 2 else 7), z == 101)
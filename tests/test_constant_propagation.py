@@ -0,0 +1,118 @@
+"""Player stats assigned a constant are known to hold it until something else
+may write them: their reads are replaced by the constant, operations on it are
+folded, and conditions that always hold or never do are dropped along with the
+branch that never runs. After a condition, only what both branches agree on is
+known. Global stats are never known, and everything is forgotten at execution
+barriers.
+"""
+
+from pyhtsl import (
+    Container,
+    Else,
+    ExecutionContext,
+    GlobalStat,
+    IfAll,
+    PlayerStat,
+    chat,
+    trigger_function,
+)
+
+x = PlayerStat('x').as_long()
+y = PlayerStat('y').as_long()
+z = PlayerStat('z').as_long()
+n = PlayerStat('n').as_long()
+g = GlobalStat('g').as_long()
+
+
+# `n` is known, so `z` is computed at build time, the first condition only
+# depends on `y`, the second always holds and the third never does.
+with Container() as container:
+    n.value = 5
+    z.value = n * 3 + 1
+    with IfAll(n * 2 > y):
+        x.value = n + y
+    with IfAll(n > 3):
+        chat('big')
+    with IfAll(n == 4):
+        chat('never')
+
+expected = '\n'.join(
+    (
+        'var "n" = 5 true',
+        'var "z" = 16 true',
+        'if and (var "y" < 10 0) {',
+        '    var "x" = 5 true',
+        '    var "x" += "%var.player/y 0%L" true',
+        '}',
+        'chat "big"',
+    )
+)
+assert container.into_htsl() == expected, container.into_htsl()
+assert container.folded_actions == 7, container.folded_actions
+
+
+# Both branches set `x` to 1, so it is known after them, while `z` is not. An
+# `==` condition tells what the stat holds within its body. Setting `x` is then
+# done before the branches, see `test_conditional_optimizer`.
+with Container() as container:
+    with IfAll(y == 2):
+        x.value = 1
+    with Else:
+        x.value = 1
+        z.value = 3
+    z.value = x + 1
+    with IfAll(x == 1):
+        chat('one')
+    with IfAll(y == 3):
+        n.value = y * 2
+
+expected = '\n'.join(
+    (
+        'var "x" = 1 true',
+        'if and (!var "y" == 2 0) {',
+        '    var "z" = 3 true',
+        '}',
+        'var "z" = 2 true',
+        'chat "one"',
+        'if and (var "y" == 3 0) {',
+        '    var "n" = 6 true',
+        '}',
+    )
+)
+assert container.into_htsl() == expected, container.into_htsl()
+
+
+# A global stat can be written by anyone, and a triggered function can write
+# any stat.
+with Container() as container:
+    n.value = 5
+    g.value = 3
+    y.value = g + n
+    trigger_function('f')
+    y.value = n + 1
+
+expected = '\n'.join(
+    (
+        'var "n" = 5 true',
+        'globalvar "g" = 3 true',
+        'var "y" = "%var.global/g 0%L" true',
+        'var "y" += 5 true',
+        'function "f" false',
+        'var "y" = "%var.player/n 0%L" true',
+        'var "y" += 1 true',
+    )
+)
+assert container.into_htsl() == expected, container.into_htsl()
+
+
+# Assertions read the stats when they run, so nothing they may check is
+# removed even though it is overwritten right after.
+with ExecutionContext() as ctx:
+    ctx.put(y, 7)
+    for value in (3, 4):
+        n.value = value
+        with IfAll(n > 3):
+            x.value = y * n
+        with Else:
+            x.value = n
+        ctx.assert_all(lambda _value=value: x == (_value if _value <= 3 else 28))
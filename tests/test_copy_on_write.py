@@ -0,0 +1,48 @@
+"""Expressions are only copied when something would change a shared one."""
+
+from pyhtsl import Container, PlayerStat, chat
+from pyhtsl.expression.binary_expression import BinaryExpression, BinaryOperator
+from pyhtsl.internal_type import InternalType
+
+x = PlayerStat('x').as_long()
+y = PlayerStat('y').as_long()
+
+# Checkables are shared instead of cloned
+assert x.as_long() is x
+assert x.as_double() is not x and x.as_double().internal_type is InternalType.DOUBLE
+assert (x + 1).cloned().left is x
+
+
+# A fresh expression is written as is, writing it again writes a copy
+with Container() as container:
+    expression = BinaryExpression(x, y, BinaryOperator.Set)
+    expression.write()
+    expression.write()
+    written = container.get_expressions_ref_in_context()
+    assert written[0] is expression
+    assert written[1] is not expression and written[1].equals(expression)
+
+
+# Changing a stat inside a shared operand copies the operand first
+operand = y + 1
+first = BinaryExpression(x, operand, BinaryOperator.Set)
+second = BinaryExpression(PlayerStat('z').as_long(), operand, BinaryOperator.Set)
+assert first.right is second.right is operand
+
+w = PlayerStat('w').as_long()
+assert first.change_all_occurrences_of_stat(y, w)
+assert first.right is not operand and first.right.left.equals(w)
+assert second.right is operand and operand.left.equals(y)
+assert first.is_using_stat(w) and not first.is_using_stat(y)
+assert second.is_using_stat(y) and not second.is_using_stat(w)
+
+
+# Rendering does not change what was written
+with Container() as container:
+    total = x * 2 + y
+    x.value = total
+    chat(f'{total}')
+    before = repr(total)
+
+assert repr(total) == before
+assert total.left.left is x
@@ -0,0 +1,56 @@
+"""Deferred interpolations belong to the container they were created in."""
+
+import gc
+import weakref
+
+from pyhtsl import Container, PlayerStat, chat
+from pyhtsl.deferred import live_deferred_count, lookup_deferred
+
+before = live_deferred_count()
+
+with Container() as container:
+    a = PlayerStat('a').as_long()
+    sum_expression = a + 1
+    message = f'x={sum_expression} y={a * 2}'
+    chat(message)
+    assert len(container.deferred_ids) == 2
+    assert live_deferred_count() == before + 2
+    assert lookup_deferred(container.deferred_ids[0]).checkable is sum_expression
+
+# Released on finalize, after every sentinel was substituted
+assert container.deferred_ids == []
+assert live_deferred_count() == before
+assert container.into_htsl() == (
+    'var "tmp0" = "%var.player/a 0%L" false\n'
+    'var "tmp0" += 1 false\n'
+    'var "tmp1" = "%var.player/a 0%L" false\n'
+    'var "tmp1" *= 2 false\n'
+    'chat "x=%var.player/tmp0 0% y=%var.player/tmp1 0%"'
+), container.into_htsl()
+
+# Nothing pins the expression tree anymore
+reference = weakref.ref(sum_expression)
+del sum_expression, container
+gc.collect()
+assert reference() is None
+
+
+# Reusing a released string in another container is an error
+with Container() as first:
+    leaked = f'{PlayerStat("b") + 1}'
+    chat(leaked)
+
+try:
+    with Container() as second:
+        chat(leaked)
+except RuntimeError as exc:
+    assert 'was released' in str(exc), exc
+else:
+    raise AssertionError('Expected a RuntimeError')
+
+
+# Many containers in one process do not accumulate entries
+for index in range(50):
+    with Container():
+        chat(f'{PlayerStat(f"s{index}") + index}')
+assert live_deferred_count() == before
@@ -0,0 +1,72 @@
+"""A diff export holds only the functions whose HTSL changed since the last one."""
+
+import tempfile
+from pathlib import Path
+
+from pyhtsl import Container, PlayerStat, chat, create_function
+from pyhtsl.manifest import ExportManifest
+
+
+def build(greeting: str, with_extra: bool) -> Container:
+    with Container() as container:
+        x = PlayerStat('x').as_long()
+
+        @create_function('diff greet')
+        def greet() -> None:
+            chat(greeting)
+
+        @create_function('diff count')
+        def count() -> None:
+            # Enough actions to overflow into "diff count 2"
+            for i in range(800):
+                PlayerStat(f'diff{i}').value = i
+
+        if with_extra:
+
+            @create_function('diff extra')
+            def extra() -> None:
+                x.value = 0
+
+    return container
+
+
+with tempfile.TemporaryDirectory() as folder:
+    root = Path(folder)
+
+    def export(container: Container, name: str) -> None:
+        container.htsl_path = lambda name: root / f'{name}.htsl'  # type: ignore[method-assign]
+        container.export(name, diff=True)
+
+    first = build('hello', with_extra=True)
+    export(first, 'diff_first')
+    manifest = ExportManifest.load(root / 'diff_first.manifest.json')
+    assert manifest is not None
+    assert list(manifest.hashes) == [
+        'diff greet',
+        'diff count',
+        'diff count 2',
+        'diff extra',
+    ]
+    # Nothing to compare with yet, so everything is in the diff
+    changed_path = root / 'diff_first_changed.htsl'
+    assert changed_path.read_text() == (root / 'diff_first.htsl').read_text()
+
+    # Exporting it again under another name would start over, so move the
+    # manifest along as if the same house was exported again
+    (root / 'diff_first.manifest.json').rename(root / 'diff_second.manifest.json')
+    second = build('hello there', with_extra=False)
+    second.htsl_path = lambda name: root / f'{name}.htsl'  # type: ignore[method-assign]
+    diff = second.export_diff('diff_second')
+    assert diff.added == [] and diff.changed == ['diff greet']
+    assert diff.removed == ['diff extra']
+    content = (root / 'diff_second_changed.htsl').read_text()
+    assert 'goto "function" "diff greet"' in content
+    assert 'chat "hello there"' in content
+    assert 'diff count' not in content and 'diff extra' not in content
+
+    # Nothing changed: the outdated diff file goes away
+    third = build('hello there', with_extra=False)
+    third.htsl_path = lambda name: root / f'{name}.htsl'  # type: ignore[method-assign]
+    diff = third.export_diff('diff_second')
+    assert not diff.to_import and not diff.removed
+    assert not (root / 'diff_second_changed.htsl').exists()
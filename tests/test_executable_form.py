@@ -0,0 +1,46 @@
+"""Flattening an expression happens once for counting, rendering and executing."""
+
+from pyhtsl import Container, PlayerStat
+from pyhtsl.expression.binary_expression import BinaryExpression, BinaryOperator
+from pyhtsl.limits import Counter
+
+x = PlayerStat('x').as_long()
+y = PlayerStat('y').as_long()
+z = PlayerStat('z').as_long()
+
+with Container():
+    expression = BinaryExpression(x, (y * 3 + z) % 7, BinaryOperator.Set)
+
+    # The same form is handed out until something changes
+    form = expression.executable_form(expression._executable_expressions)
+    assert expression.executable_form(expression._executable_expressions) is form
+    assert list(expression.into_executable_expressions()) == form.expressions
+    assert expression.executable_form(expression._executable_expressions) is form
+
+    # Counting keeps its counts on the form
+    counts = Counter().action_counts(expression)
+    assert form.action_counts is counts
+    assert Counter().action_counts(expression) is counts
+    assert sum(counts.values()) == len(form.expressions) > 1
+
+    rendered = expression.into_htsl()
+    assert expression.into_htsl() == rendered
+
+    # Assigning a field flattens again
+    expression.left = z
+    changed = expression.executable_form(expression._executable_expressions)
+    assert changed is not form and changed.action_counts is None
+    assert expression.into_htsl() != rendered
+
+    # So does renaming a stat somewhere inside
+    before = expression.executable_form(expression._executable_expressions)
+    assert expression.change_all_occurrences_of_stat(y, PlayerStat('w').as_long())
+    after = expression.executable_form(expression._executable_expressions)
+    assert after is not before
+    assert 'w' in expression.into_htsl()
+
+    # And changing one of the flattened expressions
+    flattened = after.expressions[0]
+    assert isinstance(flattened, BinaryExpression)
+    flattened.operator = flattened.operator
+    assert expression.executable_form(expression._executable_expressions) is not after
@@ -0,0 +1,42 @@
+"""Exporting the same HTSL again leaves the file, and its mtime, untouched."""
+
+import os
+import tempfile
+from pathlib import Path
+
+from pyhtsl import Container, PlayerStat, chat
+
+
+def build(message: str) -> Container:
+    with Container() as container:
+        PlayerStat('x').value = 1
+        chat(message)
+    return container
+
+
+with tempfile.TemporaryDirectory() as folder:
+    path = Path(folder) / 'unchanged.htsl'
+
+    first = build('hello')
+    first.htsl_path = lambda name: path  # type: ignore[method-assign]
+    assert first.export('unchanged_first')
+    assert 'unchanged_first' in Container.changed_exports
+    content = path.read_text(encoding='utf-8')
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+
+    # Same HTSL under another name: not rewritten
+    second = build('hello')
+    second.htsl_path = lambda name: path  # type: ignore[method-assign]
+    assert not second.export('unchanged_second')
+    assert 'unchanged_second' not in Container.changed_exports
+    assert path.stat().st_mtime_ns == 1_000_000_000
+    assert path.read_text(encoding='utf-8') == content
+
+    # Different HTSL: replaced, without leaving the temporary file behind
+    third = build('changed')
+    third.htsl_path = lambda name: path  # type: ignore[method-assign]
+    assert third.export('unchanged_third')
+    assert 'unchanged_third' in Container.changed_exports
+    assert path.stat().st_mtime_ns != 1_000_000_000
+    assert 'chat "changed"' in path.read_text(encoding='utf-8')
+    assert [p.name for p in Path(folder).iterdir()] == ['unchanged.htsl']
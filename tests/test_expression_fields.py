@@ -0,0 +1,104 @@
+"""Expressions declare their fields next to `__slots__` and carry no `__dict__`."""
+
+import importlib
+import typing
+from pathlib import Path
+
+import pyhtsl
+from pyhtsl import DisplayTitleExpression, GlobalStat, PlayerStat, TeamStat
+from pyhtsl.container import Container
+from pyhtsl.expression.binary_expression import BinaryExpression, BinaryOperator
+from pyhtsl.expression.condition.comparison_condition import ComparisonCondition
+from pyhtsl.expression.expression import Expression
+from pyhtsl.expression.value_range import ValueRange
+from pyhtsl.internal_type import InternalType
+from pyhtsl.stats.temporary_stat import TemporaryStat
+from pyhtsl.utils.fields import field_values, slot_fields
+
+# Load every expression class
+package = Path(pyhtsl.__file__).parent
+for path in sorted(package.rglob('*.py')):
+    name = '.'.join(path.relative_to(package.parent).with_suffix('').parts)
+    if name.endswith('__init__') or name in ('pyhtsl.__main__', 'pyhtsl.misc.sounds'):
+        continue
+    importlib.import_module(name)
+
+
+def subclasses(cls: type) -> list[type]:
+    found = []
+    for subclass in cls.__subclasses__():
+        found.append(subclass)
+        found.extend(subclasses(subclass))
+    return found
+
+
+expression_classes = subclasses(Expression)
+assert len(expression_classes) > 30, len(expression_classes)
+for cls in expression_classes:
+    assert '__slots__' in cls.__dict__, cls
+    assert not cls.has_undeclared_fields, cls
+    hints = {
+        name: hint
+        for klass in reversed(cls.__mro__)
+        if klass.__module__.startswith('pyhtsl.')
+        for name, hint in vars(klass).get('__annotations__', {}).items()
+        if typing.get_origin(hint) is not typing.ClassVar
+        and not str(hint).startswith('ClassVar')
+    }
+    declared = set(slot_fields(cls))
+    for name, hint in hints.items():
+        assert name in declared, (cls, name)
+        # Fields that can hold a stat are the ones renaming looks at
+        text = hint if isinstance(hint, str) else repr(hint)
+        if 'Checkable' in text or 'Stat' in text:
+            assert name in cls.stat_fields, (cls, name)
+    for table in (cls.stat_fields, cls.string_fields, cls.expression_list_fields):
+        assert set(table) <= declared, (cls, table)
+
+
+# No instance dictionaries on the common nodes
+stat = PlayerStat('a')
+instances = [
+    stat,
+    GlobalStat('b'),
+    TeamStat('c', 'red'),
+    TemporaryStat(InternalType.LONG),
+    stat + 1,
+    stat == 2,
+]
+for instance in instances:
+    assert not hasattr(instance, '__dict__'), type(instance)
+assert isinstance(instances[4], BinaryExpression)
+assert isinstance(instances[5], ComparisonCondition)
+assert instances[5].inverted is False and (~instances[5]).inverted is True
+
+# Stats keep their fields through cloning
+clone = TeamStat('c', 'red').with_fallback(5).with_range(0, 9).without_auto_unset()
+assert field_values(clone) == {
+    'internal_type': InternalType.LONG,
+    'fallback_value': 5,
+    'name': 'c',
+    'auto_unset': False,
+    'value_range': ValueRange(0, 9),
+    'team': clone.team,
+}
+# Temporary stats take their name from their number, not from the slot
+temporary = TemporaryStat(InternalType.LONG)
+assert temporary.name == f'tmp{temporary.number}'
+assert 'name' not in field_values(temporary)
+
+
+# Renaming a stat goes through the declared fields, including placeholders
+with Container():
+    other = PlayerStat('other')
+    expression = BinaryExpression(stat, PlayerStat('b'), BinaryOperator.Set)
+    assert expression.is_using_stat(stat)
+    assert expression.change_all_occurrences_of_stat(stat, other)
+    assert expression.left.equals(other) and not expression.is_using_stat(stat)
+
+    title = DisplayTitleExpression(stat, f'hi {stat}')
+    assert title.is_using_stat(stat)
+    assert title.change_all_occurrences_of_stat(stat, other)
+    assert title.title.equals(other)
+    # Still used through the placeholder in the subtitle
+    assert title.is_using_stat(stat)
@@ -0,0 +1,83 @@
+"""Blocks and nested expressions stream their lines into an `HtslWriter`."""
+
+import io
+import tempfile
+from pathlib import Path
+
+from pyhtsl import (
+    Container,
+    Else,
+    IfAll,
+    PlayerStat,
+    Random,
+    chat,
+    create_function,
+    trigger_function,
+)
+from pyhtsl.writer import HtslWriter
+
+with Container() as container:
+
+    @create_function('roll')
+    def roll() -> None:
+        x = PlayerStat('x').as_long()
+        with IfAll(x > 0):
+            chat('positive')
+            x.value = 2
+        with Else:
+            chat('not positive')
+        with Random:
+            chat('a')
+            chat('b')
+
+    trigger_function(roll)
+
+expected = '\n'.join(
+    [
+        'function "roll" false',
+        '',
+        '',
+        'goto "function" "roll"',
+        '    if and (var "x" > 0 0) {',
+        '        chat "positive"',
+        '        var "x" = 2 true',
+        '    } else {',
+        '        chat "not positive"',
+        '    }',
+        '    random {',
+        '        chat "a"',
+        '        chat "b"',
+        '    }',
+    ]
+)
+assert container.into_htsl() == expected, container.into_htsl()
+
+
+# Nested expressions render the same on their own as inside their block
+function_block = container.blocks[-1]
+conditional = function_block.expressions[0]
+assert conditional.into_htsl() == '\n'.join(
+    line.removeprefix('    ') for line in expected.split('\n')[4:10]
+), conditional.into_htsl()
+assert function_block.into_htsl() == '\n'.join(expected.split('\n')[3:])
+
+
+# Ignored lines are filtered while streaming, at any indentation
+stream = io.StringIO()
+writer = HtslWriter(stream, skip_ignored=True)
+writer.write_line('chat "kept"')
+writer.write_lines('// @ignore dropped\nchat "also kept"', 2)
+writer.write_line('// @ignore dropped too', 1)
+assert stream.getvalue() == 'chat "kept"\n        chat "also kept"', stream.getvalue()
+assert writer.lines_written == 2
+
+
+# Export streams the same text into the file
+with tempfile.TemporaryDirectory() as folder:
+    path = Path(folder) / 'writer_test.htsl'
+    container.htsl_path = lambda name: path  # type: ignore[method-assign]
+    container.export('writer_test')
+    assert path.read_text(encoding='utf-8') == (
+        f'// Generated with PyHTSL https://github.com/69Jesse/PyHTSL\n{expected}\n'
+    )
+    assert [p.name for p in Path(folder).iterdir()] == ['writer_test.htsl']
@@ -0,0 +1,132 @@
+"""`import pyhtsl` stays cheap: submodules and data files load on first access."""
+
+import ast
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pyhtsl
+from pyhtsl.checkable import Checkable
+from pyhtsl.utils.placeholders import PLACEHOLDER_MODULES, PlaceholderRegistry
+
+
+def run(code: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Exiting may log after the result, so look for it by its prefix
+    for line in result.stdout.splitlines():
+        if line.startswith('RESULT '):
+            return json.loads(line.removeprefix('RESULT '))
+    raise AssertionError(result.stdout + result.stderr)
+
+
+# Importing the package alone loads none of its submodules
+imported = run("""
+import json, sys
+import pyhtsl
+print('RESULT', json.dumps({
+    'modules': sorted(m for m in sys.modules if m.startswith('pyhtsl') or m in ('numpy', 'sounddevice')),
+}))
+""")['modules']
+assert imported == ['pyhtsl'], imported
+
+
+# Only what is used gets loaded
+loaded = run("""
+import json, sys
+from pyhtsl import PlayerStat, disable_global_export
+disable_global_export()
+print('RESULT', json.dumps({'modules': sorted(sys.modules)}))
+""")['modules']
+assert 'pyhtsl.stats.player_stat' in loaded
+for module in ('pyhtsl.misc.skull_data', 'pyhtsl.actions.item', 'sounddevice'):
+    assert module not in loaded, module
+
+
+# Exiting does not load the sound mixer when no sound was played
+exited = subprocess.run(
+    [
+        sys.executable,
+        '-X',
+        'importtime',
+        '-c',
+        """
+from pyhtsl import PlayerStat, create_function, disable_global_export
+disable_global_export()
+
+@create_function('exit test')
+def exit_test():
+    PlayerStat('x').value = 1
+""",
+    ],
+    capture_output=True,
+    text=True,
+    check=True,
+)
+assert 'pyhtsl.misc.sounds' not in exited.stderr, exited.stderr
+assert 'Traceback' not in exited.stderr, exited.stderr
+
+
+# A submodule can be the first thing imported
+run("""
+import json
+import pyhtsl.block
+from pyhtsl import disable_global_export
+disable_global_export()
+print('RESULT', json.dumps({}))
+""")
+
+
+# Star imports still get every public name
+names = run("""
+import json
+from pyhtsl import disable_global_export
+disable_global_export()
+from pyhtsl import *
+print('RESULT', json.dumps({'names': sorted(n for n in globals() if not n.startswith('__'))}))
+""")['names']
+assert set(pyhtsl.__all__) <= set(names), set(pyhtsl.__all__) - set(names)
+
+
+# The lazy table matches the imports type checkers see
+tree = ast.parse(Path(pyhtsl.__file__).read_text(encoding='utf-8'))
+type_checking_imports = {
+    alias.asname or alias.name: '.' * node.level + (node.module or '')
+    for node in ast.walk(tree)
+    if isinstance(node, ast.ImportFrom) and node.level > 0
+    for alias in node.names
+}
+assert type_checking_imports == pyhtsl._LAZY_IMPORTS
+
+
+# Every placeholder pattern registered comes from a module the scanner loads
+# up front
+for owner, _, _ in PlaceholderRegistry.all_entries():
+    if owner.__module__.startswith('pyhtsl.'):
+        assert owner.__module__.removeprefix('pyhtsl') in PLACEHOLDER_MODULES, owner
+for module_name in PLACEHOLDER_MODULES:
+    module = sys.modules[f'pyhtsl{module_name}']
+    assert any(
+        isinstance(value, type)
+        and issubclass(value, Checkable)
+        and value.__module__ == module.__name__
+        and value.__dict__.get('pattern') is not None
+        for value in vars(module).values()
+    ), module_name
+
+
+# Including the ones nothing imported yet: a class given a pattern anywhere in
+# the package is in a module the scanner loads
+package = Path(pyhtsl.__file__).parent
+for path in package.rglob('*.py'):
+    module_name = '.' + '.'.join(path.relative_to(package).with_suffix('').parts)
+    for node in ast.walk(ast.parse(path.read_text(encoding='utf-8'))):
+        if isinstance(node, ast.ClassDef) and any(
+            keyword.arg == 'pattern' for keyword in node.keywords
+        ):
+            assert module_name in PLACEHOLDER_MODULES, (module_name, node.name)
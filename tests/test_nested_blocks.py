@@ -182,12 +182,15 @@ assert len(pyhtsl.container.CONTAINERS) == _depth_before, pyhtsl.container.CONTA
 # `%` (modulo) and abs() expand into an if-block under the hood, so using them
 # inside a nestable block would emit illegal nested conditionals. These are
 # caught at finalize time, even though no `with IfAll` is nested syntactically.
+# Operands known to not be negative leave the if-block out, see
+# `test_value_range`, so the conditions here tell nothing about them.
 
 # A modulo assignment inside IfAll raises
 with expect_exception(SyntaxError):
     with Container():
         x = PlayerStat('x').as_long()
-        with IfAll(x > 0):
+        y = PlayerStat('y').as_long()
+        with IfAll(y > 0):
             x.value = x % 100
 
 
@@ -196,7 +199,7 @@ with expect_exception(SyntaxError):
     with Container():
         x = PlayerStat('x').as_long()
         y = PlayerStat('y').as_long()
-        with IfAll(x > 0):
+        with IfAll(y > 0):
             y.value = (x % 100) + 5
 
 
@@ -205,7 +208,7 @@ with expect_exception(SyntaxError):
     with Container():
         x = PlayerStat('x').as_long()
         y = PlayerStat('y').as_long()
-        with IfAll(x > 0):
+        with IfAll(y > 0):
             y.value = abs(x)
 
 
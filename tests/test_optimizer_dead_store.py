@@ -33,11 +33,16 @@ assert container.into_htsl() == 'var "x" = 5 true', container.into_htsl()
 with Container() as container:
     x = PlayerStat('x').as_long()
     y = PlayerStat('y').as_long()
-    x.value = 5
-    y.value = x  # reads x; the earlier x = 5 is now alive
+    z = PlayerStat('z').as_long()
+    x.value = z
+    y.value = x  # reads x; the earlier x = z is now alive
     x.value = 10
 
-expected = 'var "x" = 5 true\nvar "y" = "%var.player/x 0%L" true\nvar "x" = 10 true'
+expected = (
+    'var "x" = "%var.player/z 0%L" true\n'
+    'var "y" = "%var.player/x 0%L" true\n'
+    'var "x" = 10 true'
+)
 assert container.into_htsl() == expected, container.into_htsl()
 
 
@@ -54,20 +59,21 @@ assert container.into_htsl() == 'var "x" = 5 true', container.into_htsl()
 
 # A conditional that reads lhs in its body counts as a "use" — `is_using_stat`
 # recurses into `ConditionalExpression.if_expressions` / `else_expressions`.
-# Without this, `x = 5` would be wrongly eliminated even though the conditional
+# Without this, `x = z` would be wrongly eliminated even though the conditional
 # reads (and writes) x.
 from pyhtsl import IfAll  # noqa: E402
 
 with Container() as container:
     x = PlayerStat('x').as_long()
     y = PlayerStat('y').as_long()
-    x.value = 5
+    z = PlayerStat('z').as_long()
+    x.value = z
     with IfAll(y > 0):
         x += 1
     x.value = 10
 
 expected = (
-    'var "x" = 5 true\n'
+    'var "x" = "%var.player/z 0%L" true\n'
     'if and (var "y" > 0 0) {\n'
     '    var "x" += 1 true\n'
     '}\n'
@@ -0,0 +1,53 @@
+"""The block optimizer indexes stat uses once per block, so a long run of
+independent statements optimizes each one exactly as it would on its own."""
+
+from pyhtsl import Container, PlayerStat, chat, pause_execution
+
+COUNT = 300
+
+
+def single(index: int) -> list[str]:
+    a = f'a{index % 7}'
+    return [
+        f'var "r{index}" = "%var.player/{a} 0%L" true',
+        f'var "r{index}" *= "%var.player/b 0%L" true',
+        f'var "r{index}" += {index + 1} true',
+        'var "tmp0" = "%var.player/' + a + ' 0%L" false',
+        'var "tmp0" *= 3 false',
+        f'var "r{index}" -= "%var.player/tmp0 0%L" true',
+    ]
+
+
+with Container(ignore_action_limits=True) as container:
+    b = PlayerStat('b').as_long()
+    for index in range(COUNT):
+        a = PlayerStat(f'a{index % 7}').as_long()
+        r = PlayerStat(f'r{index}').as_long()
+        r.value = a * b + (index + 1) - a * 3
+
+expected = '\n'.join(line for index in range(COUNT) for line in single(index))
+assert container.expressions() and container.into_htsl() == expected, (
+    container.into_htsl()
+)
+
+
+# Dead stores and identity merges still see uses far away in the block, and
+# still stop at a barrier far away in the block.
+with Container(ignore_action_limits=True) as container:
+    x = PlayerStat('x').as_long()
+    y = PlayerStat('y').as_long()
+    x.value = 1
+    for index in range(COUNT):
+        PlayerStat(f'filler{index}').as_long().value = index + 1
+    chat(f'{x}')
+    x.value = 0
+    for index in range(COUNT):
+        PlayerStat(f'other{index}').as_long().value = index + 2
+    pause_execution(1)
+    x += y
+
+lines = container.into_htsl().split('\n')
+assert lines[0] == 'var "x" = 1 true', lines[0]
+assert lines[COUNT + 1] == 'chat "%var.player/x 0%"', lines[COUNT + 1]
+assert lines[COUNT + 2] == 'var "x" = 0 true', lines[COUNT + 2]
+assert lines[-1] == 'var "x" += "%var.player/y 0%L" true', lines[-1]
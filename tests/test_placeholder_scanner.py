@@ -0,0 +1,80 @@
+"""All placeholder patterns are scanned in one pass over a string."""
+
+import re
+from typing import Self
+
+from pyhtsl import PlayerStat
+from pyhtsl.checkable import Checkable
+from pyhtsl.execute.backend_type import BackendType
+from pyhtsl.internal_type import InternalType
+from pyhtsl.placeholders import PlaceholderCheckable
+from pyhtsl.stats.global_stat import GlobalStat
+from pyhtsl.stats.team_stat import TeamStat
+from pyhtsl.utils.placeholders import PlaceholderRegistry, get_placeholder_parts
+
+text = 'a %var.player/x 0% b %date.unix.ms% c %var.team/k red% d %date.unix%'
+refs = list(Checkable.iter_in_string(text))
+assert [r.into_inside_string() for r in refs] == [
+    '%var.player/x 0%',
+    '%date.unix.ms%',
+    '%var.team/k red%',
+    '%date.unix%',
+], refs
+assert isinstance(refs[0], PlayerStat) and refs[0].name == 'x'
+assert isinstance(refs[2], TeamStat) and refs[2].name == 'k'
+
+
+# Restricting to a subclass only yields its placeholders
+assert [r.name for r in TeamStat.iter_in_string(text)] == ['k']
+assert list(GlobalStat.iter_in_string(text)) == []
+
+
+# Spans are left to right and never overlap
+assert get_placeholder_parts('x=%var.player/x%var.team/y%!') == [
+    'x=',
+    '%var.player/x%',
+    'var.team/y%!',
+]
+assert get_placeholder_parts('no placeholders') == ['no placeholders']
+assert get_placeholder_parts('%%player.name%%') == ['%', '%player.name%', '%']
+
+
+# A full match needs the whole string to be one placeholder
+found = PlaceholderRegistry.fullmatch('%var.global/g 5%')
+assert found is not None
+match, factory = found
+assert match.group(1) == 'g 5'
+assert isinstance(factory(match), GlobalStat)
+assert PlaceholderRegistry.fullmatch('%var.global/g 5% ') is None
+assert PlaceholderRegistry.fullmatch('%player.name%%player.name%') is None
+assert PlaceholderRegistry.has_any('hello %player.name%')
+assert not PlaceholderRegistry.has_any('100% sure')
+
+
+# Registering a new placeholder rebuilds the scanner
+assert not PlaceholderRegistry.has_any('%test.scanner/7%')
+
+
+class ScannerTestPlaceholder(
+    PlaceholderCheckable,
+    pattern=re.compile(r'%test\.scanner/(\d+)%'),
+    pattern_factory=lambda match: ScannerTestPlaceholder(int(match.group(1))),
+):
+    number: int
+
+    def __init__(self, number: int) -> None:
+        super().__init__(
+            as_string=f'%test.scanner/{number}%',
+            constant_internal_type=InternalType.LONG,
+        )
+        self.number = number
+
+    def get_backend_value(self) -> BackendType:
+        return self.number
+
+    def cloned_raw(self) -> Self:
+        return self.__class__(self.number)
+
+
+refs = list(Checkable.iter_in_string('%player.name% %test.scanner/7%'))
+assert isinstance(refs[1], ScannerTestPlaceholder) and refs[1].number == 7, refs
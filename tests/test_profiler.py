@@ -0,0 +1,85 @@
+"""The compile profiler times every phase of finalizing a block, per block."""
+
+import json
+import tempfile
+from pathlib import Path
+
+from pyhtsl import Container, PlayerStat, chat, create_function
+from pyhtsl.profiler import (
+    CompileProfiler,
+    disable_profiler,
+    enable_profiler,
+    get_profiler,
+)
+
+# Timings nest, `own` leaves out the nested phases
+profiler = CompileProfiler()
+with profiler.phase('outer'):
+    with profiler.phase('inner'):
+        pass
+    with profiler.phase('inner'):
+        pass
+outer = profiler.timings[('outer',)]
+inner = profiler.timings[('outer', 'inner')]
+assert outer.count == 1 and inner.count == 2
+assert outer.total >= inner.total
+assert abs(outer.own - (outer.total - inner.total)) < 1e-9
+
+
+folder = Path(tempfile.mkdtemp())
+profiler = enable_profiler(
+    json_path=folder / 'profile.json',
+    collapsed_path=folder / 'profile.folded',
+)
+try:
+    with Container() as container:
+        x = PlayerStat('x').as_long()
+        y = PlayerStat('y').as_long()
+
+        @create_function('profiled')
+        def profiled_function() -> None:
+            x.value = (x + y) * 2 + 1
+            y.value = x % 3
+            chat(f'{x} {y}')
+
+    container.into_htsl()
+finally:
+    disable_profiler()
+
+phases = profiler.by_phase()
+for name in (
+    'profiled',
+    'callback',
+    'resolve deferred',
+    'verify nesting',
+    'finalize expressions',
+    'optimize',
+    'merge temporary stats',
+    'dead stores',
+    'action limits',
+    'render',
+):
+    assert name in phases, (name, sorted(phases))
+assert ('profiled', 'optimize', 'merge temporary stats') in profiler.timings
+assert profiler.timings[('profiled', 'callback')].count == 1
+
+summary = profiler.summary().splitlines()
+assert summary[0].split() == ['phase', 'count', 'total', 'ms', 'own', 'ms', 'own', '%']
+own_times = [float(line.split()[-2]) for line in summary[1:]]
+assert own_times == sorted(own_times, reverse=True)
+
+profiler.report()
+entries = json.loads((folder / 'profile.json').read_text())
+assert {tuple(entry['stack']) for entry in entries} == set(profiler.timings)
+lines = (folder / 'profile.folded').read_text().splitlines()
+assert len(lines) == len(profiler.timings)
+for line in lines:
+    stack, weight = line.rsplit(' ', 1)
+    assert stack.split(';')[0] in ('profiled', 'Rename Me !!!') and int(weight) >= 0
+
+# Disabled, nothing is timed
+assert get_profiler() is None
+timed = dict(profiler.timings)
+with Container():
+    PlayerStat('z').value = 1
+assert profiler.timings == timed
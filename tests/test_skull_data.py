@@ -0,0 +1,80 @@
+"""Skulls are read from `skulls.json` one at a time when they are looked up."""
+
+import json
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from pyhtsl import SKULL_DATA
+from pyhtsl.misc.skull_data import (
+    SKULL_DATA_FILE,
+    SKULL_INDEX_FILE,
+    SkullStore,
+    build_skull_index,
+    read_skull_data,
+    read_skull_index,
+    skull_data_digest,
+)
+
+# The shipped index is up to date with the data it points into
+data = SKULL_DATA_FILE.read_bytes()
+shipped = json.loads(SKULL_INDEX_FILE.read_text(encoding='utf-8'))
+assert shipped['size'] == len(data)
+assert shipped['sha256'] == skull_data_digest(data)
+assert read_skull_index() == build_skull_index(data.decode('ascii'))
+
+
+# A stale index is not used: offsets come from the bytes of the file, so a
+# checkout with CRLF newlines still works, and so does an edit of the same size
+with tempfile.TemporaryDirectory() as folder:
+    for name, changed in (
+        ('crlf.json', data.replace(b'\n', b'\r\n')),
+        ('edited.json', data.replace(b'"Steve"', b'"Steev"', 1)),
+    ):
+        path = Path(folder) / name
+        path.write_bytes(changed)
+        copy = SkullStore(path, lambda path=path: read_skull_index(path))
+        steve = 'Steev' if name == 'edited.json' else 'Steve'
+        assert copy['npc'][steve].into_snbt() == SKULL_DATA['npc']['Steve'].into_snbt()
+
+
+# Every skull matches building them all up front
+eager = read_skull_data()
+assert list(SKULL_DATA) == list(eager)
+for category, skulls in eager.items():
+    assert list(SKULL_DATA[category]) == list(skulls), category
+    for name, skull in skulls.items():
+        assert SKULL_DATA[category][name].into_snbt() == skull.into_snbt(), name
+
+assert 'Steve' in SKULL_DATA['npc']
+assert 'Nobody' not in SKULL_DATA['npc']
+try:
+    SKULL_DATA['npc']['Nobody']  # type: ignore[index]
+except KeyError:
+    pass
+else:
+    raise AssertionError('Expected a KeyError')
+
+
+# Recent lookups are cached, up to the cache size
+store = SkullStore(SKULL_DATA_FILE, read_skull_index, cache_size=2)
+steve = store['npc']['Steve']
+assert store['npc']['Steve'] is steve
+store['npc']['Alex']
+store['npc']['Assassin']
+assert store.load.cache_info().currsize == 2  # type: ignore[attr-defined]
+assert store['npc']['Steve'] is not steve
+
+
+# Only the index stays in memory, not every skull as NBT
+del eager
+tracemalloc.start()
+lazy = SkullStore(SKULL_DATA_FILE, read_skull_index)
+assert len(lazy['npc']) > 0
+indexed, _ = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+tracemalloc.start()
+everything = read_skull_data()
+built, _ = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+assert indexed * 4 < built, (indexed, built)
@@ -0,0 +1,143 @@
+"""The single pass SNBT parser agrees with the per-type `_parse_snbt` parsers."""
+
+from collections.abc import Callable
+
+from pyhtsl.misc.skull_data import read_skull_data
+from pyhtsl.nbt import (
+    NBT,
+    NBTCompound,
+    NBTDouble,
+    NBTInt,
+    NBTList,
+    NBTLong,
+    NBTString,
+    SNBTParser,
+    SNBTParserError,
+)
+
+
+def structure(nbt: NBT) -> object:
+    value = nbt.value
+    if isinstance(value, list):
+        value = [structure(item) for item in value]
+    elif isinstance(value, dict):
+        value = [(key, structure(item)) for key, item in value.items()]
+    else:
+        value = repr(value)
+    return (type(nbt).__name__, value)
+
+
+def outcome(parse: Callable[[str], tuple[NBT, int]], s: str) -> object:
+    try:
+        nbt, offset = parse(s)
+    except SNBTParserError:
+        return None
+    except Exception as exc:
+        return (type(exc).__name__, str(exc))
+    return (structure(nbt), offset)
+
+
+VALID = [
+    '0',
+    '-12',
+    '5b',
+    '-128b',
+    '200b',
+    '1s',
+    '2147483648',
+    '3000000000l',
+    '3000000000.5f',
+    '3000000000.5d',
+    '5l',
+    '1.5f',
+    '"a\\"b"',
+    "'single'",
+    '[]',
+    '[1,2,3,]',
+    '[0:"a",1:"b"]',
+    '[[1b],[2b,3b]]',
+    '{}',
+    '{a:1,"b c":"d",\'e\':[{f:2s}]}',
+    '{ key :1}',
+]
+for s in VALID:
+    expected = outcome(NBT._parse_snbt, s)
+    assert outcome(lambda s: SNBTParser(s).parse_value(0), s) == expected, s
+
+
+# Anything the per-type parsers reject is rejected too, and `from_snbt` still
+# raises their exact error for it
+INVALID = [
+    '',
+    'true',
+    '[1',
+    '[',
+    '[1b,2]',
+    '{a:1',
+    '{a:1,a:2}',
+    '{a: 1}',
+    '{"a:1}',
+    '"unterminated',
+    '[B;1b,2b]',
+]
+for s in INVALID:
+    assert outcome(lambda s: SNBTParser(s).parse_value(0), s) is None, s
+    try:
+        nbt, offset = NBT._parse_snbt(s)
+        assert offset != len(s), s
+        expected_error = (
+            'ValueError',
+            f'Invalid SNBT format: {s!r} ({len(s) - offset} characters left)',
+        )
+    except (ValueError, IndexError) as exc:
+        expected_error = (type(exc).__name__, str(exc))
+    try:
+        NBT.from_snbt(s)
+    except Exception as exc:
+        assert (type(exc).__name__, str(exc)) == expected_error, (exc, expected_error)
+    else:
+        raise AssertionError(f'Expected {s!r} to be rejected')
+
+try:
+    NBT.from_snbt('{a:1}x')
+except ValueError as exc:
+    assert str(exc) == "Invalid SNBT format: '{a:1}x' (1 characters left)", exc
+else:
+    raise AssertionError('Expected a ValueError')
+
+
+# Streaming serialization writes the same SNBT as joining every value
+def joined(nbt: NBT) -> str:
+    if isinstance(nbt, NBTList):
+        return f'[{",".join(joined(item) for item in nbt.value)}]'
+    if isinstance(nbt, NBTCompound):
+        return (
+            '{'
+            + ','.join(
+                f'{key if NBTCompound.KEY_REGEX.match(key) else NBTString(key).into_snbt()}:{joined(item)}'
+                for key, item in nbt.value.items()
+            )
+            + '}'
+        )
+    return nbt.into_snbt()
+
+
+skulls = read_skull_data()
+everything = NBTCompound(
+    {
+        category: NBTList(list(skulls_in_category.values()))
+        for category, skulls_in_category in skulls.items()
+    }
+)
+snbt = everything.into_snbt()
+assert snbt == joined(everything)
+assert NBT.from_snbt(snbt).into_snbt() == snbt
+
+mixed = NBTCompound(
+    {
+        'plain': NBTInt(1),
+        'needs quotes': NBTLong(2),
+        'nested': NBTList([NBTDouble(1.5), NBTDouble(2.0)]),
+    }
+)
+assert mixed.into_snbt() == '{plain:1,"needs quotes":2l,nested:[1.5,2.0]}', mixed
@@ -0,0 +1,73 @@
+"""A split export writes every function, with its overflow, to a file of its own."""
+
+import json
+import tempfile
+from pathlib import Path
+
+from pyhtsl import Container, PlayerStat, chat, create_function
+
+
+def build(greeting: str, with_extra: bool) -> Container:
+    with Container() as container:
+
+        @create_function('Split Greet!')
+        def greet() -> None:
+            chat(greeting)
+
+        @create_function('split count')
+        def count() -> None:
+            # Enough actions to overflow into "split count 2"
+            for i in range(800):
+                PlayerStat(f'split{i}').value = i
+
+        if with_extra:
+
+            @create_function('split extra')
+            def extra() -> None:
+                PlayerStat('x').value = 0
+
+    return container
+
+
+with tempfile.TemporaryDirectory() as folder:
+    root = Path(folder)
+
+    def export(container: Container, name: str) -> bool:
+        container.htsl_path = lambda name: root / 'split_house.htsl'  # type: ignore[method-assign]
+        return container.export(name, split=True)
+
+    first = build('hello', with_extra=True)
+    assert export(first, 'split_first')
+    house = root / 'split_house'
+    assert not (root / 'split_house.htsl').exists()
+    assert sorted(p.name for p in house.iterdir()) == [
+        'index.json',
+        'split_count.htsl',
+        'split_extra.htsl',
+        'split_greet.htsl',
+    ]
+    index = json.loads((house / 'index.json').read_text())
+    assert index['functions'][1] == {
+        'import': 'split_house/split_count',
+        'file': 'split_count.htsl',
+        'blocks': ['split count', 'split count 2'],
+    }
+    count = (house / 'split_count.htsl').read_text()
+    assert 'goto "function" "split count"' in count
+    assert 'goto "function" "split count 2"' in count
+    greet = (house / 'split_greet.htsl').read_text()
+    assert 'chat "hello"' in greet and 'split count' not in greet
+
+    # The same functions again leave every file alone, a removed one is deleted
+    # and files the index does not list are kept
+    (house / 'notes.htsl').write_text('// mine')
+    mtime = (house / 'split_count.htsl').stat().st_mtime_ns
+    second = build('hello', with_extra=False)
+    assert export(second, 'split_second')
+    assert not (house / 'split_extra.htsl').exists()
+    assert (house / 'notes.htsl').read_text() == '// mine'
+    assert not (house / 'index.json.tmp').exists()
+    assert (house / 'split_count.htsl').stat().st_mtime_ns == mtime
+
+    third = build('hello', with_extra=False)
+    assert not export(third, 'split_third')
@@ -0,0 +1,94 @@
+"""`Expression.stat_usage` caches the stats an expression reads and writes."""
+
+from pyhtsl import PlayerStat, TeamStat
+from pyhtsl.actions.chat import ChatExpression
+from pyhtsl.expression.binary_expression import BinaryExpression, BinaryOperator
+from pyhtsl.expression.condition.comparison_condition import (
+    ComparisonCondition,
+    ComparisonOperator,
+)
+from pyhtsl.expression.condition.conditional_expression import (
+    ConditionalExpression,
+    ConditionalMode,
+)
+from pyhtsl.internal_type import InternalType
+from pyhtsl.stats.temporary_stat import TemporaryStat
+
+x = PlayerStat('x').as_long()
+y = PlayerStat('y').as_long()
+z = PlayerStat('z').as_long()
+
+
+# Set only writes its lhs, every other operator also reads it
+expression = BinaryExpression(x, y, BinaryOperator.Set)
+usage = expression.stat_usage()
+assert usage.is_writing(x) and not usage.is_reading(x)
+assert usage.is_reading(y) and not usage.is_writing(y)
+assert expression.is_using_stat(x) and expression.is_using_stat(y)
+assert not expression.is_using_stat(z)
+
+expression = BinaryExpression(x, y, BinaryOperator.Increment)
+assert expression.stat_usage().is_reading(x)
+assert expression.stat_usage().is_writing(x)
+
+
+# The usage is cached until a field is assigned
+assert expression.stat_usage() is expression.stat_usage()
+expression.right = z
+assert expression.is_using_stat(z) and not expression.is_using_stat(y)
+
+
+# change_all_occurrences_of_stat updates the usage
+assert expression.change_all_occurrences_of_stat(z, y)
+assert expression.is_using_stat(y) and not expression.is_using_stat(z)
+assert not expression.change_all_occurrences_of_stat(z, y)
+
+
+# Placeholders inside strings are reads
+expression = ChatExpression(f'x is {x}')
+assert expression.stat_usage().is_reading(x)
+assert not expression.stat_usage().is_writing(x)
+assert not expression.is_using_stat(y)
+
+
+# Team stats only match on the same team
+red = TeamStat('kills', 'red').as_long()
+blue = TeamStat('kills', 'blue').as_long()
+expression = BinaryExpression(red, 1, BinaryOperator.Increment)
+assert expression.is_using_stat(red.cloned())
+assert not expression.is_using_stat(blue)
+
+
+# Renaming a temporary stat makes the cached usage stale
+temp = TemporaryStat(InternalType.LONG)
+expression = BinaryExpression(x, temp, BinaryOperator.Set)
+assert expression.is_using_stat(temp)
+BinaryExpression.rename_temporary_stats([expression])
+assert temp.number == 0
+assert expression.is_using_stat(temp)
+other = TemporaryStat(InternalType.LONG)
+other.number = 0
+assert expression.is_using_stat(other)
+assert not expression.is_using_stat(PlayerStat('tmp0').as_long())
+assert expression.stat_usage().is_reading(temp)
+
+
+# Nested expressions are part of the usage, conditions are only read
+inner = BinaryExpression(y, 1, BinaryOperator.Set)
+expression = ConditionalExpression(
+    [ComparisonCondition(x, 0, ComparisonOperator.GreaterThan)],
+    ConditionalMode.ALL,
+    if_expressions=[inner],
+)
+usage = expression.stat_usage()
+assert usage.is_reading(x) and not usage.is_writing(x)
+assert usage.is_writing(y)
+assert expression.is_using_stats_together(x, y)
+assert not expression.is_using_stats_together(x, z)
+
+expression.if_expressions.append(BinaryExpression(z, 1, BinaryOperator.Set))
+assert expression.is_using_stat(z)
+
+assert expression.change_all_occurrences_of_stat(x, z)
+assert not expression.is_using_stat(x)
+assert expression.stat_usage().is_reading(z)
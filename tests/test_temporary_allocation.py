@@ -0,0 +1,100 @@
+"""Temporary stats are numbered over the whole block: two temps share a number
+only when one is no longer needed once the other is written, stats named like
+temps by hand are never overwritten while they are still read, and placeholders
+naming temps are renamed along with them.
+"""
+
+from pyhtsl import Container, ExecutionContext, IfAll, PlayerStat, chat
+
+x = PlayerStat('x').as_long()
+y = PlayerStat('y').as_long()
+z = PlayerStat('z').as_long()
+
+
+# Both operands of a condition are computed before it, so they can not share a
+# temp, while the condition after it reuses the first one.
+with Container() as container:
+    with IfAll(x * 2 + 1 > y * 3 + 1):
+        z.value = 1
+    with IfAll(y * 4 + 1 > 0):
+        z.value = 2
+
+expected = '\n'.join(
+    (
+        'var "tmp0" = "%var.player/x 0%L" false',
+        'var "tmp0" *= 2 false',
+        'var "tmp0" += 1 false',
+        'var "tmp1" = "%var.player/y 0%L" false',
+        'var "tmp1" *= 3 false',
+        'var "tmp1" += 1 false',
+        'if and (var "tmp0" > "%var.player/tmp1 0%L" 0) {',
+        '    var "z" = 1 true',
+        '}',
+        'var "tmp0" = "%var.player/y 0%L" false',
+        'var "tmp0" *= 4 false',
+        'var "tmp0" += 1 false',
+        'if and (var "tmp0" > 0 0) {',
+        '    var "z" = 2 true',
+        '}',
+    )
+)
+assert container.into_htsl() == expected, container.into_htsl()
+
+with ExecutionContext() as ctx:
+    ctx.put(x, 4)
+    ctx.put(y, 2)
+    z.value = 0
+    with IfAll(x * 2 + 1 > y * 3 + 1):
+        z.value = 1
+    with IfAll(x * 2 + 1 < y * 3 + 1):
+        z.value += 10
+
+assert int(ctx.get(z)) == 1, ctx.get(z)
+
+
+# A hand-written `tmp0` read at the end of the block is live across all of it,
+# and neither the temps of the conditions nor the ones a single statement
+# flattens into are numbered after it. Placeholders in the body are renamed
+# along with the temps they name.
+with Container() as container:
+    held = PlayerStat('tmp0').as_long()
+    held.value = x + 5
+    z.value = (x * 2) * (y * 3)
+    with IfAll(x * 2 + 1 > y * 3 + 1):
+        chat(f'{x * 9 + 1} and {y * 5 + 2}')
+    with IfAll(y * 4 + 1 > 0):
+        z.value = held
+
+expected = '\n'.join(
+    (
+        'var "tmp0" = "%var.player/x 0%L" true',
+        'var "tmp0" += 5 true',
+        'var "z" = "%var.player/x 0%L" true',
+        'var "z" *= 2 true',
+        'var "tmp1" = "%var.player/y 0%L" false',
+        'var "tmp1" *= 3 false',
+        'var "z" *= "%var.player/tmp1 0%L" true',
+        'var "tmp1" = "%var.player/x 0%L" false',
+        'var "tmp1" *= 2 false',
+        'var "tmp1" += 1 false',
+        'var "tmp2" = "%var.player/y 0%L" false',
+        'var "tmp2" *= 3 false',
+        'var "tmp2" += 1 false',
+        'if and (var "tmp1" > "%var.player/tmp2 0%L" 0) {',
+        '    var "tmp1" = "%var.player/x 0%L" false',
+        '    var "tmp1" *= 9 false',
+        '    var "tmp1" += 1 false',
+        '    var "tmp2" = "%var.player/y 0%L" false',
+        '    var "tmp2" *= 5 false',
+        '    var "tmp2" += 2 false',
+        '    chat "%var.player/tmp1 0% and %var.player/tmp2 0%"',
+        '}',
+        'var "tmp1" = "%var.player/y 0%L" false',
+        'var "tmp1" *= 4 false',
+        'var "tmp1" += 1 false',
+        'if and (var "tmp1" > 0 0) {',
+        '    var "z" = "%var.player/tmp0 0%L" true',
+        '}',
+    )
+)
+assert container.into_htsl() == expected, container.into_htsl()
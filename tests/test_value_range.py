@@ -0,0 +1,133 @@
+"""`%` and `abs()` end in a conditional making their result positive, which is
+left out when their operand is known to not be negative. What a stat holds is
+known from the range it is declared with, from what it was assigned, and from
+the conditions of the block it is in. Without the conditional, they can be
+nested in another conditional block.
+"""
+
+from pyhtsl import (
+    Container,
+    Else,
+    ExecutionContext,
+    IfAll,
+    PlayerStat,
+    RandomWhole,
+    trigger_function,
+)
+from pyhtsl.expression.value_range import ValueRange, value_range_of
+
+x = PlayerStat('x').as_long()
+y = PlayerStat('y').as_long()
+z = PlayerStat('z').as_long()
+level = PlayerStat('level').as_long().with_range(0, 100)
+
+assert level.declared_range() == ValueRange(0, 100)
+assert x.declared_range() is None
+assert value_range_of(level * 2 + 1) == ValueRange(1, 201)
+assert value_range_of(level % 7) == ValueRange(0, 6)
+assert value_range_of(abs(x)) is None, 'abs of the smallest long is negative'
+assert value_range_of(abs(x.as_double())) == ValueRange(0, float('inf'))
+
+
+# Declared ranges and random numbers are known when the operation is built,
+# and a value known to not be positive is simply negated.
+with Container() as container:
+    with IfAll(y > 2):
+        z.value = level % 7
+        x.value = abs(level - 200)
+        y.value = RandomWhole(0, 10) % 3
+
+expected = '\n'.join(
+    (
+        'if and (var "y" > 2 0) {',
+        '    var "tmp0" = "%var.player/level 0%L" false',
+        '    var "tmp0" /= 7 false',
+        '    var "tmp0" *= 7 false',
+        '    var "z" = "%var.player/level 0%L" true',
+        '    var "z" -= "%var.player/tmp0 0%L" true',
+        '    var "x" = "%var.player/level 0%L" true',
+        '    var "x" -= 200 true',
+        '    var "x" *= -1 true',
+        '    var "tmp0" = "%random.whole/0 10%L" false',
+        '    var "tmp0" /= 3 false',
+        '    var "tmp0" *= 3 false',
+        '    var "y" = "%random.whole/0 10%L" true',
+        '    var "y" -= "%var.player/tmp0 0%L" true',
+        '}',
+    )
+)
+assert container.into_htsl() == expected, container.into_htsl()
+
+
+# A condition tells what a stat holds within its body, and after a block a stat
+# holds what any branch left in it. A triggered function can write any stat.
+with Container() as container:
+    with IfAll(x >= 0):
+        z.value = x % 10
+    with Else:
+        z.value = 0
+    with IfAll(y == 1):
+        x.value = z % 4
+    trigger_function('f')
+    x.value = z % 4
+
+expected = '\n'.join(
+    (
+        'if and (var "x" >= 0 0) {',
+        '    var "tmp0" = "%var.player/x 0%L" false',
+        '    var "tmp0" /= 10 false',
+        '    var "tmp0" *= 10 false',
+        '    var "z" = "%var.player/x 0%L" true',
+        '    var "z" -= "%var.player/tmp0 0%L" true',
+        '} else {',
+        '    var "z" = 0 true',
+        '}',
+        'if and (var "y" == 1 0) {',
+        '    var "tmp0" = "%var.player/z 0%L" false',
+        '    var "tmp0" /= 4 false',
+        '    var "tmp0" *= 4 false',
+        '    var "x" = "%var.player/z 0%L" true',
+        '    var "x" -= "%var.player/tmp0 0%L" true',
+        '}',
+        'function "f" false',
+        'var "tmp0" = "%var.player/z 0%L" false',
+        'var "tmp0" /= 4 false',
+        'var "tmp0" *= 4 false',
+        'var "x" = "%var.player/z 0%L" true',
+        'var "x" -= "%var.player/tmp0 0%L" true',
+        'if and (var "x" < 0 0) {',
+        '    var "x" += 4 true',
+        '}',
+    )
+)
+assert container.into_htsl() == expected, container.into_htsl()
+assert container.narrowed_actions == 4, container.narrowed_actions
+
+
+# The result of an `abs()` left without its conditional is known as well, and
+# what may be negative keeps it. `%` reads its operand twice.
+with Container() as container:
+    y.value = RandomWhole(0, 50)
+    with IfAll(x > 3):
+        z.value = abs(y) % 6
+    z.value = abs(x) % 3
+
+assert container.into_htsl().count('if and') == 4, container.into_htsl()
+assert container.narrowed_actions == 6, container.narrowed_actions
+
+
+# Leaving them out does not change what the block does.
+for value in (-9, 5, 11):
+    with ExecutionContext() as ctx:
+        ctx.put(x, value)
+        y.value = 13
+        with IfAll(x > 3):
+            z.value = x % 7
+            z.value += abs(y) + (y % 4) * 2
+            z.value -= abs(y % 4 - 9)
+        with Else:
+            z.value = 3
+        x.value = z % 5
+
+        expected_z = (value % 7) + 13 + 2 - 8 if value > 3 else 3
+        ctx.assert_all(z == expected_z, x == expected_z % 5)
@@ -0,0 +1,62 @@
+"""A watcher rebuilds only the jobs that ran a file which changed since."""
+
+import os
+import tempfile
+from pathlib import Path
+
+from pyhtsl.build import BuildJob
+from pyhtsl.watch import Watcher
+
+HOUSE = """
+import {helper}
+from pyhtsl import PlayerStat, create_function
+
+@create_function({name!r})
+def function():
+    PlayerStat('x').value = PlayerStat('x') % {helper}.MODULUS
+"""
+
+
+def touch(path: Path, content: str) -> None:
+    stat = path.stat()
+    path.write_text(content, encoding='utf-8')
+    # Edits can land within the resolution of the file system clock
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+with tempfile.TemporaryDirectory() as folder:
+    root = Path(folder)
+    output = root / 'out'
+    for name in ('shared', 'other'):
+        (root / f'watch_{name}.py').write_text('MODULUS = 7\n', encoding='utf-8')
+    jobs: list[BuildJob] = []
+    for i, helper in enumerate(('watch_shared', 'watch_shared', 'watch_other')):
+        path = root / f'watch_house_{i}.py'
+        path.write_text(
+            HOUSE.format(helper=helper, name=f'house {i}'), encoding='utf-8'
+        )
+        jobs.append(BuildJob(f'watch_house_{i}', str(path)))
+
+    watcher = Watcher(jobs, imports_folder=output, cache_folder=root / 'cache')
+    results = watcher.build(watcher.jobs)
+    assert all(result.ok for result in results), [r.error for r in results]
+    assert (root / 'watch_shared.py').resolve() in watcher.sources[jobs[0]]
+    assert (root / 'watch_other.py').resolve() not in watcher.sources[jobs[0]]
+    assert watcher.poll() == []
+
+    # A helper changes: only the houses importing it rebuild, and run it again
+    touch(root / 'watch_shared.py', 'MODULUS = 9\n')
+    results = watcher.poll()
+    assert [result.job for result in results] == jobs[:2]
+    assert all(result.exports == {result.job.name: True} for result in results)
+    assert '/= 9' in (output / 'watch_house_1.htsl').read_text(encoding='utf-8')
+    assert '/= 7' in (output / 'watch_house_2.htsl').read_text(encoding='utf-8')
+
+    # A broken edit fails the build, fixing it rebuilds again
+    touch(root / 'watch_other.py', 'MODULUS = (\n')
+    (result,) = watcher.poll()
+    assert result.job == jobs[2] and not result.ok
+    touch(root / 'watch_other.py', 'MODULUS = 7\n')
+    (result,) = watcher.poll()
+    assert result.job == jobs[2] and result.ok
+    assert result.exports == {'watch_house_2': False}